@@ -2,6 +2,7 @@ import sys
 import os
 import logging
 from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QFileDialog, QProgressBar, QMessageBox, QLabel, QDesktopWidget
+from PyQt5.QtWidgets import QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QListView, QTreeView, QFileSystemModel
 from PyQt5.QtCore import QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QFont, QIcon
 import configparser
@@ -11,6 +12,8 @@ import qtmodern.windows
 import json
 import shutil
 from openpyxl import load_workbook
+from openpyxl.packaging.custom import StringProperty
+from openpyxl.formula.tokenizer import Tokenizer, Token
 import openpyxl
 import traceback
 from PyQt5.QtGui import QPixmap
@@ -18,9 +21,98 @@ import py7zr
 import datetime
 import socket
 import tempfile
+import zipfile
+import threading
+import argparse
+import abc
+import contextlib
+import cProfile
+import pstats
+import csv
+import io
+import math
+import decimal
+import fnmatch
+import warnings
+import hashlib
+import codecs
+import html
+import mmap
+import posixpath
+import types
+import tracemalloc
+import xml.etree.ElementTree as ET
+import urllib.request
+import urllib.error
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import concurrent.futures.thread
+try:
+    import numpy as np
+except ImportError:  # numpy 只有批次規格檢查需要
+    np = None
 
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 讀取網路磁碟上 Recipe 檔案時同時進行的最大執行緒數
+MAX_IO_WORKERS = 8
+
+# GUI 佇列中同時產生的 Recipe 數
+GUI_MAX_WORKERS = 2
+
+# 兩次進度更新之間的最短間隔（秒），避免儲存格迴圈塞滿 Qt 事件佇列
+PROGRESS_EMIT_INTERVAL = 0.1
+
+# --profile：呼叫堆疊的取樣間隔（秒）與列出的最耗時函式數
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_FUNCTIONS = 10
+
+# Zones/*.ini 中需要檢查 Enable 狀態的演算法
+ZONE_ALGORITHMS = ['Solder Bump', 'Surface on SB', 'Uniform Surface on SB', 'Surface', 'PMI Advanced', 'Probe Mark Inspection']
+
+# 各存放位置的預設值：check list 範本、輸出的 check list、使用紀錄與最新版執行檔；
+# 可由執行檔旁的 AVI Check list storage.json 覆寫，或以 --storage-root 全部改為同一個本機資料夾下的子資料夾
+STORAGE_CONFIG_FILENAME = 'AVI Check list storage.json'
+DEFAULT_STORAGE_LOCATIONS = {
+    'template': {'type': 'local', 'path': r"D:\本地應用程式\AVI Check list"},
+    'output': {'type': 'local', 'path': os.path.join(os.path.expanduser("~"), "Downloads")},
+    'log': {'type': 'share', 'path': r"M:\QA_Program_Raw_Data\Log History"},
+    'apps': {'type': 'share', 'path': r"M:\QA_Program_Raw_Data\Apps"},
+}
+
+# check list 範本（位於 template 存放位置）
+TEMPLATE_FILENAME = 'Camtek Falcon Check list_V4.xlsx'
+
+# 網路磁碟上的範本在本機的快取資料夾
+TEMPLATE_CACHE_DIRNAME = 'AVI Check list template cache'
+
+# check list 產生邏輯的版本；產生的內容有變動時需更新，舊版產生的 check list 就不會再被沿用
+CHECK_LIST_ENGINE_VERSION = '4.5.1'
+
+# 寫入 check list 自訂屬性的指紋名稱
+FINGERPRINT_PROPERTY = 'AVI check list fingerprint'
+
+# 寫入 check list 自訂屬性的公式檢查結果（JSON）
+FORMULA_RESULTS_PROPERTY = 'AVI check list formula results'
+
+# 產生時寫入的最後修改者；檔案被 Excel 另存後會變成使用者名稱，就不再視為未修改的輸出
+CHECK_LIST_GENERATOR = 'AVI Check list'
+
+# 可直接解析、不需解壓縮的 Recipe 壓縮檔格式
+RECIPE_ARCHIVE_EXTENSIONS = ('.zip', '.7z')
+
+# zip 成員的 DOS 日期無效時使用的修改時間
+ZIP_DOS_EPOCH = datetime.datetime(1980, 1, 1)
+
+# RTP.txt 超過此大小時不預先讀入記憶體，解析時改以 mmap 逐塊讀取
+RTP_PREFETCH_LIMIT = 4 * 1024 * 1024
+RTP_CHUNK_SIZE = 1024 * 1024
+
+# --low-memory 產生單一 check list 時的記憶體峰值目標：tracemalloc 量到的 Python 配置量，
+# 不含直譯器、Qt 與已載入模組本身；golden 比對搭配 --low-memory 時超過即視為失敗
+LOW_MEMORY_PEAK_TARGET = 64 * 1024 * 1024
+
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
@@ -29,27 +121,3009 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+class RecipeTree:
+    """Recipe 資料夾的檔案索引與預先讀取的內容。
+
+    網路磁碟上每次 open/read/close 都要來回數次，因此先以 scandir 建立 Setup1 的索引，
+    再把解析會用到的小檔案一次同時讀進記憶體，之後的解析只讀取記憶體中的內容。
+    路徑以 Recipe 根目錄的相對路徑（以 '/' 分隔）作為鍵。
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}   # 相對路徑 -> (size, mtime)
+        self.dirs = {}    # 相對資料夾路徑 -> [(名稱, 是否為資料夾)]，依 scandir 順序
+        self.buffers = {}
+        self.rtp_prefetch_limit = RTP_PREFETCH_LIMIT
+        self.bytes_fetched = 0
+        self.fetch_time = 0.0
+        self._lower_paths = {}
+
+    def relative(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return '' if rel == '.' else rel
+
+    def _scan_dir(self, rel_dir):
+        entries = []
+        files = {}
+        try:
+            with os.scandir(os.path.join(self.root, rel_dir)) as it:
+                for entry in it:
+                    is_dir = entry.is_dir()
+                    entries.append((entry.name, is_dir))
+                    if not is_dir:
+                        stat = entry.stat()
+                        files[f'{rel_dir}/{entry.name}'] = (stat.st_size, stat.st_mtime)
+        except OSError:
+            return None, {}
+        return entries, files
+
+    def build_index(self, executor):
+        # 逐層同時掃描資料夾
+        pending = ['Setup1']
+        while pending:
+            results = list(executor.map(self._scan_dir, pending))
+            next_pending = []
+            for rel_dir, (entries, files) in zip(pending, results):
+                if entries is None:
+                    continue
+                self.dirs[rel_dir] = entries
+                self.files.update(files)
+                next_pending.extend(f'{rel_dir}/{name}' for name, is_dir in entries if is_dir)
+            pending = next_pending
+        self._lower_paths = {}
+        for rel in list(self.dirs) + list(self.files):
+            self._lower_paths.setdefault(rel.lower(), rel)
+
+    def is_parsed_file(self, rel):
+        parts = rel.split('/')
+        if rel.lower() == 'setup1/wafermaprecipe.ini':
+            return True
+        if len(parts) >= 4 and parts[1] == 'Recipes':
+            if parts[-1] in RECIPE_FOLDER_FILES:
+                return True
+            if len(parts) == 5 and parts[3].lower() == 'zones' and parts[-1].lower().endswith('.ini'):
+                return True
+        return False
+
+    def is_prefetch_target(self, rel):
+        if not self.is_parsed_file(rel):
+            return False
+        return not (rel.endswith('/RTP.txt') and self.files[rel][0] > self.rtp_prefetch_limit)
+
+    def _read_file(self, rel):
+        with open(os.path.join(self.root, rel), 'rb') as file:
+            return file.read()
+
+    def prefetch(self, executor):
+        start_time = datetime.datetime.now()
+        targets = [rel for rel in self.files if self.is_prefetch_target(rel)]
+        for rel, content in zip(targets, executor.map(self._read_file, targets)):
+            self.buffers[rel] = content
+            self.bytes_fetched += len(content)
+        self.fetch_time = (datetime.datetime.now() - start_time).total_seconds()
+        return len(targets)
+
+    def resolve(self, path):
+        # Windows 上的路徑不區分大小寫
+        rel = self.relative(path)
+        if rel in self.files or rel in self.dirs:
+            return rel
+        return self._lower_paths.get(rel.lower(), rel)
+
+    def exists(self, path):
+        rel = self.resolve(path)
+        return rel in self.files or rel in self.dirs
+
+    def isdir(self, path):
+        return self.resolve(path) in self.dirs
+
+    def listdir(self, path):
+        rel = self.resolve(path)
+        if rel not in self.dirs:
+            return self._listdir_unindexed(path)
+        return [name for name, is_dir in self.dirs[rel]]
+
+    def _listdir_unindexed(self, path):
+        return os.listdir(path)
+
+    def find_file(self, filename, search_path):
+        # 與 os.walk 相同的由上而下搜尋順序
+        rel_dir = self.resolve(search_path)
+        if rel_dir not in self.dirs:
+            return None
+        entries = self.dirs[rel_dir]
+        if any(name == filename and not is_dir for name, is_dir in entries):
+            return os.path.join(search_path, filename)
+        for name, is_dir in entries:
+            if is_dir:
+                found = self.find_file(filename, os.path.join(search_path, name))
+                if found:
+                    return found
+        return None
+
+    def fingerprint(self, content_hash=False):
+        # 解析會用到的檔案（相對路徑、大小、修改時間）與 Recipes 下的資料夾結構；
+        # content_hash 時以檔案內容的雜湊取代修改時間，複製到其他位置的相同 Recipe 也會得到相同指紋
+        digest = hashlib.sha256()
+        for rel in sorted(self.dirs):
+            if rel == 'Setup1/Recipes' or rel.startswith('Setup1/Recipes/'):
+                digest.update(f'D\t{rel}\t{sorted(self.dirs[rel])}\n'.encode('utf-8'))
+        for rel in sorted(rel for rel in self.files if self.is_parsed_file(rel)):
+            size, mtime = self.files[rel]
+            if content_hash:
+                with self.open_buffer(os.path.join(self.root, rel)) as content:
+                    entry = f'F\t{rel}\t{size}\t{hashlib.sha256(content).hexdigest()}\n'
+            else:
+                entry = f'F\t{rel}\t{size}\t{mtime:.6f}\n'
+            digest.update(entry.encode('utf-8'))
+        return digest.hexdigest()
+
+    def read_bytes(self, path):
+        rel = self.resolve(path)
+        if rel in self.buffers:
+            return self.buffers[rel]
+        content = self._read_file(rel)
+        self.bytes_fetched += len(content)
+        return content
+
+    @contextlib.contextmanager
+    def open_buffer(self, path):
+        # 預先讀取過的檔案直接使用記憶體中的內容，其他檔案以 mmap 對應，不整個讀入記憶體
+        rel = self.resolve(path)
+        if rel in self.buffers:
+            yield self.buffers[rel]
+            return
+        with open(os.path.join(self.root, rel), 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def read_text(self, path):
+        # 與 open(..., 'r', encoding='utf-8', errors='ignore') 讀到的內容相同
+        text = self.read_bytes(path).decode('utf-8', errors='ignore')
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def zip_member_mtime(info):
+    # 部分壓縮工具寫入的 DOS 日期為 0（月、日為 0），無法轉成 datetime，以 DOS 日期的起點代替
+    try:
+        return datetime.datetime(*info.date_time).timestamp()
+    except (ValueError, OverflowError, OSError):
+        return ZIP_DOS_EPOCH.timestamp()
+
+class ArchiveRecipeTree(RecipeTree):
+    """直接從 .zip/.7z Recipe 壓縮檔讀取，不需先解壓縮到暫存資料夾。
+
+    索引由壓縮檔的目錄（zip 的 central directory、7z 的標頭）建立，
+    預先讀取時只解壓縮需要解析的成員。壓縮檔內可以直接是 Setup1，
+    也可以多包一層 Recipe 資料夾。
+    """
+
+    def __init__(self, archive_path):
+        super().__init__(archive_path)
+        self.is_7z = archive_path.lower().endswith('.7z')
+        self.member_prefix = ''
+        self.members = {}  # 相對路徑 -> 壓縮檔內的成員名稱
+
+    def _list_members(self):
+        # 回傳 [(成員名稱, 是否為資料夾, size, mtime)]
+        if self.is_7z:
+            with py7zr.SevenZipFile(self.root, mode='r') as archive:
+                return [(info.filename, info.is_directory, info.uncompressed or 0,
+                         info.creationtime.timestamp() if info.creationtime else 0.0)
+                        for info in archive.list()]
+        with zipfile.ZipFile(self.root) as archive:
+            return [(info.filename, info.is_dir(), info.file_size, zip_member_mtime(info)) for info in archive.infolist()]
+
+    def build_index(self, executor):
+        members = self._list_members()
+        for name, is_dir, size, mtime in members:
+            parts = name.replace('\\', '/').strip('/').split('/')
+            if 'Setup1' in parts:
+                self.member_prefix = '/'.join(parts[:parts.index('Setup1')])
+                break
+
+        dir_entries = {}
+        for name, is_dir, size, mtime in members:
+            path = name.replace('\\', '/').strip('/')
+            if self.member_prefix:
+                if not path.startswith(self.member_prefix + '/'):
+                    continue
+                path = path[len(self.member_prefix) + 1:]
+            if path != 'Setup1' and not path.startswith('Setup1/'):
+                continue
+            parts = path.split('/')
+            # 壓縮檔不一定為每個資料夾建立成員，依檔案路徑補齊上層資料夾
+            for depth in range(1, len(parts)):
+                parent = '/'.join(parts[:depth])
+                dir_entries.setdefault(parent, {})
+                if depth + 1 < len(parts) or is_dir:
+                    dir_entries[parent].setdefault(parts[depth], True)
+            if is_dir:
+                dir_entries.setdefault(path, {})
+            else:
+                dir_entries['/'.join(parts[:-1])][parts[-1]] = False
+                self.files[path] = (size, mtime)
+                self.members[path] = name
+
+        self.dirs = {rel_dir: list(entries.items()) for rel_dir, entries in dir_entries.items()}
+        self._lower_paths = {}
+        for rel in list(self.dirs) + list(self.files):
+            self._lower_paths.setdefault(rel.lower(), rel)
+
+    def _read_members(self, rels):
+        names = [self.members[rel] for rel in rels]
+        if self.is_7z:
+            with py7zr.SevenZipFile(self.root, mode='r') as archive:
+                contents = {filename: bio.read() for filename, bio in archive.read(targets=names).items()}
+            return [contents[name] for name in names]
+        with zipfile.ZipFile(self.root) as archive:
+            return [archive.read(name) for name in names]
+
+    def _read_file(self, rel):
+        if rel not in self.members:
+            raise FileNotFoundError(f"{rel} not found in {self.root}")
+        return self._read_members([rel])[0]
+
+    def is_prefetch_target(self, rel):
+        # 壓縮檔內的成員只解壓縮一次，大型 RTP.txt 也一併預先讀取
+        return self.is_parsed_file(rel)
+
+    @contextlib.contextmanager
+    def open_buffer(self, path):
+        yield self.read_bytes(path)
+
+    def _listdir_unindexed(self, path):
+        raise FileNotFoundError(f"{self.relative(path)} not found in {self.root}")
+
+    def prefetch(self, executor):
+        # 壓縮檔只開啟一次，依目錄順序串流解壓縮需要的成員
+        start_time = datetime.datetime.now()
+        targets = [rel for rel in self.files if self.is_prefetch_target(rel)]
+        for rel, content in zip(targets, self._read_members(targets)):
+            self.buffers[rel] = content
+            self.bytes_fetched += len(content)
+        self.fetch_time = (datetime.datetime.now() - start_time).total_seconds()
+        return len(targets)
+
+def is_recipe_archive(path):
+    return path.lower().endswith(RECIPE_ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+def open_recipe_tree(avi_recipe_path):
+    if is_recipe_archive(avi_recipe_path):
+        return ArchiveRecipeTree(avi_recipe_path)
+    return RecipeTree(avi_recipe_path)
+
+class ParsedFileMemo:
+    """單次執行中共用的已解析 INI 與由其算出的結果。
+
+    以 Recipe 內的實際相對路徑為鍵（不區分大小寫），例如多個區域名稱對應同一個 Zones INI 時只讀取、
+    解析一次，並記錄避免了幾次重複解析。回傳的 ConfigParser 與結果只供讀取。
+    """
+
+    def __init__(self, recipe_tree):
+        self.recipe_tree = recipe_tree
+        self.parse_count = 0
+        self.duplicates_avoided = 0
+        self._configs = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def result(self, kind, path, compute):
+        # 同一個檔案的 kind 結果只計算一次；其他執行緒同時要求時等待第一次的結果
+        key = (kind, self.recipe_tree.resolve(path))
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = concurrent.futures.Future()
+            else:
+                self.duplicates_avoided += 1
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as error:
+                # 失敗（例如取消）的結果不保留，之後再要求時重新計算
+                with self._lock:
+                    self._results.pop(key, None)
+                future.set_exception(error)
+                raise
+        return future.result()
+
+    def config(self, path):
+        key = self.recipe_tree.resolve(path)
+        with self._lock:
+            config = self._configs.get(key)
+            if config is not None:
+                self.duplicates_avoided += 1
+                return config
+            config = configparser.ConfigParser()
+            config.read_string(self.recipe_tree.read_text(path))
+            self._configs[key] = config
+            self.parse_count += 1
+            return config
+
+    def clear(self):
+        # 釋放已解析的內容；之後再讀取同一個檔案時重新解析
+        with self._lock:
+            self._configs.clear()
+            self._results.clear()
+
+# 超過此大小的內容不放入解析快取（格式異常的大型 RTP 段落），快取中解析結果的大小上限（估計值）
+PARSE_CACHE_MAX_CONTENT = 1024 * 1024
+PARSE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+def _freeze_cached(value):
+    # JSON 讀回的清單轉回 tuple，快取中的結果在各 Recipe 間共用，不可被修改
+    if isinstance(value, list):
+        return tuple(_freeze_cached(item) for item in value)
+    return value
+
+def _cached_size(value):
+    # 估計解析結果佔用的記憶體（含其中的字串與數值）
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(_cached_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_cached_size(key) + _cached_size(item) for key, item in value.items())
+    return size
+
+class ContentCache:
+    """以內容雜湊為鍵的解析結果快取，整個批次（以及常駐服務）的所有 Recipe 共用。
+
+    同一群組的 Recipe 常有位元組完全相同的 Zones/*.ini 與 RTP.txt 段落，
+    相同內容（以 blake2b 雜湊判斷）只解析一次，並記錄各種類的命中率。
+    可存成 JSON 檔，下次執行時沿用；產生邏輯版本不同時不會讀入舊的結果。
+    """
+
+    def __init__(self, max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = {}  # (種類, 雜湊) -> 解析結果
+        self._sizes = {}  # (種類, 雜湊) -> 解析結果的估計大小
+        self.size_bytes = 0
+        self._hits = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, kind, content, compute):
+        if len(content) > PARSE_CACHE_MAX_CONTENT:
+            return compute()
+        key = (kind, hashlib.blake2b(content, digest_size=16).hexdigest())
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._hits[kind] = self._hits.get(kind, 0) + 1
+                return value
+            self._misses[kind] = self._misses.get(kind, 0) + 1
+        value = compute()
+        with self._lock:
+            self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        # 呼叫時需持有 self._lock；超過大小上限時移除最早加入的項目
+        if key in self._entries:
+            self.size_bytes -= self._sizes.pop(key)
+            del self._entries[key]
+        size = _cached_size(value)
+        if size > self.max_bytes:
+            return
+        while self._entries and self.size_bytes + size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            del self._entries[oldest]
+            self.size_bytes -= self._sizes.pop(oldest)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.size_bytes += size
+
+    def stats(self):
+        stats = {}
+        for kind in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits.get(kind, 0), self._misses.get(kind, 0)
+            stats[kind] = {'hits': hits, 'misses': misses, 'hit_rate': round(hits / (hits + misses), 3)}
+        return stats
+
+    def summary(self):
+        return ', '.join(f"{kind} {kind_stats['hits']}/{kind_stats['hits'] + kind_stats['misses']} hits ({kind_stats['hit_rate']:.0%})"
+                         for kind, kind_stats in self.stats().items())
+
+    def load(self, path):
+        # 檔案不存在、無法讀取、版本不同或格式不符時從空的快取開始
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(data, dict) or data.get('version') != CHECK_LIST_ENGINE_VERSION:
+            return 0
+        entries = data.get('entries', {})
+        if not isinstance(entries, dict) or not all(
+                isinstance(kind_entries, dict) and all(isinstance(value, (dict, list)) for value in kind_entries.values())
+                for kind_entries in entries.values()):
+            print(f"略過格式不符的解析快取檔: {path}")
+            return 0
+        with self._lock:
+            for kind, kind_entries in entries.items():
+                for digest, value in kind_entries.items():
+                    self._store((kind, digest), _freeze_cached(value))
+        return len(self._entries)
+
+    def save(self, path):
+        with self._lock:
+            entries = {}
+            for (kind, digest), value in self._entries.items():
+                entries.setdefault(kind, {})[digest] = value
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': CHECK_LIST_ENGINE_VERSION, 'entries': entries}, file, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+PARSE_CACHE = ContentCache()
+
+class ParameterKeyTable:
+    """所有 Recipe 共用的參數名稱表。
+
+    像 RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright 這類長名稱只保存一次，
+    每個 Recipe 以整數索引參照，批次處理上千個 Recipe 時不會重複保存相同的字串。
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._keys = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def key_id(self, key):
+        key_id = self._ids.get(key)
+        if key_id is None:
+            with self._lock:
+                key_id = self._ids.get(key)
+                if key_id is None:
+                    key = sys.intern(key)
+                    key_id = len(self._keys)
+                    self._keys.append(key)
+                    self._ids[key] = key_id
+        return key_id
+
+    def find(self, key):
+        return self._ids.get(key)
+
+    def key(self, key_id):
+        return self._keys[key_id]
+
+    def memory_size(self):
+        return sys.getsizeof(self._ids) + sys.getsizeof(self._keys) + sum(sys.getsizeof(key) for key in self._keys)
+
+PARAMETER_KEYS = ParameterKeyTable()
+
+_INT_PATTERN = re.compile(r'0|-?[1-9][0-9]*')
+
+def parse_parameter_value(raw):
+    # 只有能原樣轉回相同字串的值才轉型，字典檢視因此與解析出的字串完全相同
+    if raw == 'True' or raw == 'False':
+        return raw == 'True'
+    if _INT_PATTERN.fullmatch(raw):
+        return int(raw)
+    try:
+        value = float(raw)
+    except ValueError:
+        return sys.intern(raw) if len(raw) <= 32 else raw
+    return value if repr(value) == raw else raw
+
+def format_parameter_value(value):
+    if isinstance(value, bool):
+        return 'True' if value else 'False'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+def excel_cell_value(value):
+    # 與原本寫入儲存格前的 float(value) 轉換結果相同；已轉型的數值不再重複解析字串
+    if isinstance(value, bool):
+        return format_parameter_value(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+class ParameterBlock:
+    """一組參數（Recipe 層級或單一 Default/Default1 資料夾），以名稱索引陣列與已轉型的值保存"""
+    __slots__ = ('key_ids', 'values', 'positions')
+
+    def __init__(self, items=()):
+        self.key_ids = array('I')
+        self.values = []
+        self.positions = {}  # 名稱索引 -> 陣列中的位置，查詢時不必逐一比對 key_ids
+        for key, raw in items:
+            key_id = PARAMETER_KEYS.key_id(key)
+            self.positions.setdefault(key_id, len(self.values))
+            self.key_ids.append(key_id)
+            self.values.append(parse_parameter_value(raw))
+
+    def __len__(self):
+        return len(self.values)
+
+    def _index(self, key):
+        key_id = PARAMETER_KEYS.find(key)
+        return None if key_id is None else self.positions.get(key_id)
+
+    def __contains__(self, key):
+        return self._index(key) is not None
+
+    def get(self, key, default=None):
+        index = self._index(key)
+        return default if index is None else self.values[index]
+
+    def items(self):
+        return ((PARAMETER_KEYS.key(key_id), value) for key_id, value in zip(self.key_ids, self.values))
+
+    def to_dict(self):
+        return {key: format_parameter_value(value) for key, value in self.items()}
+
+    def memory_size(self):
+        # 小整數、bool 與 intern 過的字串為共用物件，不計入單一 Recipe
+        size = sys.getsizeof(self) + sys.getsizeof(self.key_ids) + sys.getsizeof(self.values) + sys.getsizeof(self.positions)
+        for value in self.values:
+            if isinstance(value, float) or (isinstance(value, int) and not isinstance(value, bool) and not -5 <= value <= 256):
+                size += sys.getsizeof(value)
+            elif isinstance(value, str) and sys.intern(value) is not value:
+                size += sys.getsizeof(value)
+        return size
+
+class RecipeRecord:
+    """單一 Recipe 解析結果的精簡保存格式，可轉回原本 self.variables 的巢狀字典"""
+    __slots__ = ('recipe', 'default', 'default1')
+
+    FOLDER_TYPES = ('Default', 'Default1')
+
+    def __init__(self, recipe, default, default1):
+        self.recipe = recipe
+        self.default = default
+        self.default1 = default1
+
+    @classmethod
+    def from_variables(cls, variables):
+        recipe_items = [(key, value) for key, value in variables.items() if key not in cls.FOLDER_TYPES]
+        return cls(ParameterBlock(recipe_items),
+                   ParameterBlock(variables.get('Default', {}).items()),
+                   ParameterBlock(variables.get('Default1', {}).items()))
+
+    def folder(self, folder_type):
+        return self.default if folder_type == 'Default' else self.default1
+
+    def contains(self, folder_type, key):
+        return key in self.folder(folder_type) or key in self.recipe
+
+    def get(self, folder_type, key):
+        # 資料夾中的參數優先，其次為 Recipe 層級的參數
+        index = self.folder(folder_type)._index(key)
+        if index is not None:
+            return self.folder(folder_type).values[index]
+        return self.recipe.get(key)
+
+    def lookup(self, folder_type, key):
+        # 與 variables.get(folder_type, {}).get(key) or variables.get(key) 的取值結果相同
+        value = self.folder(folder_type).get(key)
+        if value is None or value == '':
+            return self.recipe.get(key)
+        return value
+
+    def to_variables(self):
+        variables = {'Default': self.default.to_dict(), 'Default1': self.default1.to_dict()}
+        variables.update(self.recipe.to_dict())
+        return variables
+
+    def value_count(self):
+        return len(self.recipe) + len(self.default) + len(self.default1)
+
+    def memory_size(self):
+        return sys.getsizeof(self) + self.recipe.memory_size() + self.default.memory_size() + self.default1.memory_size()
+
+def nested_getsizeof(value):
+    # 估算原本巢狀字典（含字串）佔用的記憶體，用於和 RecipeRecord 比較
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(nested_getsizeof(key) + nested_getsizeof(item) for key, item in value.items())
+    return size
+
+def recipe_display_name(name):
+    # Recipe 壓縮檔以去掉副檔名後的檔名作為 Recipe 名稱
+    for extension in RECIPE_ARCHIVE_EXTENSIONS:
+        if name.lower().endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+def check_list_file_name(avi_recipe_path):
+    return f"{recipe_display_name(os.path.basename(avi_recipe_path))}_AVI check list.xlsx"
+
+def ascii_text(text):
+    return ''.join(char for char in text if ord(char) < 128)
+
+def round_to_one_decimal(value):
+    try:
+        return f"{float(value):.1f}"
+    except ValueError:
+        return value
+
+# 從 INI 檔擷取的 check list 欄位：(檔案, 區段, 鍵或鍵的樣式, 轉換, 輸出變數)
+# 鍵為 re.compile 的樣式時，取區段中第一個完全符合的鍵。新增 check list 欄位只需在此新增一行
+INI_EXTRACTION_SPEC = [
+    ('OpticsPreset.ini', 'RobotSetup', 'Name', None, 'OpticsPreset_Robotsetup_Name'),
+    ('OpticsPreset.ini', 'General', re.compile(r'Scan2d-Mag.*'), None, 'OpticsPreset_General_Scan2d_Mag'),
+    ('OpticsPreset.ini', 'General', re.compile(r'.*VerifyColorMag.*-Mag'), None, 'OpticsPreset_General_VerifyColorMag_Mag'),
+    ('OpticsPreset.ini', 'General', re.compile(r'DiffLight[^-]*'), round_to_one_decimal, 'OpticsPreset_General_DiffLight'),
+    ('OpticsPreset.ini', 'General', re.compile(r'RefLight[^-]*'), round_to_one_decimal, 'OpticsPreset_General_RefLight'),
+    ('OpticsPreset.ini', 'General', re.compile(r'.*VerifyColorMag.*-RefLight'), round_to_one_decimal, 'OpticsPreset_General_VerifyColorMag_RefLight'),
+    ('AlignRtp.ini', 'DIE Alignment', 'Die__MinScore', None, 'AlignRtp_DIE_Alignment_Die__MinScore'),
+    ('ProductInfo.ini', 'General', 'OCRWaferIDMask', None, 'ProductInfo_General_OCRWaferIDMask'),
+    ('ProductInfo.ini', 'Geometric', 'XDieIndex', None, 'ProductInfo_Geometric_XDieIndex'),
+    ('ProductInfo.ini', 'Geometric', 'YDieIndex', None, 'ProductInfo_Geometric_YDieIndex'),
+    ('ProductInfo.ini', 'Geometric', 'Diameter', None, 'ProductInfo_Geometric_Diameter'),
+    ('ProductInfo.ini', 'UpperIdReader', 'Enabled', None, 'ProductInfo_UpperIdReader_Enabled'),
+    ('ProductInfo.ini', 'UpperIdReader', 'JobName', None, 'ProductInfo_UpperIdReader_JobName'),
+    ('AlignmentData.ini', 'General', 'MinScore', None, 'AlignmentData_General_MinScore'),
+    ('Recipe.ini', 'AutoCycle', 'ExportPMdata', None, 'Recipe_AutoCycle_ExportPMdata'),
+    ('Recipe.ini', 'AutoCycle', 'MaxImagesToGrabDie', None, 'Recipe_AutoCycle_MaxImagesToGrabDie'),
+    ('WaferMapRecipe.ini', 'GENERAL', 'ExportInAutoCycle', None, 'WaferMapRecipe_GENERAL_ExportInAutoCycle'),
+    ('WaferMapRecipe.ini', 'Input_Update', 'Enable', None, 'WaferMapRecipe_Input_Update_Enable'),
+    ('WaferMapRecipe.ini', 'Input_Update', 'FileMask', None, 'WaferMapRecipe_Input_Update_FileMask'),
+    ('WaferMapRecipe.ini', 'Input_Update', 'ImportDirectory', None, 'WaferMapRecipe_Input_Update_ImportDirectory'),
+    ('WaferMapRecipe.ini', 'Input_Update', 'ConverterName', None, 'WaferMapRecipe_Input_Update_ConverterName'),
+]
+
+# 各 INI 檔的讀取方式。未列出的檔案：鍵不分大小寫、先去除非 ASCII 字元、空白值也寫入，結果寫入所屬資料夾
+INI_FILE_OPTIONS = {
+    'OpticsPreset.ini': {'keep_case': True, 'clean': False, 'skip_empty': True},
+    'WaferMapRecipe.ini': {'recipe_level': True},  # Setup1 下的檔案，結果屬於整個 Recipe
+}
+
+class IniExtractionPlan:
+    """由 INI_EXTRACTION_SPEC 編譯出的單一 INI 檔擷取計畫。
+
+    檔案只讀取、解析一次；以樣式比對的欄位在各區段中只掃描一次，每個樣式取第一個符合的鍵。
+    """
+
+    def __init__(self, filename, fields, keep_case=False, clean=True, skip_empty=False, recipe_level=False):
+        self.filename = filename
+        self.keep_case = keep_case
+        self.clean = clean
+        self.skip_empty = skip_empty
+        self.recipe_level = recipe_level
+        self.fields = fields
+        self.keys = [field for field in fields if not isinstance(field[1], re.Pattern)]
+        self.patterns = {}  # 區段 -> 以樣式比對的欄位
+        for field in fields:
+            if isinstance(field[1], re.Pattern):
+                self.patterns.setdefault(field[0], []).append(field)
+
+    def extract(self, content):
+        # 回傳 [(輸出變數, 值)]，依規格中的順序
+        if self.clean:
+            content = ascii_text(content)
+        config = configparser.ConfigParser()
+        if self.keep_case:
+            config.optionxform = str  # 保持鍵的大小寫
+        config.read_string(content)
+
+        values = {}
+        for section, key, transform, variable in self.keys:
+            values[variable] = config.get(section, key, fallback='')
+        for section, fields in self.patterns.items():
+            if section not in config:
+                continue
+            pending = list(fields)
+            for key, value in config[section].items():
+                for field in [field for field in pending if field[1].fullmatch(key)]:
+                    values[field[3]] = value
+                    pending.remove(field)
+                if not pending:
+                    break
+
+        items = []
+        for section, key, transform, variable in self.fields:
+            value = values.get(variable, '')
+            if self.skip_empty and not value:
+                continue
+            items.append((variable, transform(value) if transform else value))
+        return items
+
+def compile_extraction_spec(spec, file_options):
+    fields = {}
+    for filename, section, key, transform, variable in spec:
+        fields.setdefault(filename, []).append((section, key, transform, variable))
+    return {filename: IniExtractionPlan(filename, file_fields, **file_options.get(filename, {}))
+            for filename, file_fields in fields.items()}
+
+INI_EXTRACTION_PLANS = compile_extraction_spec(INI_EXTRACTION_SPEC, INI_FILE_OPTIONS)
+
+# 每個 Setup1\Recipes 子資料夾中需要解析的檔案
+RECIPE_FOLDER_FILES = [filename for filename, plan in INI_EXTRACTION_PLANS.items() if not plan.recipe_level] + ['RTP.txt']
+
+# Define mappings：參數名稱 -> 儲存格
+CHECK_LIST_MAPPINGS = {
+    'AVI_recipe_group_ID': 'C4',
+    'ProductInfo_Geometric_Diameter': 'C5',
+    'ProductInfo_Geometric_XDieIndex': 'C7',
+    'ProductInfo_Geometric_YDieIndex': 'C8',
+    'AVI_recipe_name': 'C16',
+    'AVI_recipe_EQP_ID': 'C17',
+    'AlignRtp_DIE_Alignment_Die__MinScore': 'C18',
+    'AlignmentData_General_MinScore': 'C19',  
+    'ProductInfo_UpperIdReader_JobName': 'C20',  
+    'OpticsPreset_Robotsetup_Name': 'C21',
+    'OpticsPreset_General_DiffLight': 'C23',
+    'OpticsPreset_General_RefLight': 'C24',
+    'OpticsPreset_General_VerifyColorMag_RefLight': 'C25',
+    'OpticsPreset_General_VerifyColorMag_Mag': 'C31',
+    'Recipe_AutoCycle_ExportPMdata': 'C35',
+    'Recipe_AutoCycle_MaxImagesToGrabDie': 'C36',
+    'ProductInfo_General_OCRWaferIDMask': 'C37',
+    'Recipe_file_count': 'C38',
+    'WaferMapRecipe_GENERAL_ExportInAutoCycle': 'C40',
+    'WaferMapRecipe_Input_Update_Enable': 'C42',
+    'WaferMapRecipe_Input_Update_FileMask': 'C43',
+    'WaferMapRecipe_Input_Update_ImportDirectory': 'C44',
+    'WaferMapRecipe_Input_Update_ConverterName': 'C45',
+}
+
+SURFACE_MAPPINGS = {
+    'RTP_Scan_Area_Surface_Min_Defect_Area_-_Bright': 'F4',
+    'RTP_Scan_Area_Surface_Min_Defect_Width_-_Bright': 'F5',
+    'RTP_Scan_Area_Surface_Min_Defect_Length_-_Bright': 'F6',
+    'RTP_Scan_Area_Surface_Contrast_Delta_-_Bright': 'F7',
+    'RTP_Scan_Area_Surface_Contrast_Factor_-_Bright': 'F8',
+    'RTP_Scan_Area_Surface_Min_Defect_Area_-_Dark': 'F9',
+    'RTP_Scan_Area_Surface_Min_Defect_Width_-_Dark': 'F10',
+    'RTP_Scan_Area_Surface_Min_Defect_Length_-_Dark': 'F11',
+    'RTP_Scan_Area_Surface_Contrast_Delta_-_Dark': 'F12',
+    'RTP_Scan_Area_Surface_Contrast_Factor_-_Dark': 'F13',
+    'RTP_Scan_Area_Surface_Big_Area_Status_-_Bright': 'F14',
+    'RTP_Scan_Area_Surface_Big_Area_Status_-_Dark': 'F15',
+    'RTP_Scan_Area_Surface_Cluster_Area': 'F16',
+    'RTP_Scan_Area_Surface_Cluster_Distance': 'F17',
+    'RTP_Scan_Area_Surface_Cluster_Diameter': 'F18',
+    'RTP_Scan_Area_Surface_Adaptive_Histogram_Mode': 'F19',
+    'RTP_Scan_Area_Surface_CollectForGlobalSum': 'F20',
+    'RTP_Scan_Area_Surface_MaxAreaSum': 'F21',
+    'RTP_Scan_Area_Surface_Zone_CD_Radius': 'F22',
+    'RTP_Scan_Area_Surface_Dark_Zone_CD_Percent': 'F23',
+    'RTP_Scan_Area_Surface_Bright_Zone_CD_Percent': 'F24',
+    'RTP_Scan_Area_Surface_MaxCountSum': 'F25'
+    }
+
+PAD_DEVICE_MAPPINGS = {
+    #[Bump_Map_1]
+    'RTP_Bump_Map_1_Surface_Min_Defect_Area_-_Bright': 'F4',
+    'RTP_Bump_Map_1_Surface_Min_Defect_Width_-_Bright': 'F5',
+    'RTP_Bump_Map_1_Surface_Min_Defect_Length_-_Bright': 'F6',
+    'RTP_Bump_Map_1_Surface_Contrast_Delta_-_Bright': 'F7',
+    'RTP_Bump_Map_1_Surface_Contrast_Factor_-_Bright': 'F8',
+    'RTP_Bump_Map_1_Surface_Min_Defect_Area_-_Dark': 'F9',
+    'RTP_Bump_Map_1_Surface_Min_Defect_Width_-_Dark': 'F10',
+    'RTP_Bump_Map_1_Surface_Min_Defect_Length_-_Dark': 'F11',
+    'RTP_Bump_Map_1_Surface_Contrast_Delta_-_Dark': 'F12',
+    'RTP_Bump_Map_1_Surface_Contrast_Factor_-_Dark': 'F13',
+    'RTP_Bump_Map_1_Surface_Big_Area_Status_-_Bright': 'F14',
+    'RTP_Bump_Map_1_Surface_Big_Area_Status_-_Dark': 'F15',
+    'RTP_Bump_Map_1_Surface_Cluster_Area': 'F16',
+    'RTP_Bump_Map_1_Surface_Cluster_Distance': 'F17',
+    'RTP_Bump_Map_1_Surface_Cluster_Diameter': 'F18',
+    'RTP_Bump_Map_1_Surface_Adaptive_Histogram_Mode': 'F19',
+    'RTP_Bump_Map_1_Surface_CollectForGlobalSum': 'F20',
+    'RTP_Bump_Map_1_Surface_MaxAreaSum': 'F21',
+    'RTP_Bump_Map_1_Surface_Zone_CD_Radius': 'F22',
+    'RTP_Bump_Map_1_Surface_Dark_Zone_CD_Percent': 'F23',
+    'RTP_Bump_Map_1_Surface_Bright_Zone_CD_Percent': 'F24',
+    'RTP_Bump_Map_1_Surface_MaxCountSum': 'F25',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F125',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F126',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F127',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F128',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F129',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F130',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F131',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Sensitivity': 'F132',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Probe__Sensitivity': 'F133',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Low_Threshold': 'F134',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_High_Threshold': 'F135',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F136',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F137',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_PM_Min_Area': 'F138',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F139',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F140',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F141',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F142',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Enable_surface_zone': 'F143',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Dont_Care_zone': 'F144',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Surface_Zone': 'F145',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F146',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F147',
+    'RTP_Bump_Map_1_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F148',
+    'RTP_Bump_Map_1_PMI_Advanced_USL_Pad_Size_X': 'F256',
+    'RTP_Bump_Map_1_PMI_Advanced_LSL_Pad_Size_X': 'F257',
+    'RTP_Bump_Map_1_PMI_Advanced_USL_Pad_Size_Y': 'F258',
+    'RTP_Bump_Map_1_PMI_Advanced_LSL_Pad_Size_Y': 'F259',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Mislocation_X': 'F260',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Mislocation_Y': 'F261',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Edge_Sensitivity': 'F262',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Sensitivity': 'F263',
+    'RTP_Bump_Map_1_PMI_Advanced_PM_Sensitivity': 'F264',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Gray_Level': 'F265',
+    'RTP_Bump_Map_1_PMI_Advanced_Pad_Edge_Gray_Level': 'F266',
+    'RTP_Bump_Map_1_PMI_Advanced_Surface_Gray_Level': 'F267',
+    'RTP_Bump_Map_1_PMI_Advanced_USL_PM_Area_[%]': 'F268',
+    'RTP_Bump_Map_1_PMI_Advanced_LSL_PM_Area': 'F269',
+    'RTP_Bump_Map_1_PMI_Advanced_PM_Min_Spot_Area': 'F270',
+    'RTP_Bump_Map_1_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F271',
+    'RTP_Bump_Map_1_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F272',
+    'RTP_Bump_Map_1_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F273',
+    'RTP_Bump_Map_1_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F274',
+    'RTP_Bump_Map_1_PMI_Advanced_Enable_surface_zone': 'F275',
+    'RTP_Bump_Map_1_PMI_Advanced_Don**_Care_zone': 'F276',
+    'RTP_Bump_Map_1_PMI_Advanced_Surface_Zone': 'F277',
+    'RTP_Bump_Map_1_PMI_Advanced_Min_Defect_Area': 'F278',
+    'RTP_Bump_Map_1_PMI_Advanced_Contrast_Delta_-_Dark': 'F279',
+    'RTP_Bump_Map_1_PMI_Advanced_Contrast_Delta_-_bright': 'F280',
+    'RTP_Bump_Map_1_PMI_Advanced_nspection_Sensitivity': 'F281',
+    'RTP_Bump_Map_1_PMI_Advanced_Ref_Sensitivity': 'F282',
+
+    #[Bump_Map_2]
+    'RTP_Bump_Map_2_Surface_Min_Defect_Area_-_Bright': 'F28',
+    'RTP_Bump_Map_2_Surface_Min_Defect_Width_-_Bright': 'F29',
+    'RTP_Bump_Map_2_Surface_Min_Defect_Length_-_Bright': 'F30',
+    'RTP_Bump_Map_2_Surface_Contrast_Delta_-_Bright': 'F31',
+    'RTP_Bump_Map_2_Surface_Contrast_Factor_-_Bright': 'F32',
+    'RTP_Bump_Map_2_Surface_Min_Defect_Area_-_Dark': 'F33',
+    'RTP_Bump_Map_2_Surface_Min_Defect_Width_-_Dark': 'F34',
+    'RTP_Bump_Map_2_Surface_Min_Defect_Length_-_Dark': 'F35',
+    'RTP_Bump_Map_2_Surface_Contrast_Delta_-_Dark': 'F36',
+    'RTP_Bump_Map_2_Surface_Contrast_Factor_-_Dark': 'F37',
+    'RTP_Bump_Map_2_Surface_Big_Area_Status_-_Bright': 'F38',
+    'RTP_Bump_Map_2_Surface_Big_Area_Status_-_Dark': 'F39',
+    'RTP_Bump_Map_2_Surface_Cluster_Area': 'F40',
+    'RTP_Bump_Map_2_Surface_Cluster_Distance': 'F41',
+    'RTP_Bump_Map_2_Surface_Cluster_Diameter': 'F42',
+    'RTP_Bump_Map_2_Surface_Adaptive_Histogram_Mode': 'F43',
+    'RTP_Bump_Map_2_Surface_CollectForGlobalSum': 'F44',
+    'RTP_Bump_Map_2_Surface_MaxAreaSum': 'F45',
+    'RTP_Bump_Map_2_Surface_Zone_CD_Radius': 'F46',
+    'RTP_Bump_Map_2_Surface_Dark_Zone_CD_Percent': 'F47',
+    'RTP_Bump_Map_2_Surface_Bright_Zone_CD_Percent': 'F48',
+    'RTP_Bump_Map_2_Surface_MaxCountSum': 'F49',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F151',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F152',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F153',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F154',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F155',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F156',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F157',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Sensitivity': 'F158',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Probe__Sensitivity': 'F159',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Low_Threshold': 'F160',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_High_Threshold': 'F161',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F162',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F163',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_PM_Min_Area': 'F164',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F165',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F166',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F167',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F168',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Enable_surface_zone': 'F169',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Dont_Care_zone': 'F170',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Surface_Zone': 'F171',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F172',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F173',
+    'RTP_Bump_Map_2_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F174',
+    'RTP_Bump_Map_2_PMI_Advanced_USL_Pad_Size_X': 'F285',
+    'RTP_Bump_Map_2_PMI_Advanced_LSL_Pad_Size_X': 'F286',
+    'RTP_Bump_Map_2_PMI_Advanced_USL_Pad_Size_Y': 'F287',
+    'RTP_Bump_Map_2_PMI_Advanced_LSL_Pad_Size_Y': 'F288',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Mislocation_X': 'F289',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Mislocation_Y': 'F290',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Edge_Sensitivity': 'F291',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Sensitivity': 'F292',
+    'RTP_Bump_Map_2_PMI_Advanced_PM_Sensitivity': 'F293',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Gray_Level': 'F294',
+    'RTP_Bump_Map_2_PMI_Advanced_Pad_Edge_Gray_Level': 'F295',
+    'RTP_Bump_Map_2_PMI_Advanced_Surface_Gray_Level': 'F296',
+    'RTP_Bump_Map_2_PMI_Advanced_USL_PM_Area_[%]': 'F297',
+    'RTP_Bump_Map_2_PMI_Advanced_LSL_PM_Area': 'F298',
+    'RTP_Bump_Map_2_PMI_Advanced_PM_Min_Spot_Area': 'F299',
+    'RTP_Bump_Map_2_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F300',
+    'RTP_Bump_Map_2_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F301',
+    'RTP_Bump_Map_2_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F302',
+    'RTP_Bump_Map_2_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F303',
+    'RTP_Bump_Map_2_PMI_Advanced_Enable_surface_zone': 'F304',
+    'RTP_Bump_Map_2_PMI_Advanced_Don**_Care_zone': 'F305',
+    'RTP_Bump_Map_2_PMI_Advanced_Surface_Zone': 'F306',
+    'RTP_Bump_Map_2_PMI_Advanced_Min_Defect_Area': 'F307',
+    'RTP_Bump_Map_2_PMI_Advanced_Contrast_Delta_-_Dark': 'F308',
+    'RTP_Bump_Map_2_PMI_Advanced_Contrast_Delta_-_bright': 'F309',
+    'RTP_Bump_Map_2_PMI_Advanced_nspection_Sensitivity': 'F310',
+    'RTP_Bump_Map_2_PMI_Advanced_Ref_Sensitivity': 'F311',
+
+    #[Bump_Map_3]
+    'RTP_Bump_Map_3_Surface_Min_Defect_Area_-_Bright': 'F52',
+    'RTP_Bump_Map_3_Surface_Min_Defect_Width_-_Bright': 'F53',
+    'RTP_Bump_Map_3_Surface_Min_Defect_Length_-_Bright': 'F54',
+    'RTP_Bump_Map_3_Surface_Contrast_Delta_-_Bright': 'F55',
+    'RTP_Bump_Map_3_Surface_Contrast_Factor_-_Bright': 'F56',
+    'RTP_Bump_Map_3_Surface_Min_Defect_Area_-_Dark': 'F57',
+    'RTP_Bump_Map_3_Surface_Min_Defect_Width_-_Dark': 'F58',
+    'RTP_Bump_Map_3_Surface_Min_Defect_Length_-_Dark': 'F59',
+    'RTP_Bump_Map_3_Surface_Contrast_Delta_-_Dark': 'F60',
+    'RTP_Bump_Map_3_Surface_Contrast_Factor_-_Dark': 'F61',
+    'RTP_Bump_Map_3_Surface_Big_Area_Status_-_Bright': 'F62',
+    'RTP_Bump_Map_3_Surface_Big_Area_Status_-_Dark': 'F63',
+    'RTP_Bump_Map_3_Surface_Cluster_Area': 'F64',
+    'RTP_Bump_Map_3_Surface_Cluster_Distance': 'F65',
+    'RTP_Bump_Map_3_Surface_Cluster_Diameter': 'F66',
+    'RTP_Bump_Map_3_Surface_Adaptive_Histogram_Mode': 'F67',
+    'RTP_Bump_Map_3_Surface_CollectForGlobalSum': 'F68',
+    'RTP_Bump_Map_3_Surface_MaxAreaSum': 'F69',
+    'RTP_Bump_Map_3_Surface_Zone_CD_Radius': 'F70',
+    'RTP_Bump_Map_3_Surface_Dark_Zone_CD_Percent': 'F71',
+    'RTP_Bump_Map_3_Surface_Bright_Zone_CD_Percent': 'F72',
+    'RTP_Bump_Map_3_Surface_MaxCountSum': 'F73',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F177',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F178',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F179',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F180',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F181',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F182',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F183',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Sensitivity': 'F184',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Probe__Sensitivity': 'F185',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Low_Threshold': 'F186',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_High_Threshold': 'F187',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F188',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F189',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_PM_Min_Area': 'F190',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F191',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F192',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F193',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F194',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Enable_surface_zone': 'F195',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Dont_Care_zone': 'F196',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Surface_Zone': 'F197',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F198',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F199',
+    'RTP_Bump_Map_3_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F200',
+    'RTP_Bump_Map_3_PMI_Advanced_USL_Pad_Size_X': 'F314',
+    'RTP_Bump_Map_3_PMI_Advanced_LSL_Pad_Size_X': 'F315',
+    'RTP_Bump_Map_3_PMI_Advanced_USL_Pad_Size_Y': 'F316',
+    'RTP_Bump_Map_3_PMI_Advanced_LSL_Pad_Size_Y': 'F317',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Mislocation_X': 'F318',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Mislocation_Y': 'F319',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Edge_Sensitivity': 'F320',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Sensitivity': 'F321',
+    'RTP_Bump_Map_3_PMI_Advanced_PM_Sensitivity': 'F322',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Gray_Level': 'F323',
+    'RTP_Bump_Map_3_PMI_Advanced_Pad_Edge_Gray_Level': 'F324',
+    'RTP_Bump_Map_3_PMI_Advanced_Surface_Gray_Level': 'F325',
+    'RTP_Bump_Map_3_PMI_Advanced_USL_PM_Area_[%]': 'F326',
+    'RTP_Bump_Map_3_PMI_Advanced_LSL_PM_Area': 'F327',
+    'RTP_Bump_Map_3_PMI_Advanced_PM_Min_Spot_Area': 'F328',
+    'RTP_Bump_Map_3_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F329',
+    'RTP_Bump_Map_3_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F330',
+    'RTP_Bump_Map_3_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F331',
+    'RTP_Bump_Map_3_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F332',
+    'RTP_Bump_Map_3_PMI_Advanced_Enable_surface_zone': 'F333',
+    'RTP_Bump_Map_3_PMI_Advanced_Don**_Care_zone': 'F334',
+    'RTP_Bump_Map_3_PMI_Advanced_Surface_Zone': 'F335',
+    'RTP_Bump_Map_3_PMI_Advanced_Min_Defect_Area': 'F336',
+    'RTP_Bump_Map_3_PMI_Advanced_Contrast_Delta_-_Dark': 'F337',
+    'RTP_Bump_Map_3_PMI_Advanced_Contrast_Delta_-_bright': 'F335',
+    'RTP_Bump_Map_3_PMI_Advanced_nspection_Sensitivity': 'F339',
+    'RTP_Bump_Map_3_PMI_Advanced_Ref_Sensitivity': 'F340',
+
+    #[Bump_Map_4]
+    'RTP_Bump_Map_4_Surface_Min_Defect_Area_-_Bright': 'F76',
+    'RTP_Bump_Map_4_Surface_Min_Defect_Width_-_Bright': 'F77',
+    'RTP_Bump_Map_4_Surface_Min_Defect_Length_-_Bright': 'F78',
+    'RTP_Bump_Map_4_Surface_Contrast_Delta_-_Bright': 'F79',
+    'RTP_Bump_Map_4_Surface_Contrast_Factor_-_Bright': 'F80',
+    'RTP_Bump_Map_4_Surface_Min_Defect_Area_-_Dark': 'F81',
+    'RTP_Bump_Map_4_Surface_Min_Defect_Width_-_Dark': 'F82',
+    'RTP_Bump_Map_4_Surface_Min_Defect_Length_-_Dark': 'F83',
+    'RTP_Bump_Map_4_Surface_Contrast_Delta_-_Dark': 'F84',
+    'RTP_Bump_Map_4_Surface_Contrast_Factor_-_Dark': 'F85',
+    'RTP_Bump_Map_4_Surface_Big_Area_Status_-_Bright': 'F86',
+    'RTP_Bump_Map_4_Surface_Big_Area_Status_-_Dark': 'F87',
+    'RTP_Bump_Map_4_Surface_Cluster_Area': 'F88',
+    'RTP_Bump_Map_4_Surface_Cluster_Distance': 'F89',
+    'RTP_Bump_Map_4_Surface_Cluster_Diameter': 'F90',
+    'RTP_Bump_Map_4_Surface_Adaptive_Histogram_Mode': 'F91',
+    'RTP_Bump_Map_4_Surface_CollectForGlobalSum': 'F92',
+    'RTP_Bump_Map_4_Surface_MaxAreaSum': 'F93',
+    'RTP_Bump_Map_4_Surface_Zone_CD_Radius': 'F94',
+    'RTP_Bump_Map_4_Surface_Dark_Zone_CD_Percent': 'F95',
+    'RTP_Bump_Map_4_Surface_Bright_Zone_CD_Percent': 'F96',
+    'RTP_Bump_Map_4_Surface_MaxCountSum': 'F97',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F203',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F204',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F205',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F206',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F207',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F208',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F209',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Sensitivity': 'F210',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Probe__Sensitivity': 'F211',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Low_Threshold': 'F212',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_High_Threshold': 'F213',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F214',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F215',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_PM_Min_Area': 'F216',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F217',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F218',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F219',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F220',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Enable_surface_zone': 'F221',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Dont_Care_zone': 'F222',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Surface_Zone': 'F223',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F224',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F225',
+    'RTP_Bump_Map_4_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F226',
+    'RTP_Bump_Map_4_PMI_Advanced_USL_Pad_Size_X': 'F343',
+    'RTP_Bump_Map_4_PMI_Advanced_LSL_Pad_Size_X': 'F344',
+    'RTP_Bump_Map_4_PMI_Advanced_USL_Pad_Size_Y': 'F345',
+    'RTP_Bump_Map_4_PMI_Advanced_LSL_Pad_Size_Y': 'F346',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Mislocation_X': 'F347',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Mislocation_Y': 'F348',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Edge_Sensitivity': 'F349',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Sensitivity': 'F350',
+    'RTP_Bump_Map_4_PMI_Advanced_PM_Sensitivity': 'F351',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Gray_Level': 'F351',
+    'RTP_Bump_Map_4_PMI_Advanced_Pad_Edge_Gray_Level': 'F353',
+    'RTP_Bump_Map_4_PMI_Advanced_Surface_Gray_Level': 'F354',
+    'RTP_Bump_Map_4_PMI_Advanced_USL_PM_Area_[%]': 'F355',
+    'RTP_Bump_Map_4_PMI_Advanced_LSL_PM_Area': 'F356',
+    'RTP_Bump_Map_4_PMI_Advanced_PM_Min_Spot_Area': 'F357',
+    'RTP_Bump_Map_4_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F358',
+    'RTP_Bump_Map_4_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F359',
+    'RTP_Bump_Map_4_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F360',
+    'RTP_Bump_Map_4_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F361',
+    'RTP_Bump_Map_4_PMI_Advanced_Enable_surface_zone': 'F362',
+    'RTP_Bump_Map_4_PMI_Advanced_Don**_Care_zone': 'F363',
+    'RTP_Bump_Map_4_PMI_Advanced_Surface_Zone': 'F364',
+    'RTP_Bump_Map_4_PMI_Advanced_Min_Defect_Area': 'F365',
+    'RTP_Bump_Map_4_PMI_Advanced_Contrast_Delta_-_Dark': 'F366',
+    'RTP_Bump_Map_4_PMI_Advanced_Contrast_Delta_-_bright': 'F367',
+    'RTP_Bump_Map_4_PMI_Advanced_nspection_Sensitivity': 'F368',
+    'RTP_Bump_Map_4_PMI_Advanced_Ref_Sensitivity': 'F369',
+
+    #[Bump_Map_5]
+    'RTP_Bump_Map_5_Surface_Min_Defect_Area_-_Bright': 'F100',
+    'RTP_Bump_Map_5_Surface_Min_Defect_Width_-_Bright': 'F101',
+    'RTP_Bump_Map_5_Surface_Min_Defect_Length_-_Bright': 'F102',
+    'RTP_Bump_Map_5_Surface_Contrast_Delta_-_Bright': 'F103',
+    'RTP_Bump_Map_5_Surface_Contrast_Factor_-_Bright': 'F104',
+    'RTP_Bump_Map_5_Surface_Min_Defect_Area_-_Dark': 'F105',
+    'RTP_Bump_Map_5_Surface_Min_Defect_Width_-_Dark': 'F106',
+    'RTP_Bump_Map_5_Surface_Min_Defect_Length_-_Dark': 'F107',
+    'RTP_Bump_Map_5_Surface_Contrast_Delta_-_Dark': 'F108',
+    'RTP_Bump_Map_5_Surface_Contrast_Factor_-_Dark': 'F109',
+    'RTP_Bump_Map_5_Surface_Big_Area_Status_-_Bright': 'F110',
+    'RTP_Bump_Map_5_Surface_Big_Area_Status_-_Dark': 'F111',
+    'RTP_Bump_Map_5_Surface_Cluster_Area': 'F112',
+    'RTP_Bump_Map_5_Surface_Cluster_Distance': 'F113',
+    'RTP_Bump_Map_5_Surface_Cluster_Diameter': 'F114',
+    'RTP_Bump_Map_5_Surface_Adaptive_Histogram_Mode': 'F115',
+    'RTP_Bump_Map_5_Surface_CollectForGlobalSum': 'F116',
+    'RTP_Bump_Map_5_Surface_MaxAreaSum': 'F117',
+    'RTP_Bump_Map_5_Surface_Zone_CD_Radius': 'F118',
+    'RTP_Bump_Map_5_Surface_Dark_Zone_CD_Percent': 'F119',
+    'RTP_Bump_Map_5_Surface_Bright_Zone_CD_Percent': 'F120',
+    'RTP_Bump_Map_5_Surface_MaxCountSum': 'F121',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F229',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F230',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F231',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F232',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F233',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F234',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F235',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Sensitivity': 'F236',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Probe__Sensitivity': 'F237',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Low_Threshold': 'F238',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_High_Threshold': 'F239',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F240',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F241',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_PM_Min_Area': 'F242',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F243',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F244',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F245',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F246',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Enable_surface_zone': 'F247',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Dont_Care_zone': 'F248',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Surface_Zone': 'F249',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F250',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F251',
+    'RTP_Bump_Map_5_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F252',
+    'RTP_Bump_Map_5_PMI_Advanced_USL_Pad_Size_X': 'F372',
+    'RTP_Bump_Map_5_PMI_Advanced_LSL_Pad_Size_X': 'F373',
+    'RTP_Bump_Map_5_PMI_Advanced_USL_Pad_Size_Y': 'F374',
+    'RTP_Bump_Map_5_PMI_Advanced_LSL_Pad_Size_Y': 'F375',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Mislocation_X': 'F376',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Mislocation_Y': 'F377',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Edge_Sensitivity': 'F378',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Sensitivity': 'F379',
+    'RTP_Bump_Map_5_PMI_Advanced_PM_Sensitivity': 'F380',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Gray_Level': 'F381',
+    'RTP_Bump_Map_5_PMI_Advanced_Pad_Edge_Gray_Level': 'F382',
+    'RTP_Bump_Map_5_PMI_Advanced_Surface_Gray_Level': 'F383',
+    'RTP_Bump_Map_5_PMI_Advanced_USL_PM_Area_[%]': 'F384',
+    'RTP_Bump_Map_5_PMI_Advanced_LSL_PM_Area': 'F385',
+    'RTP_Bump_Map_5_PMI_Advanced_PM_Min_Spot_Area': 'F386',
+    'RTP_Bump_Map_5_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F387',
+    'RTP_Bump_Map_5_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F388',
+    'RTP_Bump_Map_5_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F389',
+    'RTP_Bump_Map_5_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F390',
+    'RTP_Bump_Map_5_PMI_Advanced_Enable_surface_zone': 'F391',
+    'RTP_Bump_Map_5_PMI_Advanced_Don**_Care_zone': 'F392',
+    'RTP_Bump_Map_5_PMI_Advanced_Surface_Zone': 'F393',
+    'RTP_Bump_Map_5_PMI_Advanced_Min_Defect_Area': 'F394',
+    'RTP_Bump_Map_5_PMI_Advanced_Contrast_Delta_-_Dark': 'F395',
+    'RTP_Bump_Map_5_PMI_Advanced_Contrast_Delta_-_bright': 'F396',
+    'RTP_Bump_Map_5_PMI_Advanced_nspection_Sensitivity': 'F397',
+    'RTP_Bump_Map_5_PMI_Advanced_Ref_Sensitivity': 'F398'
+}
+
+BUMP_DEVICE_MAPPINGS = {
+    #[Bump_Map_1]
+    'RTP_Bump_Map_1_Solder_Bump_Bump_Color_is_White': 'F4',
+    'RTP_Bump_Map_1_Solder_Bump_Bump_is_Contaminated': 'F5',
+    'RTP_Bump_Map_1_Solder_Bump_Bump_Diamter_LSL': 'F6',
+    'RTP_Bump_Map_1_Solder_Bump_Bump_Diamter_USL': 'F7',
+    'RTP_Bump_Map_1_Solder_Bump_Mislocation_X': 'F8',
+    'RTP_Bump_Map_1_Solder_Bump_Mislocation_Y': 'F9',
+    'RTP_Bump_Map_1_Solder_Bump_Detection_Threshold': 'F10',
+    'RTP_Bump_Map_1_Solder_Bump_Detection_Gradient': 'F11',
+    'RTP_Bump_Map_1_Solder_Bump_Bump_Roundness': 'F12',
+    'RTP_Bump_Map_1_Solder_Bump_Number_Of_Lines': 'F13',
+    'RTP_Bump_Map_1_Solder_Bump_Min_Points_for_bump_detection': 'F14',
+    'RTP_Bump_Map_1_Solder_Bump_RadiusPercentIn': 'F15',
+    'RTP_Bump_Map_1_Solder_Bump_RadiusPercentOut': 'F16',
+    'RTP_Bump_Map_1_Solder_Bump_LSL_ShapeViolation': 'F17',
+    'RTP_Bump_Map_1_Solder_Bump_USL_ShapeViolation': 'F18',
+    'RTP_Bump_Map_1_Solder_Bump_EdgeDetectThreshold': 'F19',
+    'RTP_Bump_Map_1_Solder_Bump_EdgeDetectArea': 'F20',
+    'RTP_Bump_Map_1_Solder_Bump_EdgeDetectLength': 'F21',
+    'RTP_Bump_Map_1_Solder_Bump_EdgeDetectDiameter': 'F22',
+    'RTP_Bump_Map_1_Solder_Bump_Edge_-_MinGL': 'F23',
+    'RTP_Bump_Map_1_Solder_Bump_Edge_-_MaxGL': 'F24',
+    'RTP_Bump_Map_1_Solder_Bump_Mislocation': 'F25',
+    'RTP_Bump_Map_1_Surface_on_SB_Enable_Surface_Moving': 'F27',
+    'RTP_Bump_Map_1_Surface_on_SB_Exposed_Area_High_TH': 'F28',
+    'RTP_Bump_Map_1_Surface_on_SB_Exposed_Area_Low_TH': 'F29',
+    'RTP_Bump_Map_1_Surface_on_SB_Actual__position_don\'t_care_width': 'F30',
+    'RTP_Bump_Map_1_Surface_on_SB_Original_position_don\'t_care_width': 'F31',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Area_-_Bright': 'F32',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Width_-_Bright': 'F33',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Length_-_Bright': 'F34',
+    'RTP_Bump_Map_1_Surface_on_SB_Contrast_Delta_-_Bright': 'F35',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Area_-_Dark': 'F36',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Width_-_Dark': 'F37',
+    'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Length_-_Dark': 'F38',
+    'RTP_Bump_Map_1_Surface_on_SB_Contrast_Delta_-_Dark': 'F39',
+    'RTP_Bump_Map_1_Surface_on_SB_Elongation': 'F40',
+    'RTP_Bump_Map_1_Surface_on_SB_MaxAreaSum': 'F41',
+    'RTP_Bump_Map_1_Surface_on_SB_CollectForGlobalSum': 'F42',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F44',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F45',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F46',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F47',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F48',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F49',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F50',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F51',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F52',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F53',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F54',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F55',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F56',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_MaxAreaSum': 'F57',
+    'RTP_Bump_Map_1_Uniform_Surface_on_SB_CollectForGlobalSum': 'F58',
+
+    #[Bump_Map_2]
+    'RTP_Bump_Map_2_Solder_Bump_Bump_Color_is_White': 'F62',
+    'RTP_Bump_Map_2_Solder_Bump_Bump_is_Contaminated': 'F63',
+    'RTP_Bump_Map_2_Solder_Bump_Bump_Diamter_LSL': 'F64',
+    'RTP_Bump_Map_2_Solder_Bump_Bump_Diamter_USL': 'F65',
+    'RTP_Bump_Map_2_Solder_Bump_Mislocation_X': 'F66',
+    'RTP_Bump_Map_2_Solder_Bump_Mislocation_Y': 'F67',
+    'RTP_Bump_Map_2_Solder_Bump_Detection_Threshold': 'F68',
+    'RTP_Bump_Map_2_Solder_Bump_Detection_Gradient': 'F69',
+    'RTP_Bump_Map_2_Solder_Bump_Bump_Roundness': 'F70',
+    'RTP_Bump_Map_2_Solder_Bump_Number_Of_Lines': 'F71',
+    'RTP_Bump_Map_2_Solder_Bump_Min_Points_for_bump_detection': 'F72',
+    'RTP_Bump_Map_2_Solder_Bump_RadiusPercentIn': 'F73',
+    'RTP_Bump_Map_2_Solder_Bump_RadiusPercentOut': 'F74',
+    'RTP_Bump_Map_2_Solder_Bump_LSL_ShapeViolation': 'F75',
+    'RTP_Bump_Map_2_Solder_Bump_USL_ShapeViolation': 'F76',
+    'RTP_Bump_Map_2_Solder_Bump_EdgeDetectThreshold': 'F77',
+    'RTP_Bump_Map_2_Solder_Bump_EdgeDetectArea': 'F78',
+    'RTP_Bump_Map_2_Solder_Bump_EdgeDetectLength': 'F79',
+    'RTP_Bump_Map_2_Solder_Bump_EdgeDetectDiameter': 'F80',
+    'RTP_Bump_Map_2_Solder_Bump_Edge_-_MinGL': 'F81',
+    'RTP_Bump_Map_2_Solder_Bump_Edge_-_MaxGL': 'F82',
+    'RTP_Bump_Map_2_Solder_Bump_Mislocation': 'F83',
+    'RTP_Bump_Map_2_Surface_on_SB_Enable_Surface_Moving': 'F85',
+    'RTP_Bump_Map_2_Surface_on_SB_Exposed_Area_High_TH': 'F86',
+    'RTP_Bump_Map_2_Surface_on_SB_Exposed_Area_Low_TH': 'F87',
+    'RTP_Bump_Map_2_Surface_on_SB_Actual__position_don\'t_care_width': 'F88',
+    'RTP_Bump_Map_2_Surface_on_SB_Original_position_don\'t_care_width': 'F89',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Area_-_Bright': 'F90',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Width_-_Bright': 'F91',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Length_-_Bright': 'F92',
+    'RTP_Bump_Map_2_Surface_on_SB_Contrast_Delta_-_Bright': 'F93',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Area_-_Dark': 'F94',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Width_-_Dark': 'F95',
+    'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Length_-_Dark': 'F96',
+    'RTP_Bump_Map_2_Surface_on_SB_Contrast_Delta_-_Dark': 'F97',
+    'RTP_Bump_Map_2_Surface_on_SB_Elongation': 'F98',
+    'RTP_Bump_Map_2_Surface_on_SB_MaxAreaSum': 'F99',
+    'RTP_Bump_Map_2_Surface_on_SB_CollectForGlobalSum': 'F100',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F102',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F103',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F104',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F105',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F106',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F107',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F108',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F109',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F110',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F111',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F112',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F113',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F114',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_MaxAreaSum': 'F115',
+    'RTP_Bump_Map_2_Uniform_Surface_on_SB_CollectForGlobalSum': 'F116',
+
+    #[Bump_Map_3]
+    'RTP_Bump_Map_3_Solder_Bump_Bump_Color_is_White': 'F120',
+    'RTP_Bump_Map_3_Solder_Bump_Bump_is_Contaminated': 'F121',
+    'RTP_Bump_Map_3_Solder_Bump_Bump_Diamter_LSL': 'F122',
+    'RTP_Bump_Map_3_Solder_Bump_Bump_Diamter_USL': 'F123',
+    'RTP_Bump_Map_3_Solder_Bump_Mislocation_X': 'F124',
+    'RTP_Bump_Map_3_Solder_Bump_Mislocation_Y': 'F125',
+    'RTP_Bump_Map_3_Solder_Bump_Detection_Threshold': 'F126',
+    'RTP_Bump_Map_3_Solder_Bump_Detection_Gradient': 'F127',
+    'RTP_Bump_Map_3_Solder_Bump_Bump_Roundness': 'F128',
+    'RTP_Bump_Map_3_Solder_Bump_Number_Of_Lines': 'F129',
+    'RTP_Bump_Map_3_Solder_Bump_Min_Points_for_bump_detection': 'F130',
+    'RTP_Bump_Map_3_Solder_Bump_RadiusPercentIn': 'F131',
+    'RTP_Bump_Map_3_Solder_Bump_RadiusPercentOut': 'F132',
+    'RTP_Bump_Map_3_Solder_Bump_LSL_ShapeViolation': 'F133',
+    'RTP_Bump_Map_3_Solder_Bump_USL_ShapeViolation': 'F134',
+    'RTP_Bump_Map_3_Solder_Bump_EdgeDetectThreshold': 'F135',
+    'RTP_Bump_Map_3_Solder_Bump_EdgeDetectArea': 'F136',
+    'RTP_Bump_Map_3_Solder_Bump_EdgeDetectLength': 'F137',
+    'RTP_Bump_Map_3_Solder_Bump_EdgeDetectDiameter': 'F138',
+    'RTP_Bump_Map_3_Solder_Bump_Edge_-_MinGL': 'F139',
+    'RTP_Bump_Map_3_Solder_Bump_Edge_-_MaxGL': 'F140',
+    'RTP_Bump_Map_3_Solder_Bump_Mislocation': 'F141',
+    'RTP_Bump_Map_3_Surface_on_SB_Enable_Surface_Moving': 'F143',
+    'RTP_Bump_Map_3_Surface_on_SB_Exposed_Area_High_TH': 'F144',
+    'RTP_Bump_Map_3_Surface_on_SB_Exposed_Area_Low_TH': 'F145',
+    'RTP_Bump_Map_3_Surface_on_SB_Actual__position_don\'t_care_width': 'F146',
+    'RTP_Bump_Map_3_Surface_on_SB_Original_position_don\'t_care_width': 'F147',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Area_-_Bright': 'F148',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Width_-_Bright': 'F149',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Length_-_Bright': 'F150',
+    'RTP_Bump_Map_3_Surface_on_SB_Contrast_Delta_-_Bright': 'F151',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Area_-_Dark': 'F152',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Width_-_Dark': 'F153',
+    'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Length_-_Dark': 'F154',
+    'RTP_Bump_Map_3_Surface_on_SB_Contrast_Delta_-_Dark': 'F155',
+    'RTP_Bump_Map_3_Surface_on_SB_Elongation': 'F156',
+    'RTP_Bump_Map_3_Surface_on_SB_MaxAreaSum': 'F157',
+    'RTP_Bump_Map_3_Surface_on_SB_CollectForGlobalSum': 'F158',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F160',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F161',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F162',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F163',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F164',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F165',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F166',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F167',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F168',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F169',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F170',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F171',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F172',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_MaxAreaSum': 'F173',
+    'RTP_Bump_Map_3_Uniform_Surface_on_SB_CollectForGlobalSum': 'F174',
+
+    #[Bump_Map_4]
+    'RTP_Bump_Map_4_Solder_Bump_Bump_Color_is_White': 'F178',
+    'RTP_Bump_Map_4_Solder_Bump_Bump_is_Contaminated': 'F179',
+    'RTP_Bump_Map_4_Solder_Bump_Bump_Diamter_LSL': 'F180',
+    'RTP_Bump_Map_4_Solder_Bump_Bump_Diamter_USL': 'F181',
+    'RTP_Bump_Map_4_Solder_Bump_Mislocation_X': 'F182',
+    'RTP_Bump_Map_4_Solder_Bump_Mislocation_Y': 'F183',
+    'RTP_Bump_Map_4_Solder_Bump_Detection_Threshold': 'F184',
+    'RTP_Bump_Map_4_Solder_Bump_Detection_Gradient': 'F185',
+    'RTP_Bump_Map_4_Solder_Bump_Bump_Roundness': 'F186',
+    'RTP_Bump_Map_4_Solder_Bump_Number_Of_Lines': 'F187',
+    'RTP_Bump_Map_4_Solder_Bump_Min_Points_for_bump_detection': 'F188',
+    'RTP_Bump_Map_4_Solder_Bump_RadiusPercentIn': 'F189',
+    'RTP_Bump_Map_4_Solder_Bump_RadiusPercentOut': 'F190',
+    'RTP_Bump_Map_4_Solder_Bump_LSL_ShapeViolation': 'F191',
+    'RTP_Bump_Map_4_Solder_Bump_USL_ShapeViolation': 'F192',
+    'RTP_Bump_Map_4_Solder_Bump_EdgeDetectThreshold': 'F193',
+    'RTP_Bump_Map_4_Solder_Bump_EdgeDetectArea': 'F194',
+    'RTP_Bump_Map_4_Solder_Bump_EdgeDetectLength': 'F195',
+    'RTP_Bump_Map_4_Solder_Bump_EdgeDetectDiameter': 'F196',
+    'RTP_Bump_Map_4_Solder_Bump_Edge_-_MinGL': 'F197',
+    'RTP_Bump_Map_4_Solder_Bump_Edge_-_MaxGL': 'F198',
+    'RTP_Bump_Map_4_Solder_Bump_Mislocation': 'F199',
+    'RTP_Bump_Map_4_Surface_on_SB_Enable_Surface_Moving': 'F201',
+    'RTP_Bump_Map_4_Surface_on_SB_Exposed_Area_High_TH': 'F202',
+    'RTP_Bump_Map_4_Surface_on_SB_Exposed_Area_Low_TH': 'F203',
+    'RTP_Bump_Map_4_Surface_on_SB_Actual__position_don\'t_care_width': 'F204',
+    'RTP_Bump_Map_4_Surface_on_SB_Original_position_don\'t_care_width': 'F205',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Area_-_Bright': 'F206',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Width_-_Bright': 'F207',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Length_-_Bright': 'F208',
+    'RTP_Bump_Map_4_Surface_on_SB_Contrast_Delta_-_Bright': 'F209',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Area_-_Dark': 'F210',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Width_-_Dark': 'F211',
+    'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Length_-_Dark': 'F212',
+    'RTP_Bump_Map_4_Surface_on_SB_Contrast_Delta_-_Dark': 'F213',
+    'RTP_Bump_Map_4_Surface_on_SB_Elongation': 'F214',
+    'RTP_Bump_Map_4_Surface_on_SB_MaxAreaSum': 'F215',
+    'RTP_Bump_Map_4_Surface_on_SB_CollectForGlobalSum': 'F216',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F218',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F219',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F220',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F221',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F222',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F223',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F224',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F225',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F226',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F227',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F228',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F229',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F230',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_MaxAreaSum': 'F231',
+    'RTP_Bump_Map_4_Uniform_Surface_on_SB_CollectForGlobalSum': 'F232',
+
+    #[Bump_Map_5]
+    'RTP_Bump_Map_5_Solder_Bump_Bump_Color_is_White': 'F236',
+    'RTP_Bump_Map_5_Solder_Bump_Bump_is_Contaminated': 'F237',
+    'RTP_Bump_Map_5_Solder_Bump_Bump_Diamter_LSL': 'F238',
+    'RTP_Bump_Map_5_Solder_Bump_Bump_Diamter_USL': 'F239',
+    'RTP_Bump_Map_5_Solder_Bump_Mislocation_X': 'F240',
+    'RTP_Bump_Map_5_Solder_Bump_Mislocation_Y': 'F241',
+    'RTP_Bump_Map_5_Solder_Bump_Detection_Threshold': 'F242',
+    'RTP_Bump_Map_5_Solder_Bump_Detection_Gradient': 'F243',
+    'RTP_Bump_Map_5_Solder_Bump_Bump_Roundness': 'F244',
+    'RTP_Bump_Map_5_Solder_Bump_Number_Of_Lines': 'F245',
+    'RTP_Bump_Map_5_Solder_Bump_Min_Points_for_bump_detection': 'F246',
+    'RTP_Bump_Map_5_Solder_Bump_RadiusPercentIn': 'F247',
+    'RTP_Bump_Map_5_Solder_Bump_RadiusPercentOut': 'F248',
+    'RTP_Bump_Map_5_Solder_Bump_LSL_ShapeViolation': 'F249',
+    'RTP_Bump_Map_5_Solder_Bump_USL_ShapeViolation': 'F250',
+    'RTP_Bump_Map_5_Solder_Bump_EdgeDetectThreshold': 'F251',
+    'RTP_Bump_Map_5_Solder_Bump_EdgeDetectArea': 'F252',
+    'RTP_Bump_Map_5_Solder_Bump_EdgeDetectLength': 'F253',
+    'RTP_Bump_Map_5_Solder_Bump_EdgeDetectDiameter': 'F254',
+    'RTP_Bump_Map_5_Solder_Bump_Edge_-_MinGL': 'F255',
+    'RTP_Bump_Map_5_Solder_Bump_Edge_-_MaxGL': 'F256',
+    'RTP_Bump_Map_5_Solder_Bump_Mislocation': 'F257',
+    'RTP_Bump_Map_5_Surface_on_SB_Enable_Surface_Moving': 'F259',
+    'RTP_Bump_Map_5_Surface_on_SB_Exposed_Area_High_TH': 'F260',
+    'RTP_Bump_Map_5_Surface_on_SB_Exposed_Area_Low_TH': 'F261',
+    'RTP_Bump_Map_5_Surface_on_SB_Actual__position_don\'t_care_width': 'F262',
+    'RTP_Bump_Map_5_Surface_on_SB_Original_position_don\'t_care_width': 'F263',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Area_-_Bright': 'F264',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Width_-_Bright': 'F265',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Length_-_Bright': 'F266',
+    'RTP_Bump_Map_5_Surface_on_SB_Contrast_Delta_-_Bright': 'F267',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Area_-_Dark': 'F268',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Width_-_Dark': 'F269',
+    'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Length_-_Dark': 'F270',
+    'RTP_Bump_Map_5_Surface_on_SB_Contrast_Delta_-_Dark': 'F271',
+    'RTP_Bump_Map_5_Surface_on_SB_Elongation': 'F272',
+    'RTP_Bump_Map_5_Surface_on_SB_MaxAreaSum': 'F273',
+    'RTP_Bump_Map_5_Surface_on_SB_CollectForGlobalSum': 'F274',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F276',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F277',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F278',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F279',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F280',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F281',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F282',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F283',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F284',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F285',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F286',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F287',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F288',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_MaxAreaSum': 'F289',
+    'RTP_Bump_Map_5_Uniform_Surface_on_SB_CollectForGlobalSum': 'F290',
+}
+
+ALL_MAPPINGS = {
+    'Default': {
+        "Check list": CHECK_LIST_MAPPINGS,
+        "Surface": SURFACE_MAPPINGS,
+        "Pad device": PAD_DEVICE_MAPPINGS,
+        "Bump device": BUMP_DEVICE_MAPPINGS
+    },
+    'Default1': {
+        "Check list_Multi": CHECK_LIST_MAPPINGS,
+        "Surface_Multi": SURFACE_MAPPINGS,
+        "Pad device_Multi": PAD_DEVICE_MAPPINGS,
+        "Bump device_Multi": BUMP_DEVICE_MAPPINGS
+    }
+}
+
+# 參數對應有變動時，舊的 check list 也不再沿用
+MAPPINGS_DIGEST = hashlib.sha256(json.dumps(ALL_MAPPINGS, sort_keys=True).encode('utf-8')).hexdigest()
+
+def template_digest(template_bytes):
+    return hashlib.sha256(template_bytes).hexdigest()
+
+class Storage(abc.ABC):
+    """一個存放位置；name 為相對於該位置、以 / 分隔的檔名"""
+    remote = False  # 網路磁碟：讀取範本時在本機保留快取
+
+    @abc.abstractmethod
+    def path(self, name=''):
+        pass
+
+    @abc.abstractmethod
+    def stat(self, name):
+        # 回傳 (大小, 修改時間)，不存在時 raise FileNotFoundError
+        pass
+
+    @abc.abstractmethod
+    def read_bytes(self, name):
+        pass
+
+    @abc.abstractmethod
+    def write_bytes(self, name, data):
+        pass
+
+    @abc.abstractmethod
+    def listdir(self):
+        pass
+
+    def exists(self, name):
+        try:
+            self.stat(name)
+        except OSError:
+            return False
+        return True
+
+class LocalStorage(Storage):
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, name=''):
+        return os.path.join(self.root, *name.split('/')) if name else self.root
+
+    def stat(self, name):
+        stat = os.stat(self.path(name))
+        return stat.st_size, stat.st_mtime
+
+    def read_bytes(self, name):
+        with open(self.path(name), 'rb') as file:
+            return file.read()
+
+    def write_bytes(self, name, data):
+        # 先寫入暫存檔再改名，其他程式不會讀到寫到一半的檔案
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def listdir(self):
+        return os.listdir(self.root)
+
+class ShareStorage(LocalStorage):
+    """網路磁碟上的資料夾，存取方式與本機資料夾相同"""
+    remote = True
+
+class MemoryStorage(Storage):
+    """只存在記憶體中的存放位置，供測試使用"""
+
+    def __init__(self, files=None, name='memory'):
+        self.name = name
+        self.files = dict(files or {})
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, root, name='memory'):
+        # 以本機資料夾目前的內容作為初始檔案，之後的寫入只存在記憶體中
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, 'rb') as file:
+                    files[os.path.relpath(path, root).replace(os.sep, '/')] = file.read()
+        return cls(files, name)
+
+    def path(self, name=''):
+        return f'{self.name}:/{name}'
+
+    def stat(self, name):
+        with self._lock:
+            if name not in self.files:
+                raise FileNotFoundError(self.path(name))
+            return len(self.files[name]), self._versions.get(name, 0)
+
+    def read_bytes(self, name):
+        with self._lock:
+            if name not in self.files:
+                raise FileNotFoundError(self.path(name))
+            return self.files[name]
+
+    def write_bytes(self, name, data):
+        with self._lock:
+            self.files[name] = bytes(data)
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def listdir(self):
+        with self._lock:
+            return sorted({name.split('/')[0] for name in self.files})
+
+STORAGE_TYPES = {'local': LocalStorage, 'share': ShareStorage}
+
+def create_storage(location):
+    # location 為 {'type': 'local' | 'share' | 'memory', 'path': 資料夾}，或直接為本機資料夾路徑；
+    # memory 類型的 path 可省略，指定時以該資料夾的內容作為初始檔案
+    if isinstance(location, str):
+        return LocalStorage(location)
+    if location.get('type') == 'memory':
+        if location.get('path'):
+            return MemoryStorage.from_directory(location['path'], location.get('name', 'memory'))
+        return MemoryStorage(name=location.get('name', 'memory'))
+    if location.get('type', 'local') not in STORAGE_TYPES:
+        raise ValueError(f"不支援的存放位置類型: {location.get('type')}")
+    return STORAGE_TYPES[location.get('type', 'local')](location['path'])
+
+class TemplateCache:
+    """範本的讀取與快取。
+
+    網路磁碟上的範本在本機 cache_dir 保留一份副本與其 SHA-256：來源檔的大小與修改時間和上次相同、
+    且本機副本的雜湊正確時直接使用本機副本，不再從網路磁碟讀取；來源無法存取時沿用驗證過的本機副本。
+    讀取過的範本保留在記憶體中，來源沒有變動時不再讀取。
+    """
+
+    def __init__(self, storage, name=TEMPLATE_FILENAME, cache_dir=None):
+        self.storage = storage
+        self.name = name
+        self.cache_dir = cache_dir if storage.remote else None
+        self._loaded = None  # (來源的大小與修改時間, 內容)
+        self._lock = threading.Lock()
+        self.counts = {}  # 網路磁碟上的範本：hit（使用本機副本）、miss（由網路磁碟讀取）、offline、bytes_read
+
+    def _count(self, name, value=1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def _cache_paths(self):
+        base_path = os.path.join(self.cache_dir, self.name)
+        return base_path, base_path + '.json'
+
+    def _read_cache(self, stamp):
+        # 記錄的來源大小與修改時間相同（stamp 為 None 表示來源無法存取）且雜湊正確時回傳本機副本
+        data_path, meta_path = self._cache_paths()
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            if stamp is not None and meta.get('stamp') != list(stamp):
+                return None
+            with open(data_path, 'rb') as file:
+                data = file.read()
+        except (OSError, ValueError):
+            return None
+        return data if hashlib.sha256(data).hexdigest() == meta.get('sha256') else None
+
+    def _write_cache(self, stamp, data):
+        data_path, meta_path = self._cache_paths()
+        try:
+            LocalStorage(self.cache_dir).write_bytes(self.name, data)
+            with open(meta_path, 'w', encoding='utf-8') as file:
+                json.dump({'stamp': list(stamp), 'sha256': hashlib.sha256(data).hexdigest(),
+                           'source': self.storage.path(self.name)}, file)
+        except OSError as e:
+            print(f"寫入範本快取時發生錯誤: {e}")
+
+    def read(self):
+        with self._lock:
+            try:
+                stamp = self.storage.stat(self.name)
+            except OSError:
+                if self.cache_dir is None:
+                    raise
+                data = self._loaded[1] if self._loaded is not None else self._read_cache(None)
+                if data is None:
+                    raise
+                self._count('offline')
+                print(f"無法存取範本 {self.storage.path(self.name)}，使用本機快取")
+                return data
+            if self._loaded is not None and self._loaded[0] == stamp:
+                return self._loaded[1]
+            data = self._read_cache(stamp) if self.cache_dir is not None else None
+            if data is not None:
+                self._count('hit')
+            else:
+                data = self.storage.read_bytes(self.name)
+                if self.cache_dir is not None:
+                    self._count('miss')
+                    self._count('bytes_read', len(data))
+                    self._write_cache(stamp, data)
+            self._loaded = (stamp, data)
+            return data
+
+class StorageConfig:
+    """程式使用的所有存放位置，程序啟動時設定一次（configure_storage）"""
+
+    LOCATIONS = tuple(DEFAULT_STORAGE_LOCATIONS)
+
+    def __init__(self, locations=None, cache_dir=None):
+        locations = dict(DEFAULT_STORAGE_LOCATIONS, **(locations or {}))
+        self.locations = {name: location if isinstance(location, Storage) else create_storage(location)
+                          for name, location in locations.items()}
+        cache_dir = cache_dir or os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), TEMPLATE_CACHE_DIRNAME)
+        self.template_cache = TemplateCache(self.locations['template'], cache_dir=cache_dir)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+        return cls(config.get('locations'), config.get('template_cache'))
+
+    @classmethod
+    def from_root(cls, root):
+        # 以一個本機資料夾取代所有存放位置，各位置為其中的子資料夾；
+        # 原本在網路磁碟上的位置仍以 ShareStorage 存取，範本快取等網路磁碟的處理方式不變
+        locations = {name: {'type': DEFAULT_STORAGE_LOCATIONS[name].get('type', 'local'), 'path': os.path.join(root, name)}
+                     for name in cls.LOCATIONS}
+        return cls(locations, os.path.join(root, 'template cache'))
+
+    def __getitem__(self, name):
+        return self.locations[name]
+
+    def template_bytes(self):
+        return self.template_cache.read()
+
+    def template_path(self):
+        return self.locations['template'].path(TEMPLATE_FILENAME)
+
+STORAGE = StorageConfig()
+
+def configure_storage(config):
+    global STORAGE
+    STORAGE = config
+    return config
+
+def stamp_check_list(wb, fingerprint, formula_summary=None):
+    # 指紋（與公式檢查結果）寫入活頁簿的自訂屬性
+    properties = {FINGERPRINT_PROPERTY: fingerprint}
+    if formula_summary is not None:
+        properties[FORMULA_RESULTS_PROPERTY] = json.dumps(formula_summary, ensure_ascii=False)
+    for name, value in properties.items():
+        if name in wb.custom_doc_props.names:
+            del wb.custom_doc_props[name]
+        wb.custom_doc_props.append(StringProperty(name=name, value=value))
+    wb.properties.lastModifiedBy = CHECK_LIST_GENERATOR
+
+def read_check_list_fingerprint(path):
+    # 只讀取 docProps，不載入活頁簿；檔案不存在、不是本程式產生或已被另存時回傳 None
+    return read_check_list_properties(path).get(FINGERPRINT_PROPERTY)
+
+def read_check_list_properties(path):
+    # 本程式產生且未被另存的 check list 的自訂屬性；其他情況回傳空字典
+    try:
+        with zipfile.ZipFile(path) as archive:
+            core = ET.fromstring(archive.read('docProps/core.xml'))
+            custom = ET.fromstring(archive.read('docProps/custom.xml'))
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return {}
+    last_modified_by = core.find('{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}lastModifiedBy')
+    if last_modified_by is None or last_modified_by.text != CHECK_LIST_GENERATOR:
+        return {}
+    return {prop.get('name'): prop[0].text for prop in custom if len(prop)}
+
+def read_check_list_formula_results(path):
+    # 產生時寫入的公式檢查結果（formula_summary），沒有時回傳 None
+    results = read_check_list_properties(path).get(FORMULA_RESULTS_PROPERTY)
+    return json.loads(results) if results else None
+
+# 各資料夾的 Surface 工作表，Scan Area.ini 中 Surface 的 Enable=0 時刪除
+SURFACE_SHEETS = {'Default': 'Surface', 'Default1': 'Surface_Multi'}
+
+# 下層工作表都被刪除時，Check list 工作表也一併刪除
+CHECK_LIST_CHILD_SHEETS = {
+    'Check list': ['Surface', 'Pad device', 'Bump device'],
+    'Check list_Multi': ['Surface_Multi', 'Pad device_Multi', 'Bump device_Multi'],
+}
+
+def surviving_check_list_sheets(sheet_names, parameters, disabled_surfaces):
+    """依解析結果決定範本中會保留的工作表，依範本順序回傳。
+
+    會刪除沒有任何對應參數的工作表（單一 Recipe 的 _Multi 工作表、沒有相關演算法的 device 工作表）、
+    disabled_surfaces（{資料夾類型: Scan Area.ini 是否停用 Surface}）中停用的 Surface 工作表，
+    以及下層工作表都已不存在的 Check list 工作表。
+    """
+    removed = set()
+    for folder_type, mappings in ALL_MAPPINGS.items():
+        for sheet_name, sheet_mappings in mappings.items():
+            if not any(parameters.contains(folder_type, var) for var in sheet_mappings):
+                removed.add(sheet_name)
+        if disabled_surfaces.get(folder_type):
+            removed.add(SURFACE_SHEETS[folder_type])
+    remaining = set(sheet_names) - removed
+    for check_list, child_sheets in CHECK_LIST_CHILD_SHEETS.items():
+        if not remaining.intersection(child_sheets):
+            removed.add(check_list)
+    return [sheet_name for sheet_name in sheet_names if sheet_name not in removed]
+
+# 依 F 欄（Setup File Value）是否有值隱藏列的 device 工作表
+DEVICE_SHEETS = ["Pad device", "Bump device", "Pad device_Multi", "Bump device_Multi"]
+
+def hide_empty_device_rows(ws, sheet_name, checkpoint=None):
+    """隱藏 device 工作表中 F 欄沒有值的列，整段都隱藏時標題列也一併隱藏。
+
+    ws 只需提供 openpyxl 工作表的 cell()、max_row、merged_cells 與 row_dimensions，
+    預檢時以 TemplateSheetLayout 代替，不需載入活頁簿；checkpoint 在每一列開始前呼叫，可用來中止處理。
+    """
+    for row in range(1, ws.max_row + 1): 
+        if checkpoint is not None:
+            checkpoint()
+        current_cell = ws.cell(row=row, column=6)  # Column F
+
+        if row < ws.max_row:
+            next_cell = ws.cell(row=row+1, column=6)  # Next row's Column F
+        else:
+            next_cell = None  
+
+        # Check if the cell is part of a merged range
+        is_merged = any(current_cell.coordinate in merged_range for merged_range in ws.merged_cells.ranges)
+
+        if not is_merged:  # Only hide if not part of a merged cell
+            if current_cell.value is None:
+                # If F column is empty, hide the row
+                ws.row_dimensions[row].hidden = True
+            elif current_cell.value == "Setup File Value" and (next_cell is None or next_cell.value is None):
+                # If current cell is "Setup File Value" and next cell is empty or doesn't exist, hide the current row
+                ws.row_dimensions[row].hidden = True
+            else:
+                # Otherwise, make sure the row is visible
+                ws.row_dimensions[row].hidden = False
+        else:
+            # If the cell is part of a merged range, make sure the row is visible
+            ws.row_dimensions[row].hidden = False
+
+    if sheet_name in ["Bump device", "Bump device_Multi"]:
+        if all(ws.row_dimensions[row].hidden for row in range(3, 59)):
+            ws.row_dimensions[2].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(61, 117)):
+            ws.row_dimensions[60].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(119, 175)):
+            ws.row_dimensions[118].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(177, 233)):
+            ws.row_dimensions[176].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(235, 291)):
+            ws.row_dimensions[234].hidden = True
+
+    if sheet_name in ["Pad device", "Pad device_Multi"]:
+        if all(ws.row_dimensions[row].hidden for row in range(3, 25)):
+            ws.row_dimensions[2].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(27, 49)):
+            ws.row_dimensions[26].hidden = True
+
+        if all(ws.row_dimensions[row].hidden for row in range(51, 73)):
+            ws.row_dimensions[50].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(75, 97)):
+            ws.row_dimensions[74].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(99, 121)):
+            ws.row_dimensions[98].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(124, 148)):
+            ws.row_dimensions[123].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(150, 174)):
+            ws.row_dimensions[149].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(176, 200)):
+            ws.row_dimensions[175].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(202, 226)):
+            ws.row_dimensions[201].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(228, 252)):
+            ws.row_dimensions[227].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(255, 282)):
+            ws.row_dimensions[254].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(284, 311)):
+            ws.row_dimensions[283].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(313, 340)):
+            ws.row_dimensions[312].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(342, 369)):
+            ws.row_dimensions[341].hidden = True 
+
+        if all(ws.row_dimensions[row].hidden for row in range(371, 398)):
+            ws.row_dimensions[370].hidden = True
+
+# 範本 xlsx 封裝中的活頁簿、活頁簿關聯與內容類型
+TEMPLATE_WORKBOOK_PART = 'xl/workbook.xml'
+TEMPLATE_WORKBOOK_RELS = 'xl/_rels/workbook.xml.rels'
+TEMPLATE_CONTENT_TYPES = '[Content_Types].xml'
+
+_WORKBOOK_SHEET = re.compile(r'<(?:\w+:)?sheet\b[^>]*?/>')
+_WORKBOOK_DEFINED_NAME = re.compile(r'<((?:\w+:)?definedName)\b[^>]*?(?:/>|>.*?</\1>)', re.DOTALL)
+_PACKAGE_RELATIONSHIP = re.compile(r'<(?:\w+:)?Relationship\b[^>]*?/>')
+_CONTENT_TYPE_OVERRIDE = re.compile(r'<(?:\w+:)?Override\b[^>]*?/>')
+
+def _xml_attribute(element, name_pattern):
+    match = re.search(r'\s%s="([^"]*)"' % name_pattern, element)
+    return html.unescape(match.group(1)) if match else None
+
+def template_sheet_names(template_bytes):
+    # 只讀取 workbook.xml，不載入活頁簿
+    with zipfile.ZipFile(io.BytesIO(template_bytes)) as archive:
+        workbook_xml = archive.read(TEMPLATE_WORKBOOK_PART).decode('utf-8')
+    return [_xml_attribute(match.group(0), 'name') for match in _WORKBOOK_SHEET.finditer(workbook_xml)]
+
+def _template_part_path(target):
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(TEMPLATE_WORKBOOK_PART), target))
+
+def remove_template_sheets(template_bytes, sheet_names):
+    """從範本的 xlsx 封裝移除不會保留的工作表，load_workbook 就不會讀取與儲存這些工作表。
+
+    移除 workbook.xml 中的 <sheet>、活頁簿關聯、內容類型，以及工作表與其關聯檔本身。
+    結果與載入後再以 wb.remove 刪除相同：工作表範圍的名稱一併移除，其餘的 localSheetId 重新編號。
+    """
+    sheet_names = set(sheet_names)
+    with zipfile.ZipFile(io.BytesIO(template_bytes)) as archive:
+        try:
+            workbook_xml = archive.read(TEMPLATE_WORKBOOK_PART).decode('utf-8')
+            workbook_rels = archive.read(TEMPLATE_WORKBOOK_RELS).decode('utf-8')
+            content_types = archive.read(TEMPLATE_CONTENT_TYPES).decode('utf-8')
+        except KeyError:
+            return template_bytes
+
+        new_indexes = []  # 原本的工作表索引 -> 移除後的索引（None 表示已移除）
+        removed_ids = set()
+        def remove_sheet(match):
+            if _xml_attribute(match.group(0), 'name') in sheet_names:
+                new_indexes.append(None)
+                removed_ids.add(_xml_attribute(match.group(0), r'(?:\w+:)?id'))
+                return ''
+            new_indexes.append(sum(index is not None for index in new_indexes))
+            return match.group(0)
+
+        def reindex_defined_name(match):
+            local_sheet = re.search(r'\slocalSheetId="(\d+)"', match.group(0))
+            if local_sheet is None or int(local_sheet.group(1)) >= len(new_indexes):
+                return match.group(0)
+            index = new_indexes[int(local_sheet.group(1))]
+            if index is None:
+                return ''
+            return match.group(0)[:local_sheet.start(1)] + str(index) + match.group(0)[local_sheet.end(1):]
+
+        removed_parts = set()
+        def remove_relationship(match):
+            if _xml_attribute(match.group(0), 'Id') not in removed_ids:
+                return match.group(0)
+            part = _template_part_path(_xml_attribute(match.group(0), 'Target'))
+            removed_parts.add(part)
+            removed_parts.add(posixpath.join(posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels'))
+            return ''
+
+        def remove_override(match):
+            part = (_xml_attribute(match.group(0), 'PartName') or '').lstrip('/')
+            return '' if part in removed_parts else match.group(0)
+
+        workbook_xml = _WORKBOOK_SHEET.sub(remove_sheet, workbook_xml)
+        if None not in new_indexes:
+            return template_bytes
+        workbook_xml = _WORKBOOK_DEFINED_NAME.sub(reindex_defined_name, workbook_xml)
+        workbook_rels = _PACKAGE_RELATIONSHIP.sub(remove_relationship, workbook_rels)
+        content_types = _CONTENT_TYPE_OVERRIDE.sub(remove_override, content_types)
+        rewritten = {TEMPLATE_WORKBOOK_PART: workbook_xml, TEMPLATE_WORKBOOK_RELS: workbook_rels, TEMPLATE_CONTENT_TYPES: content_types}
+
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as pruned:
+            for info in archive.infolist():
+                if info.filename in removed_parts:
+                    continue
+                content = rewritten[info.filename].encode('utf-8') if info.filename in rewritten else archive.read(info)
+                pruned.writestr(info, content)
+    return output.getvalue()
+
+def workbook_sheet_parts(archive):
+    # xlsx 封裝中 {工作表名稱: 工作表 XML 的路徑}，依活頁簿中的順序
+    workbook_xml = archive.read(TEMPLATE_WORKBOOK_PART).decode('utf-8')
+    workbook_rels = archive.read(TEMPLATE_WORKBOOK_RELS).decode('utf-8')
+    targets = {_xml_attribute(match.group(0), 'Id'): _xml_attribute(match.group(0), 'Target')
+               for match in _PACKAGE_RELATIONSHIP.finditer(workbook_rels)}
+    parts = {}
+    for match in _WORKBOOK_SHEET.finditer(workbook_xml):
+        target = targets.get(_xml_attribute(match.group(0), r'(?:\w+:)?id'))
+        if target is not None:
+            parts[_xml_attribute(match.group(0), 'name')] = _template_part_path(target)
+    return parts
+
+# 工作表 XML 的命名空間
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+def _shared_strings(archive):
+    try:
+        root = ET.fromstring(archive.read('xl/sharedStrings.xml'))
+    except KeyError:
+        return []
+    # 與 openpyxl 相同，只取 <t> 與 rich text <r><t>，不包含注音（rPh）
+    strings = []
+    for item in root.iter(f'{SPREADSHEET_NS}si'):
+        texts = [child if child.tag == f'{SPREADSHEET_NS}t' else child.find(f'{SPREADSHEET_NS}t')
+                 for child in item if child.tag in (f'{SPREADSHEET_NS}t', f'{SPREADSHEET_NS}r')]
+        strings.append(''.join(text.text or '' for text in texts if text is not None))
+    return strings
+
+def _sheet_cell_value(cell, shared_strings):
+    cell_type = cell.get('t', 'n')
+    formula = cell.find(f'{SPREADSHEET_NS}f')
+    if formula is not None:
+        return f'={formula.text or ""}'
+    if cell_type == 'inlineStr':
+        inline = cell.find(f'{SPREADSHEET_NS}is')
+        return ''.join(node.text or '' for node in inline.iter(f'{SPREADSHEET_NS}t')) if inline is not None else None
+    value = cell.find(f'{SPREADSHEET_NS}v')
+    if value is None or value.text is None:
+        return None
+    if cell_type == 's':
+        return shared_strings[int(value.text)]
+    if cell_type == 'b':
+        return value.text == '1'
+    if cell_type == 'n':
+        return float(value.text) if any(char in value.text for char in '.Ee') else int(value.text)
+    return value.text
+
+class _RowDimension:
+    __slots__ = ('hidden',)
+
+    def __init__(self, hidden=False):
+        self.hidden = hidden
+
+class _RowDimensions(dict):
+    # 與 openpyxl 相同，讀取不存在的列時建立預設值
+    def __missing__(self, row):
+        self[row] = _RowDimension()
+        return self[row]
+
+class _MergedRange:
+    # 合併範圍內的座標集合，判斷儲存格是否在範圍內時不需逐一比較列與欄
+    __slots__ = ('coordinates', 'start')
+
+    def __init__(self, ref):
+        cell_range = openpyxl.worksheet.cell_range.CellRange(ref)
+        self.coordinates = frozenset(f'{openpyxl.utils.get_column_letter(column)}{row}' for row, column in cell_range.cells)
+        self.start = f'{openpyxl.utils.get_column_letter(cell_range.min_col)}{cell_range.min_row}'
+
+    def __contains__(self, coordinate):
+        return coordinate in self.coordinates
+
+class _LayoutCell:
+    __slots__ = ('value', 'coordinate')
+
+    def __init__(self, value, coordinate):
+        self.value = value
+        self.coordinate = coordinate
+
+class TemplateSheetLayout:
+    """範本工作表的儲存格值、合併儲存格與隱藏列，直接讀取工作表 XML，不載入活頁簿。
+
+    提供與 openpyxl 工作表相同的 cell()、max_row、merged_cells、row_dimensions 與 ws[座標] = 值，
+    預檢時可在範本上模擬寫入儲存格與 hide_empty_device_rows。
+    """
+
+    def __init__(self, values, merged_ranges, hidden_rows):
+        self.values = dict(values)  # (row, column) -> 值；沒有值但存在的儲存格為 None
+        self.merged_cells = types.SimpleNamespace(ranges=[_MergedRange(ref) for ref in merged_ranges])
+        self.row_dimensions = _RowDimensions((row, _RowDimension(True)) for row in hidden_rows)
+
+    @classmethod
+    def from_xml(cls, sheet_xml, shared_strings):
+        root = ET.fromstring(sheet_xml)
+        values = {}
+        hidden_rows = []
+        for row in root.iter(f'{SPREADSHEET_NS}row'):
+            if row.get('hidden') in ('1', 'true'):
+                hidden_rows.append(int(row.get('r')))
+            for cell in row.iter(f'{SPREADSHEET_NS}c'):
+                values[openpyxl.utils.cell.coordinate_to_tuple(cell.get('r'))] = _sheet_cell_value(cell, shared_strings)
+        merged_ranges = [merge.get('ref') for merge in root.iter(f'{SPREADSHEET_NS}mergeCell')]
+        return cls(values, merged_ranges, hidden_rows)
+
+    def copy(self):
+        layout = TemplateSheetLayout(self.values, [], [])
+        layout.merged_cells = self.merged_cells
+        layout.row_dimensions = _RowDimensions((row, _RowDimension(dimension.hidden)) for row, dimension in self.row_dimensions.items())
+        return layout
+
+    @property
+    def max_row(self):
+        return max((row for row, _ in self.values), default=1)
+
+    def cell(self, row, column):
+        return _LayoutCell(self.values.get((row, column)), f'{openpyxl.utils.get_column_letter(column)}{row}')
+
+    def __setitem__(self, coordinate, value):
+        self.values[openpyxl.utils.cell.coordinate_to_tuple(coordinate)] = value
+
+    def is_merged_cell(self, coordinate):
+        # 合併範圍中左上角以外的儲存格，openpyxl 無法寫入
+        return any(coordinate in merged_range and coordinate != merged_range.start
+                   for merged_range in self.merged_cells.ranges)
+
+    def hidden_rows(self):
+        return sorted(row for row, dimension in self.row_dimensions.items() if dimension.hidden)
+
+# 範本內容 -> {工作表名稱: TemplateSheetLayout}；同一個範本只解析一次
+_template_layouts = {}
+
+def template_layouts(template_bytes):
+    digest = hashlib.sha256(template_bytes).hexdigest()
+    if digest not in _template_layouts:
+        with zipfile.ZipFile(io.BytesIO(template_bytes)) as archive:
+            shared_strings = _shared_strings(archive)
+            layouts = {sheet_name: TemplateSheetLayout.from_xml(archive.read(part), shared_strings)
+                       for sheet_name, part in workbook_sheet_parts(archive).items()}
+        _template_layouts[digest] = layouts
+    return _template_layouts[digest]
+
+# 公式結果中視為通過／不通過的文字（不分大小寫）；TRUE／FALSE 也分別視為通過／不通過
+FORMULA_PASS_TEXTS = {'OK', 'PASS', 'GO'}
+FORMULA_FAIL_TEXTS = {'NG', 'FAIL', 'NOGO', 'NO GO'}
+
+class FormulaError(Exception):
+    # 公式使用了尚未支援的函數或語法，不計算、不寫入快取值
+    pass
+
+class ExcelErrorValue(str):
+    # Excel 的錯誤值（#DIV/0!、#VALUE! 等）
+    pass
+
+class _ExcelErrorRaised(Exception):
+    # 計算中出現錯誤值時沿著公式往上傳遞，IFERROR／ISERROR 可攔截
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = ExcelErrorValue(value)
+
+class _RangeValue(list):
+    # 儲存格範圍的值（依列展開），只能作為函數參數
+    pass
+
+# 依 Excel 的優先順序，由低到高
+_FORMULA_BINARY_OPERATORS = [('=', '<>', '<', '>', '<=', '>='), ('&',), ('+', '-'), ('*', '/'), ('^',)]
+
+class CheckListFormulaEvaluator:
+    """計算 check list 中的公式，支援範本比較 Setup File Value 與規格所用的 Excel 函數子集。
+
+    以 openpyxl 的 Tokenizer 拆解公式，依 Excel 的運算子優先順序與型別規則計算；參照可跨工作表，
+    被參照的儲存格若也是公式則先計算。使用未支援的函數或語法（定義名稱、陣列公式等）的公式不計算，
+    在 check list 中維持沒有快取值，交由 Excel 開啟時計算。只讀取已存在的儲存格，不會在活頁簿中新增儲存格。
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self.results = {}  # (工作表, 座標) -> 計算結果
+        self.unsupported = {}  # (工作表, 座標) -> 無法計算的原因
+        self._evaluating = set()
+        self._bounds = {ws.title: (ws.max_row, ws.max_column) for ws in wb.worksheets}
+
+    def formula_cells(self):
+        for ws in self.wb.worksheets:
+            max_row, max_column = self._bounds[ws.title]
+            for row in ws.iter_rows(max_row=max_row, max_col=max_column):
+                for cell in row:
+                    if cell.data_type == 'f':
+                        yield ws.title, cell
+
+    def evaluate_all(self):
+        for sheet_name, cell in self.formula_cells():
+            try:
+                self.cell_value(sheet_name, cell.row, cell.column)
+            except (FormulaError, _ExcelErrorRaised):
+                pass  # 結果已記錄在 self.results 或 self.unsupported
+        return self.results
+
+    def summary(self):
+        formulas = len(self.results) + len(self.unsupported)
+        passed = [key for key, value in self.results.items() if formula_result_status(value) is True]
+        failed = [key for key, value in self.results.items() if formula_result_status(value) is False]
+        return {
+            'formulas': formulas,
+            'evaluated': len(self.results),
+            'unsupported': len(self.unsupported),
+            'pass': len(passed),
+            'fail': len(failed),
+            'errors': sum(1 for value in self.results.values() if isinstance(value, ExcelErrorValue)),
+            'failed_cells': [f"{sheet_name}!{coordinate}" for sheet_name, coordinate in sorted(failed)],
+        }
+
+    def cell_value(self, sheet_name, row, column):
+        if sheet_name not in self._bounds:
+            raise _ExcelErrorRaised('#REF!')
+        max_row, max_column = self._bounds[sheet_name]
+        if row > max_row or column > max_column:
+            return None
+        cell = self.wb[sheet_name].cell(row=row, column=column)
+        if cell.data_type != 'f':
+            return cell.value
+        key = (sheet_name, cell.coordinate)
+        if key in self.results:
+            value = self.results[key]
+        elif key in self.unsupported:
+            raise FormulaError(self.unsupported[key])
+        elif key in self._evaluating:
+            raise FormulaError('循環參照')
+        else:
+            self._evaluating.add(key)
+            try:
+                value = self.evaluate_formula(cell.value, sheet_name)
+            except FormulaError as e:
+                self.unsupported[key] = str(e)
+                raise
+            except Exception as e:
+                # 未預期的計算錯誤（例如 ROUND 位數過大）只讓這一格視為未計算，其他公式照常計算
+                self.unsupported[key] = f'計算失敗: {type(e).__name__}: {e}'
+                raise FormulaError(self.unsupported[key])
+            finally:
+                self._evaluating.discard(key)
+            self.results[key] = value
+        if isinstance(value, ExcelErrorValue):
+            raise _ExcelErrorRaised(value)
+        return value
+
+    def evaluate_formula(self, formula, sheet_name):
+        if not isinstance(formula, str):
+            raise FormulaError(f'不支援的公式類型: {type(formula).__name__}')
+        try:
+            tokens = [token for token in Tokenizer(formula).items if token.type != Token.WSPACE]
+        except Exception as e:
+            raise FormulaError(f'無法解析公式: {e}')
+        position, node = self._parse_expression(tokens, 0, 0)
+        if position != len(tokens):
+            raise FormulaError(f'無法解析公式: {formula}')
+        try:
+            value = self._scalar(self._evaluate(node, sheet_name))
+        except _ExcelErrorRaised as e:
+            return e.value
+        if isinstance(value, float) and not math.isfinite(value):
+            return ExcelErrorValue('#NUM!')  # Excel 對溢位的結果顯示 #NUM!，xlsx 也無法儲存 inf/nan
+        return 0 if value is None else value
+
+    # 語法分析：產生 (種類, ...) 的樹
+    def _parse_expression(self, tokens, position, level):
+        if level == len(_FORMULA_BINARY_OPERATORS):
+            return self._parse_unary(tokens, position)
+        position, node = self._parse_expression(tokens, position, level + 1)
+        while (position < len(tokens) and tokens[position].type == Token.OP_IN
+               and tokens[position].value in _FORMULA_BINARY_OPERATORS[level]):
+            operator = tokens[position].value
+            position, right = self._parse_expression(tokens, position + 1, level + 1)
+            node = ('binary', operator, node, right)
+        return position, node
+
+    def _parse_unary(self, tokens, position):
+        if position < len(tokens) and tokens[position].type == Token.OP_PRE:
+            operator = tokens[position].value
+            position, operand = self._parse_unary(tokens, position + 1)
+            return position, ('unary', operator, operand)
+        position, node = self._parse_primary(tokens, position)
+        while position < len(tokens) and tokens[position].type == Token.OP_POST:
+            node = ('percent', node)
+            position += 1
+        return position, node
+
+    def _parse_primary(self, tokens, position):
+        if position >= len(tokens):
+            raise FormulaError('公式不完整')
+        token = tokens[position]
+        if token.type == Token.OPERAND:
+            if token.subtype == Token.NUMBER:
+                return position + 1, ('value', float(token.value) if any(char in token.value for char in '.Ee') else int(token.value))
+            if token.subtype == Token.TEXT:
+                return position + 1, ('value', token.value[1:-1].replace('""', '"'))
+            if token.subtype == Token.LOGICAL:
+                return position + 1, ('value', token.value.upper() == 'TRUE')
+            if token.subtype == Token.ERROR:
+                return position + 1, ('error', token.value)
+            return position + 1, ('reference', token.value)
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name = token.value[:-1].upper()
+            if name.startswith('_XLFN.'):
+                name = name[len('_XLFN.'):]
+            arguments = []
+            position += 1
+            if position < len(tokens) and tokens[position].type == Token.FUNC and tokens[position].subtype == Token.CLOSE:
+                return position + 1, ('function', name, arguments)
+            while True:
+                if position < len(tokens) and (tokens[position].type == Token.SEP or
+                                               (tokens[position].type == Token.FUNC and tokens[position].subtype == Token.CLOSE)):
+                    argument = ('value', None)  # 省略的參數
+                else:
+                    position, argument = self._parse_expression(tokens, position, 0)
+                arguments.append(argument)
+                if position >= len(tokens):
+                    raise FormulaError('公式不完整')
+                if tokens[position].type == Token.SEP and tokens[position].subtype == Token.ARG:
+                    position += 1
+                    continue
+                if tokens[position].type == Token.FUNC and tokens[position].subtype == Token.CLOSE:
+                    return position + 1, ('function', name, arguments)
+                raise FormulaError(f'不支援的語法: {tokens[position].value}')
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            position, node = self._parse_expression(tokens, position + 1, 0)
+            if position >= len(tokens) or tokens[position].type != Token.PAREN:
+                raise FormulaError('括號不成對')
+            return position + 1, node
+        raise FormulaError(f'不支援的語法: {token.value}')
+
+    # 計算
+    def _evaluate(self, node, sheet_name):
+        kind = node[0]
+        if kind == 'value':
+            return node[1]
+        if kind == 'error':
+            raise _ExcelErrorRaised(node[1])
+        if kind == 'reference':
+            return self._reference(node[1], sheet_name)
+        if kind == 'unary':
+            value = self._number(self._evaluate(node[2], sheet_name))
+            return -value if node[1] == '-' else value
+        if kind == 'percent':
+            return self._number(self._evaluate(node[1], sheet_name)) / 100
+        if kind == 'binary':
+            return self._binary(node[1], self._scalar(self._evaluate(node[2], sheet_name)),
+                                self._scalar(self._evaluate(node[3], sheet_name)))
+        return self._function(node[1], node[2], sheet_name)
+
+    def _reference(self, reference, sheet_name):
+        if '!' in reference:
+            sheet_part, reference = reference.rsplit('!', 1)
+            if sheet_part.startswith("'"):
+                sheet_part = sheet_part[1:-1].replace("''", "'")
+            sheet_name = sheet_part
+        if reference.upper() == '#REF!':
+            raise _ExcelErrorRaised('#REF!')
+        try:
+            min_column, min_row, max_column, max_row = openpyxl.utils.cell.range_boundaries(reference.replace('$', ''))
+        except (ValueError, TypeError):
+            raise FormulaError(f'不支援的參照: {reference}')  # 定義名稱等
+        if sheet_name not in self._bounds:
+            raise _ExcelErrorRaised('#REF!')
+        if min_row is None or min_column is None or min_row != max_row or min_column != max_column:
+            sheet_max_row, sheet_max_column = self._bounds[sheet_name]
+            values = _RangeValue()
+            for row in range(min_row or 1, min(max_row or sheet_max_row, sheet_max_row) + 1):
+                for column in range(min_column or 1, min(max_column or sheet_max_column, sheet_max_column) + 1):
+                    try:
+                        values.append(self.cell_value(sheet_name, row, column))
+                    except _ExcelErrorRaised as e:
+                        values.append(e.value)  # 範圍中的錯誤值由各函數決定是否傳遞
+            return values
+        return self.cell_value(sheet_name, min_row, min_column)
+
+    def _scalar(self, value):
+        # 範圍不能直接用於運算（不支援 Excel 的隱含交集）
+        if isinstance(value, _RangeValue):
+            raise _ExcelErrorRaised('#VALUE!')
+        return value
+
+    def _number(self, value):
+        value = self._scalar(value)
+        if value is None:
+            return 0
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (int, float)):
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise _ExcelErrorRaised('#VALUE!')
+
+    def _text(self, value):
+        value = self._scalar(value)
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        if isinstance(value, float):
+            return str(int(value)) if value.is_integer() else repr(value)
+        return str(value)
+
+    def _logical(self, value):
+        value = self._scalar(value)
+        if value is None:
+            return False
+        if isinstance(value, (bool, int, float)):
+            return bool(value)
+        if isinstance(value, str) and value.upper() in ('TRUE', 'FALSE'):
+            return value.upper() == 'TRUE'
+        raise _ExcelErrorRaised('#VALUE!')
+
+    def _binary(self, operator, left, right):
+        if operator == '&':
+            return self._text(left) + self._text(right)
+        if operator in ('=', '<>', '<', '>', '<=', '>='):
+            return self._compare(operator, left, right)
+        left, right = self._number(left), self._number(right)
+        if operator == '+':
+            return left + right
+        if operator == '-':
+            return left - right
+        if operator == '*':
+            return left * right
+        if operator == '/':
+            if right == 0:
+                raise _ExcelErrorRaised('#DIV/0!')
+            return left / right
+        try:
+            return float(left) ** right
+        except (OverflowError, ZeroDivisionError, ValueError):
+            raise _ExcelErrorRaised('#NUM!')
+
+    @staticmethod
+    def _comparable(value, other):
+        # Excel 的比較規則：空白視為與另一邊同型別的空值；數字 < 文字 < 邏輯值，文字不分大小寫
+        if value is None:
+            value = '' if isinstance(other, str) else False if isinstance(other, bool) else 0
+        if isinstance(value, bool):
+            return (2, value)
+        if isinstance(value, (int, float)):
+            return (0, value)
+        return (1, str(value).upper())
+
+    def _compare(self, operator, left, right):
+        left, right = self._comparable(left, right), self._comparable(right, left)
+        return {'=': left == right, '<>': left != right, '<': left < right,
+                '>': left > right, '<=': left <= right, '>=': left >= right}[operator]
+
+    def _values(self, arguments, sheet_name, keep_errors=False):
+        # 函數參數展開為值的串列；直接參數與範圍中的值分開標示。範圍中有錯誤值時傳遞錯誤，keep_errors 時保留
+        for argument in arguments:
+            value = self._evaluate(argument, sheet_name)
+            if isinstance(value, _RangeValue):
+                for item in value:
+                    if isinstance(item, ExcelErrorValue) and not keep_errors:
+                        raise _ExcelErrorRaised(item)
+                    yield item, True
+            else:
+                yield value, argument[0] == 'reference'
+
+    def _numbers(self, arguments, sheet_name):
+        # 與 SUM 等相同：參照與範圍中只計數字，直接輸入的值則轉為數字
+        numbers = []
+        for value, from_reference in self._values(arguments, sheet_name):
+            if from_reference:
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers.append(value)
+            else:
+                numbers.append(self._number(value))
+        return numbers
+
+    def _criterion_matches(self, value, criterion):
+        # COUNTIF 的條件：可加上比較運算子（例如 ">=10"、"<>PASS"），文字可使用萬用字元 * 與 ?
+        operator = '='
+        if isinstance(criterion, str):
+            operator, criterion = re.match(r'(<=|>=|<>|<|>|=)?(.*)', criterion, re.DOTALL).groups()
+            operator = operator or '='
+            try:
+                criterion = float(criterion)
+            except ValueError:
+                if criterion.upper() in ('TRUE', 'FALSE'):
+                    criterion = criterion.upper() == 'TRUE'
+        if isinstance(value, ExcelErrorValue):
+            matched = isinstance(criterion, str) and criterion.upper() == value
+            return matched == (operator == '=') if operator in ('=', '<>') else False
+        if isinstance(criterion, str):
+            if operator not in ('=', '<>'):
+                return isinstance(value, str) and self._compare(operator, value, criterion)
+            if criterion == '':
+                matched = value is None or value == ''
+            else:
+                matched = isinstance(value, str) and fnmatch.fnmatchcase(value.upper(), criterion.upper())
+            return matched == (operator == '=')
+        if isinstance(value, str) and not isinstance(criterion, bool) and operator in ('=', '<>'):
+            # 數字條件也符合內容為相同數字的文字
+            try:
+                return (float(value) == criterion) == (operator == '=')
+            except ValueError:
+                return operator == '<>'
+        if isinstance(criterion, bool) != isinstance(value, bool) or not isinstance(value, (int, float)):
+            return operator == '<>'
+        return self._compare(operator, value, criterion)
+
+    def _round(self, value, digits, rounding):
+        quantum = decimal.Decimal(1).scaleb(-int(self._number(digits)))
+        return float(decimal.Decimal(repr(float(self._number(value)))).quantize(quantum, rounding=rounding))
+
+    def _argument_count(self, name, arguments, minimum, maximum=None):
+        if len(arguments) < minimum or (maximum is not None and len(arguments) > maximum):
+            raise FormulaError(f'{name} 的參數數量錯誤')
+
+    def _function(self, name, arguments, sheet_name):
+        evaluate = lambda index: self._evaluate(arguments[index], sheet_name)
+        if name == 'IF':
+            self._argument_count(name, arguments, 2, 3)
+            branch = 1 if self._logical(evaluate(0)) else 2
+            if branch >= len(arguments):
+                return False
+            return 0 if arguments[branch] == ('value', None) else evaluate(branch)
+        if name in ('IFERROR', 'IFNA'):
+            self._argument_count(name, arguments, 2, 2)
+            try:
+                return self._scalar(evaluate(0))
+            except _ExcelErrorRaised as e:
+                if name == 'IFNA' and e.value != '#N/A':
+                    raise
+                return evaluate(1)
+        if name in ('ISERROR', 'ISERR', 'ISNA'):
+            self._argument_count(name, arguments, 1, 1)
+            try:
+                self._scalar(evaluate(0))
+            except _ExcelErrorRaised as e:
+                return name == 'ISERROR' or (name == 'ISNA') == (e.value == '#N/A')
+            return False
+        if name in ('AND', 'OR'):
+            self._argument_count(name, arguments, 1)
+            logicals = [self._logical(value) for value, from_reference in self._values(arguments, sheet_name)
+                        if not (from_reference and (value is None or isinstance(value, str)))]
+            if not logicals:
+                raise _ExcelErrorRaised('#VALUE!')
+            return all(logicals) if name == 'AND' else any(logicals)
+        if name == 'NOT':
+            self._argument_count(name, arguments, 1, 1)
+            return not self._logical(evaluate(0))
+        if name in ('TRUE', 'FALSE'):
+            self._argument_count(name, arguments, 0, 0)
+            return name == 'TRUE'
+        if name == 'NA':
+            raise _ExcelErrorRaised('#N/A')
+        if name in ('ISBLANK', 'ISNUMBER', 'ISTEXT', 'ISLOGICAL'):
+            self._argument_count(name, arguments, 1, 1)
+            try:
+                value = self._scalar(evaluate(0))
+            except _ExcelErrorRaised:
+                return False
+            if name == 'ISBLANK':
+                return value is None
+            if name == 'ISLOGICAL':
+                return isinstance(value, bool)
+            if name == 'ISTEXT':
+                return isinstance(value, str)
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        if name in ('SUM', 'MIN', 'MAX', 'AVERAGE', 'COUNT'):
+            self._argument_count(name, arguments, 1)
+            numbers = self._numbers(arguments, sheet_name)
+            if name == 'SUM':
+                return sum(numbers)
+            if name == 'COUNT':
+                return len(numbers)
+            if name == 'AVERAGE':
+                if not numbers:
+                    raise _ExcelErrorRaised('#DIV/0!')
+                return sum(numbers) / len(numbers)
+            return (min if name == 'MIN' else max)(numbers) if numbers else 0
+        if name == 'COUNTA':
+            self._argument_count(name, arguments, 1)
+            return sum(1 for value, _ in self._values(arguments, sheet_name, keep_errors=True) if value is not None)
+        if name == 'COUNTIF':
+            self._argument_count(name, arguments, 2, 2)
+            criterion = self._scalar(evaluate(1))
+            return sum(1 for value, _ in self._values(arguments[:1], sheet_name, keep_errors=True) if self._criterion_matches(value, criterion))
+        if name == 'ABS':
+            self._argument_count(name, arguments, 1, 1)
+            return abs(self._number(evaluate(0)))
+        if name == 'INT':
+            self._argument_count(name, arguments, 1, 1)
+            return math.floor(self._number(evaluate(0)))
+        if name == 'MOD':
+            self._argument_count(name, arguments, 2, 2)
+            divisor = self._number(evaluate(1))
+            if divisor == 0:
+                raise _ExcelErrorRaised('#DIV/0!')
+            return self._number(evaluate(0)) % divisor
+        if name in ('ROUND', 'ROUNDUP', 'ROUNDDOWN'):
+            self._argument_count(name, arguments, 2, 2)
+            rounding = {'ROUND': decimal.ROUND_HALF_UP, 'ROUNDUP': decimal.ROUND_UP, 'ROUNDDOWN': decimal.ROUND_DOWN}[name]
+            return self._round(evaluate(0), evaluate(1), rounding)
+        if name in ('LEN', 'TRIM', 'UPPER', 'LOWER', 'VALUE'):
+            self._argument_count(name, arguments, 1, 1)
+            text = self._text(evaluate(0))
+            if name == 'LEN':
+                return len(text)
+            if name == 'TRIM':
+                return re.sub(' +', ' ', text.strip(' '))  # Excel 的 TRIM 只處理半形空白
+            if name == 'UPPER':
+                return text.upper()
+            if name == 'LOWER':
+                return text.lower()
+            return self._number(text.strip())
+        if name in ('LEFT', 'RIGHT'):
+            self._argument_count(name, arguments, 1, 2)
+            text = self._text(evaluate(0))
+            count = int(self._number(evaluate(1))) if len(arguments) > 1 else 1
+            if count < 0:
+                raise _ExcelErrorRaised('#VALUE!')
+            return text[:count] if name == 'LEFT' else text[len(text) - count:] if count else ''
+        if name == 'MID':
+            self._argument_count(name, arguments, 3, 3)
+            text = self._text(evaluate(0))
+            start, count = int(self._number(evaluate(1))), int(self._number(evaluate(2)))
+            if start < 1 or count < 0:
+                raise _ExcelErrorRaised('#VALUE!')
+            return text[start - 1:start - 1 + count]
+        if name == 'EXACT':
+            self._argument_count(name, arguments, 2, 2)
+            return self._text(evaluate(0)) == self._text(evaluate(1))
+        if name in ('CONCATENATE', 'CONCAT'):
+            self._argument_count(name, arguments, 1)
+            return ''.join(self._text(value) for value, _ in self._values(arguments, sheet_name))
+        raise FormulaError(f'不支援的函數: {name}')
+
+def formula_result_status(value):
+    # 公式結果是否為通過（True）、不通過（False），或不是通過／不通過的結果（None）
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and not isinstance(value, ExcelErrorValue):
+        text = value.strip().upper()
+        if text in FORMULA_PASS_TEXTS:
+            return True
+        if text in FORMULA_FAIL_TEXTS:
+            return False
+    return None
+
+def format_formula_summary(summary):
+    text = f"{summary['pass']} pass, {summary['fail']} fail, {summary['unsupported']} not evaluated"
+    if summary['failed_cells']:
+        text += f" (fail: {', '.join(summary['failed_cells'][:10])}{' ...' if len(summary['failed_cells']) > 10 else ''})"
+    return text
+
+_FORMULA_CELL = re.compile(r'<c r="([A-Z]+[0-9]+)"([^>]*)><f>(.*?)</f><v\s*/>', re.DOTALL)
+
+def store_formula_values(xlsx_bytes, results):
+    """將公式的計算結果寫入 openpyxl 儲存的 xlsx 中作為快取值（openpyxl 只寫入公式、不寫入結果）。
+
+    results 為 {(工作表, 座標): 值}；沒有結果的公式維持原樣。
+    """
+    by_sheet = {}
+    for (sheet_name, coordinate), value in results.items():
+        by_sheet.setdefault(sheet_name, {})[coordinate] = value
+
+    def cached_cell(values):
+        def replace(match):
+            if match.group(1) not in values:
+                return match.group(0)
+            value = values[match.group(1)]
+            if isinstance(value, ExcelErrorValue):
+                cell_type, text = 'e', str(value)
+            elif isinstance(value, float) and not math.isfinite(value):
+                cell_type, text = 'e', '#NUM!'
+            elif isinstance(value, bool):
+                cell_type, text = 'b', '1' if value else '0'
+            elif isinstance(value, (int, float)):
+                cell_type, text = None, str(int(value)) if isinstance(value, float) and value.is_integer() else repr(value)
+            else:
+                cell_type, text = 'str', value
+            attributes = match.group(2) + (f' t="{cell_type}"' if cell_type else '')
+            return f'<c r="{match.group(1)}"{attributes}><f>{match.group(3)}</f><v>{html.escape(text, quote=False)}</v>'
+        return replace
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(xlsx_bytes)) as archive:
+        sheet_parts = {part: by_sheet[sheet_name] for sheet_name, part in workbook_sheet_parts(archive).items() if sheet_name in by_sheet}
+        with zipfile.ZipFile(output, 'w') as updated:
+            for info in archive.infolist():
+                content = archive.read(info)
+                if info.filename in sheet_parts:
+                    content = _FORMULA_CELL.sub(cached_cell(sheet_parts[info.filename]), content.decode('utf-8')).encode('utf-8')
+                updated.writestr(info, content)
+    return output.getvalue()
+
+_RTP_ZONE_HEADER_START = re.compile(r'\s*\[')
+_RTP_ZONE_SUFFIX = '; Zone name'
+_RTP_BRACKET_PAIR = re.compile(r'\[(.*?)\]')
+_RTP_BRACKET_PAIR_BYTES = re.compile(rb'\[.*?\]')
+# 原本 Bump_Map 段落的結束條件 (?=\[Bump_Map|\[Fail|\[Scan_Area|\Z)
+_RTP_SECTION_BOUNDARY = re.compile(r'\[(?:Bump_Map|Fail|Scan_Area)')
+
+def iter_rtp_lines(buffer, chunk_size=RTP_CHUNK_SIZE, checkpoint=None):
+    # 逐塊解碼、統一換行後去除非 ASCII 字元，串起來與 clean_text(read_text()) 相同；每行保留結尾的 '\n'
+    # checkpoint 在每一塊開始前呼叫，可用來中止處理
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    line_parts = []
+    carry_cr = False
+    for offset in range(0, len(buffer), chunk_size):
+        if checkpoint is not None:
+            checkpoint()
+        text = decoder.decode(buffer[offset:offset + chunk_size], final=offset + chunk_size >= len(buffer))
+        if carry_cr:
+            text = '\r' + text
+        carry_cr = text.endswith('\r')  # '\r\n' 可能被切在兩塊之間
+        if carry_cr:
+            text = text[:-1]
+        text = text.replace('\r\n', '\n').replace('\r', '\n').encode('ascii', 'ignore').decode('ascii')
+        lines = text.split('\n')
+        for line in lines[:-1]:
+            line_parts.append(line)
+            yield ''.join(line_parts) + '\n'
+            line_parts = []
+        line_parts.append(lines[-1])
+    if carry_cr:
+        yield ''.join(line_parts) + '\n'
+        line_parts = []
+    last_line = ''.join(line_parts)
+    if last_line:
+        yield last_line
+
+def iter_rtp_pieces(lines, hold_bracket_groups=True):
+    r"""逐行產生與 re.split(r'(\[.*?\].*?\n)', content) 相同的片段，以 (片段, 區域名稱或 None) 表示。
+
+    含 '[...]' 的完整一行從第一個 '[' 起為標頭，其餘內容為標頭之間的片段，逐行產生。標頭之間的內容
+    只由開頭的 '['、第一個 '[...]' 與結尾的 '; Zone name' 判斷是否為區域標頭，不保留整段內容；
+    '[...]' 只可能出現在檔案最後一行（沒有換行），hold_bracket_groups 時以 '[' 開頭的內容才累積成一個片段，
+    成為區域標頭時整段被取代（rtp_last_line_has_brackets 為 False 時不需要）。
+    """
+    pending = []
+    state = None  # 標頭之間的內容：None 為尚未出現非空白字元，'buffer' 為以 '[' 開頭，'stream' 為其他
+    brackets = None  # 第一個 '[...]'
+    tail = spaces = ''  # 內容去除結尾空白後的最後幾個字元，以及其後的空白
+    suffix_length = len(_RTP_ZONE_SUFFIX)
+
+    def group_zone_name():
+        # 與 rtp_zone_name(整段內容) 的結果相同
+        if state != 'buffer':
+            return None
+        return rtp_zone_name(f"{brackets or '['}\n{tail}")
+
+    def end_group():
+        nonlocal pending, state, brackets, tail, spaces
+        zone_name = group_zone_name()
+        if pending or zone_name is not None:
+            yield ''.join(pending), zone_name
+        pending = []
+        state = brackets = None
+        tail = spaces = ''
+
+    for line in lines:
+        start = line.find('[')
+        header = start != -1 and line.endswith('\n') and line.find(']', start + 1) != -1
+        text = line[:start] if header else line
+        if state is None and text and not text.isspace():
+            state = 'buffer' if text.lstrip()[0] == '[' else 'stream'
+        if state == 'buffer':
+            if brackets is None:
+                # 換行只在行尾，'[...]' 就是第一個 '[' 到其後第一個 ']'
+                opening = text.find('[')
+                closing = text.find(']', opening + 1) if opening != -1 else -1
+                if closing != -1:
+                    brackets = text[opening:closing + 1]
+            stripped = text.rstrip()
+            if stripped:
+                tail = (tail + spaces + stripped)[-suffix_length:]
+                spaces = text[len(stripped):][-suffix_length:]
+            else:
+                spaces = (spaces + text)[-suffix_length:]
+        if hold_bracket_groups and state != 'stream':
+            pending.append(text)
+        else:
+            if pending:
+                yield ''.join(pending), None
+                pending = []
+            yield text, None
+        if header:
+            yield from end_group()
+            yield line[start:], rtp_zone_name(line[start:])
+    yield from end_group()
+
+def rtp_last_line_has_brackets(buffer):
+    # 檔案最後一行沒有換行且含 '[...]' 時，以 '[' 開頭的標頭之間內容才可能是區域標頭
+    end = max(buffer.rfind(b'\n'), buffer.rfind(b'\r')) + 1
+    return _RTP_BRACKET_PAIR_BYTES.search(buffer, end) is not None
+
+def rtp_zone_name(piece):
+    # 片段是 '[名稱]   ; Zone name' 時回傳區域名稱
+    if _RTP_ZONE_HEADER_START.match(piece) and piece.rstrip().endswith(_RTP_ZONE_SUFFIX):
+        return _RTP_BRACKET_PAIR.search(piece).group(1)
+    return None
+
+def scan_rtp_zones(buffer, checkpoint=None):
+    # 第一次掃描：依出現順序將前 5 個區域對應到 Bump_Map_1~5
+    bump_map_count = 0
+    zone_to_bump_map = {}
+    for _, zone_name in iter_rtp_pieces(iter_rtp_lines(buffer, checkpoint=checkpoint), hold_bracket_groups=False):
+        if zone_name is not None and zone_name not in ['PostProcess', 'Scan_Area']:
+            bump_map_count += 1
+            if bump_map_count <= 5:
+                zone_to_bump_map[zone_name] = f'Bump_Map_{bump_map_count}'
+    return zone_to_bump_map
+
+def iter_rtp_sections(buffer, zone_to_bump_map, zone_status, checkpoint=None):
+    """第二次掃描：依檔案順序產生 (Bump_Map 名稱, 段落) 與第一個 ('Scan_Area', 段落)。
+
+    區域標頭改寫為 [Bump_Map_n]／[Fail]（超過 5 個的區域標頭移除），段落在 '[Bump_Map'、'[Fail'、
+    '[Scan_Area' 出現處切開，結果與原本在改寫後全文上執行的正規表示式相同；
+    只保留需要產生的段落（Scan_Area 只保留到下一個 '['），時間與檔案大小成線性。
+    """
+    def rewritten_pieces():
+        for piece, zone_name in iter_rtp_pieces(iter_rtp_lines(buffer, checkpoint=checkpoint), rtp_last_line_has_brackets(buffer)):
+            if zone_name is None or zone_name in ['PostProcess', 'Scan_Area']:
+                yield piece
+            elif zone_name in zone_to_bump_map:
+                bump_map_name = zone_to_bump_map[zone_name]
+                if any(zone_status.get(bump_map_name, {}).values()):
+                    yield f'[{bump_map_name}]   ; Zone name\n'
+                else:
+                    yield '[Fail]   ; Zone name\n'
+
+    scan_area_found = False
+    name_length = max(map(len, zone_status), default=0)
+
+    def section_name(prefix, final):
+        # 由段落開頭判斷是否需要此段落：回傳段落名稱、None（略過），或 ''（需要更多內容才能判斷）
+        nonlocal scan_area_found
+        if prefix.startswith('[Scan_Area]'):
+            if scan_area_found:
+                return None
+            scan_area_found = True
+            return 'Scan_Area'
+        if prefix.startswith('[Bump_Map'):
+            end = prefix.find(']')
+            if end != -1:
+                return prefix[1:end] if prefix[1:end] in zone_status else None
+            return None if final or len(prefix) > name_length + 1 else ''
+        if not final and ('[Scan_Area]'.startswith(prefix) or '[Bump_Map'.startswith(prefix)):
+            return ''
+        return None
+
+    # 段落在 '[Bump_Map'、'[Fail'、'[Scan_Area' 出現處切開（這些字串不會跨越片段）；
+    # 略過的段落不保留內容，Scan_Area 找到下一個 '[' 後不再累積
+    current = []
+    name = ''
+    complete = False
+
+    def add(text):
+        nonlocal current, name, complete
+        if name is None or complete:
+            return
+        current.append(text)
+        if name == '':
+            prefix = ''.join(current)
+            name = section_name(prefix, False)
+            if name == 'Scan_Area':
+                end = prefix.find('[', len('[Scan_Area]'))
+                if end != -1:
+                    current, complete = [prefix[:end]], True
+            elif name is None:
+                current = []
+        elif name == 'Scan_Area':
+            end = text.find('[')
+            if end != -1:
+                current[-1], complete = text[:end], True
+
+    def finish():
+        nonlocal current, name, complete
+        if name == '':
+            name = section_name(''.join(current), True)
+        section = (name, ''.join(current)) if name else None
+        current, name, complete = [], '', False
+        return section
+
+    for piece in rewritten_pieces():
+        if '[' not in piece:
+            if name is not None and not complete:
+                add(piece)
+            continue
+        start = 0
+        for match in _RTP_SECTION_BOUNDARY.finditer(piece):
+            add(piece[start:match.start()])
+            section = finish()
+            if section is not None:
+                yield section
+            start = match.start()
+        add(piece[start:])
+    section = finish()
+    if section is not None:
+        yield section
+
+# 執行緒停在這些函式時是在等待其他執行緒或閒置（執行緒池等工作），不計入取樣
+_PROFILE_IDLE_CODES = {function.__code__ for function in (
+    threading.Condition.wait, threading.Event.wait, threading.Thread.join,
+    getattr(threading.Thread, '_wait_for_tstate_lock', threading.Thread.join), concurrent.futures.thread._worker)}
+
+def profile_frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class RecipeProfiler:
+    """產生一個 check list 時的效能分析。
+
+    啟動的執行緒與之後建立的執行緒（平行解析的執行緒池）各以一個 cProfile 記錄，合併存為 pstats 檔；
+    另一個執行緒每 interval 秒取樣這些執行緒的呼叫堆疊，存為 flame graph 用的 collapsed stack
+    （flamegraph.pl、speedscope 可直接開啟），最耗時的函式也依取樣計算。只使用標準函式庫，PyInstaller 打包後同樣可用。
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.profiles = []
+        self.stacks = {}  # collapsed stack -> 取樣次數
+        self.sample_count = 0
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler = None
+        self._ignored_threads = set()
+
+    def start(self):
+        # 開始前已存在的其他執行緒（GUI 主執行緒等）不取樣
+        self._ignored_threads = set(sys._current_frames()) - {threading.get_ident()}
+        self._sampler = threading.Thread(target=self._sample, name='RecipeProfiler', daemon=True)
+        self._sampler.start()
+        profile = cProfile.Profile()
+        self.profiles.append(profile)
+        threading.setprofile(self._profile_thread)
+        profile.enable()
+
+    def stop(self):
+        self.profiles[0].disable()
+        threading.setprofile(None)
+        self._stopped.set()
+        self._sampler.join()
+
+    def _profile_thread(self, frame, event, arg):
+        # threading.setprofile 的掛鉤：新執行緒的第一個事件時改由該執行緒專用的 cProfile 記錄
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # Python 3.12 起 cProfile 本身已涵蓋所有執行緒，不能再啟用第二個
+        with self._lock:
+            self.profiles.append(profile)
+
+    def _sample(self):
+        self._ignored_threads.add(threading.get_ident())
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in self._ignored_threads or frame.f_code in _PROFILE_IDLE_CODES:
+                    continue
+                labels = []
+                while frame is not None:
+                    label = self._labels.get(frame.f_code)
+                    if label is None:
+                        label = self._labels[frame.f_code] = profile_frame_label(frame.f_code)
+                    labels.append(label)
+                    frame = frame.f_back
+                stack = ';'.join(reversed(labels))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+                self.sample_count += 1
+
+    def top_functions(self, limit=PROFILE_TOP_FUNCTIONS):
+        # 依取樣排序：self 為堆疊最上層是該函式的取樣數，total 為堆疊中含有該函式的取樣數
+        self_counts = {}
+        total_counts = {}
+        for stack, count in self.stacks.items():
+            labels = stack.split(';')
+            self_counts[labels[-1]] = self_counts.get(labels[-1], 0) + count
+            for label in set(labels):
+                total_counts[label] = total_counts.get(label, 0) + count
+        ranked = sorted(self_counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(label, count, total_counts[label]) for label, count in ranked]
+
+    def save(self, base_path):
+        # 寫入 <base_path>.prof（pstats）與 <base_path>.folded（collapsed stack），回傳兩個路徑
+        stats_path = base_path + '.prof'
+        stacks_path = base_path + '.folded'
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(stats_path)
+        with open(stacks_path, 'w', encoding='utf-8') as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write(f"{stack} {count}\n")
+        return stats_path, stacks_path
+
+    def report(self, paths, limit=PROFILE_TOP_FUNCTIONS):
+        lines = [f"Profile: {paths[0]}, {paths[1]} ({self.sample_count} samples)",
+                 f"Top {limit} functions (self %, total %):"]
+        for label, count, total in self.top_functions(limit):
+            lines.append(f"  {count * 100 / max(self.sample_count, 1):5.1f}  {total * 100 / max(self.sample_count, 1):5.1f}  {label}")
+        return '\n'.join(lines)
+
+class ProcessingCancelled(Exception):
+    """使用者取消產生 check list"""
+
 class FileProcessor(QThread):
     progress_updated = pyqtSignal(int)
     processing_completed = pyqtSignal()
+    processing_cancelled = pyqtSignal()
     error_occurred = pyqtSignal(str)
     open_folder_signal = pyqtSignal(str) 
 
-    def __init__(self, avi_recipe_path):
+    def __init__(self, avi_recipe_path, output_dir=None, spec_checker=None, template_bytes=None,
+                 reuse_output=True, reuse_dirs=(), content_hash=False, low_memory=False, trace_memory=False, history_dir=None, profile=False):
         super().__init__()
         self.avi_recipe_path = avi_recipe_path
+        # 未指定輸出資料夾時寫入設定的 output 存放位置（預設為 Downloads）
+        self.output_storage = LocalStorage(output_dir) if output_dir else STORAGE['output']
+        self.output_dir = self.output_storage.path()
+        self.template_bytes = template_bytes  # 常駐服務已載入記憶體的範本，不需再從磁碟複製
+        self.stage_timings = {}
+        self.stage_peaks = {}  # 各處理階段的記憶體峰值（bytes），只在 tracemalloc 追蹤中時記錄
+        self.low_memory = low_memory  # 解析後釋放中間資料、RTP.txt 一律以 mmap 讀取
+        self.trace_memory = trace_memory
+        self.history_dir = history_dir  # 產生後將參數加入此資料夾的參數歷史；None 時不記錄
+        self.profile = profile  # 以 RecipeProfiler 分析產生過程，結果寫在 check list 旁
+        self.profile_report = None
+        self.output_path = None
+        self.excel_error = None
+        self.formula_summary = None  # 公式檢查結果（CheckListFormulaEvaluator.summary）
+        self.spec_checker = spec_checker
+        self.spec_flags = None
+        self.reuse_output = reuse_output
+        self.reuse_dirs = list(reuse_dirs)  # 除了輸出資料夾外，也在這些資料夾尋找可沿用的 check list
+        self.content_hash = content_hash
+        self.fingerprint = None
+        self.reused_output = None
+        self.cancel_event = threading.Event()
+        self.warnings = []  # 解析時的警告，預檢時一併回報
+        self.warning_reasons = {}  # 原因 -> 次數，寫入運作統計
+        self._warnings_lock = threading.Lock()
+        self._progress_value = -1
+        self._progress_time = None
         self.variables = {'Default': {}, 'Default1': {}}
         self.default1_name = ''
         self.default1_actual_name = '' 
         self.surface_on_sb_variables = {}
         self.uniform_surface_on_sb_variables = {}
+        self.io_executor = None
+        self.recipe_tree = open_recipe_tree(avi_recipe_path)
+        self.run_stats = {}
+        self.parameters = None
+        self.ini_memo = ParsedFileMemo(self.recipe_tree)
+        self.folder_paths = {}
+        if low_memory:
+            self.recipe_tree.rtp_prefetch_limit = 0
         
         # 提取 'Recipe/' 之後的部分作為 AVI_recipe_name
         recipe_index = avi_recipe_path.rfind('Recipe/')
         if recipe_index != -1:
-            self.variables['AVI_recipe_name'] = avi_recipe_path[recipe_index + 7:]  # 7 是 'Recipe/' 的長度
+            self.variables['AVI_recipe_name'] = recipe_display_name(avi_recipe_path[recipe_index + 7:])  # 7 是 'Recipe/' 的長度
         else:
-            self.variables['AVI_recipe_name'] = os.path.basename(avi_recipe_path)
+            self.variables['AVI_recipe_name'] = recipe_display_name(os.path.basename(avi_recipe_path))
         
         # 解析 AVI_recipe_group_ID 和 AVI_recipe_EQP_ID
         recipe_parts = self.variables['AVI_recipe_name'].split('-')
@@ -60,7 +3134,38 @@ class FileProcessor(QThread):
             raise ValueError('Recipe檔名錯誤，請遵照EQP-Group-Stage-E-Version的格式進行命名')
 
     def clean_text(self, text):
-        return ''.join(char for char in text if ord(char) < 128)
+        return ascii_text(text)
+
+    def cancel(self):
+        # 由 GUI 執行緒呼叫；處理中的執行緒在下一個檢查點停止
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ProcessingCancelled('已取消')
+
+    def warn(self, message, log=print, reason='other'):
+        # 照常輸出，並記錄在 self.warnings 與各原因的次數（Default 與 Default1 的解析執行緒都可能呼叫）
+        with self._warnings_lock:
+            self.warnings.append(message)
+            self.warning_reasons[reason] = self.warning_reasons.get(reason, 0) + 1
+        log(message)
+
+    def warning_snapshot(self):
+        # 回傳 (警告清單, 各原因的次數) 的副本
+        with self._warnings_lock:
+            return list(self.warnings), dict(self.warning_reasons)
+
+    def report_progress(self, value):
+        value = int(value)
+        if value <= self._progress_value:
+            return
+        now = datetime.datetime.now()
+        if value < 100 and self._progress_time is not None and (now - self._progress_time).total_seconds() < PROGRESS_EMIT_INTERVAL:
+            return
+        self._progress_value = value
+        self._progress_time = now
+        self.progress_updated.emit(value)
 
     def run(self):
         try:
@@ -75,307 +3180,268 @@ class FileProcessor(QThread):
             self.error_occurred.emit(str(e))
 
     def process_files(self):
-        # 首先處理 WaferMapRecipe.ini
-        setup1_path = os.path.join(self.avi_recipe_path, 'Setup1')
-        if os.path.exists(setup1_path):
-            wafer_map_recipe_path = os.path.join(setup1_path, 'WaferMapRecipe.ini')
-            if os.path.exists(wafer_map_recipe_path):
-                self.parse_wafer_map_recipe(wafer_map_recipe_path)
-            else:
-                print("警告: 在 Setup1 資料夾中未找到 WaferMapRecipe.ini 文件")
-        else:
-            print("警告: 未找到 Setup1 資料夾")
-
-        # 繼續處理其他文件
         setup1_path = os.path.join(self.avi_recipe_path, 'Setup1')
         recipes_path = os.path.join(setup1_path, 'Recipes')
-        
+
         print(f"Recipes path: {recipes_path}")
-        
-        # 處理 Default 資料夾
-        default_path = os.path.join(recipes_path, 'Default')
-        print(f"Processing Default folder: {default_path}")
-        self.process_folder(default_path, 'Default', 0)  # 從 0 開始計數
-        
-        # 尋找其他資料夾（可能的 Default1）
-        other_folders = [f for f in os.listdir(recipes_path) if f != 'Default' and os.path.isdir(os.path.join(recipes_path, f))]
-        print(f"Other folders found: {other_folders}")
-        
-        # 根據 other_folders 的數量設置 Recipe_file_count
-        self.Recipe_file_count = 'Multi' if len(other_folders) >= 1 else 'Single'
-        self.variables['Recipe_file_count'] = 'Multi' if len(other_folders) >= 1 else 'Single'
-        print(f"Recipe_file_count: {self.Recipe_file_count}")
-        
-        if len(other_folders) >= 2:  # 如果有 2 個或更多額外的資料夾（不包括 Default）
-            raise Exception(f"Setup1\\Recipes\\file count >={len(other_folders) + 1}, 請使用者檢查Recipe的數量|{recipes_path}")
-        
-        if other_folders:
-            default1_path = os.path.join(recipes_path, other_folders[0])
-            self.default1_actual_name = os.path.basename(default1_path)
-            self.default1_name = 'Default1'
-            print(f"Default1 folder actual name: {self.default1_actual_name}")
-            print(f"Processing Default1 folder: {default1_path}")
-            self.process_folder(default1_path, 'Default1', 0)  # 重新從 0 開始計數
-        else:
-            print("No Default1 folder found")
+
+        with ThreadPoolExecutor(max_workers=MAX_IO_WORKERS) as io_executor:
+            if not self.recipe_tree.dirs:  # 計算指紋時可能已建立
+                self.recipe_tree.build_index(io_executor)
+            self.check_cancelled()
+            self.report_progress(5)
+
+            # 尋找其他資料夾（可能的 Default1）
+            other_folders = [f for f in self.recipe_tree.listdir(recipes_path) if f != 'Default' and self.recipe_tree.isdir(os.path.join(recipes_path, f))]
+            print(f"Other folders found: {other_folders}")
+
+            if len(other_folders) >= 2:  # 如果有 2 個或更多額外的資料夾（不包括 Default）
+                raise Exception(f"Setup1\\Recipes\\file count >={len(other_folders) + 1}, 請使用者檢查Recipe的數量|{recipes_path}")
+
+            # 一次同時讀取所有需要解析的小檔案，之後的解析只使用記憶體中的內容
+            prefetched_count = len(self.recipe_tree.buffers) or self.recipe_tree.prefetch(io_executor)
+            self.run_stats['prefetch_files'] = prefetched_count
+            self.run_stats['prefetch_bytes'] = self.recipe_tree.bytes_fetched
+            self.run_stats['prefetch_seconds'] = round(self.recipe_tree.fetch_time, 3)
+            print(f"Prefetched {prefetched_count} files ({self.recipe_tree.bytes_fetched} bytes) in {self.recipe_tree.fetch_time:.3f}s")
+            self.check_cancelled()
+            self.report_progress(15)
+
+            # Default 與 Default1 兩條解析流程互不相依，放在有上限的執行緒池中同時進行；
+            # 各流程只寫入自己的 self.variables[folder_type]，因此合併結果與依序執行相同
+            self.folder_paths['Default'] = os.path.join(recipes_path, 'Default')
+            if other_folders:
+                default1_path = os.path.join(recipes_path, other_folders[0])
+                self.default1_actual_name = os.path.basename(default1_path)
+                self.default1_name = 'Default1'
+                print(f"Default1 folder actual name: {self.default1_actual_name}")
+                self.folder_paths['Default1'] = default1_path
+            else:
+                print("No Default1 folder found")
+            folders_to_process = [(folder_path, folder_type) for folder_type, folder_path in self.folder_paths.items()]
+
+            with ThreadPoolExecutor(max_workers=len(folders_to_process) + 1) as pipeline_executor:
+                self.io_executor = io_executor
+                try:
+                    # 首先處理 WaferMapRecipe.ini
+                    wafer_map_future = None
+                    if self.recipe_tree.exists(setup1_path):
+                        wafer_map_recipe_path = os.path.join(setup1_path, 'WaferMapRecipe.ini')
+                        if self.recipe_tree.exists(wafer_map_recipe_path):
+                            wafer_map_future = pipeline_executor.submit(self.extract_ini_fields, 'WaferMapRecipe.ini', wafer_map_recipe_path)
+                        else:
+                            self.warn("警告: 在 Setup1 資料夾中未找到 WaferMapRecipe.ini 文件", reason='missing_ini')
+                    else:
+                        self.warn("警告: 未找到 Setup1 資料夾", reason='missing_folder')
+
+                    folder_futures = []
+                    for folder_path, folder_type in folders_to_process:
+                        print(f"Processing {folder_type} folder: {folder_path}")
+                        folder_futures.append(pipeline_executor.submit(self.process_folder, folder_path, folder_type, 0))  # 從 0 開始計數
+
+                    # 依固定順序等待結果，讓頂層鍵的順序與例外的拋出順序維持確定
+                    if wafer_map_future is not None:
+                        wafer_map_future.result()
+
+                    # 根據 other_folders 的數量設置 Recipe_file_count
+                    self.Recipe_file_count = 'Multi' if len(other_folders) >= 1 else 'Single'
+                    self.variables['Recipe_file_count'] = 'Multi' if len(other_folders) >= 1 else 'Single'
+                    print(f"Recipe_file_count: {self.Recipe_file_count}")
+
+                    for done, future in enumerate(folder_futures, 1):
+                        future.result()
+                        self.report_progress(15 + 25 * done / len(folder_futures))
+                finally:
+                    self.io_executor = None
+
+        # 解析完成後一次轉型，之後的步驟都使用精簡的參數紀錄
+        self.parameters = RecipeRecord.from_variables(self.variables)
+        self.run_stats['parameter_count'] = self.parameters.value_count()
+        self.run_stats['record_bytes'] = self.parameters.memory_size()
+        self.run_stats['dict_bytes'] = nested_getsizeof(self.variables)
+        print(f"Parameter record: {self.parameters.value_count()} values, {self.run_stats['record_bytes']} bytes "
+              f"(dict view: {self.run_stats['dict_bytes']} bytes, shared key table: {len(PARAMETER_KEYS)} keys)")
+        if self.low_memory:
+            self.release_parse_buffers()
+
+    def release_parse_buffers(self):
+        # 之後的步驟只使用 self.parameters；預先讀取的檔案與已解析的 INI 需要時再從 Recipe 讀取
+        self.variables = {key: self.variables[key] for key in EXPORT_IDENTITY_FIELDS}
+        self.surface_on_sb_variables = {}
+        self.uniform_surface_on_sb_variables = {}
+        self.recipe_tree.buffers.clear()
+        self.ini_memo.clear()
 
     def process_folder(self, folder_path, folder_type, initial_bump_map_count):
         print(f"Entering process_folder for {folder_type}: {folder_path}")
-        self.bump_map_count = initial_bump_map_count
-        self.zone_to_bump_map = {}  # 重置映射
-        
-        files_to_process = [
-            ('OpticsPreset.ini', self.parse_optics_preset),
-            ('AlignRtp.ini', self.parse_align_rtp),
-            ('ProductInfo.ini', self.parse_product_info),
-            ('AlignmentData.ini', self.parse_alignment_data),
-            ('Recipe.ini', self.parse_recipe),
-            ('RTP.txt', self.parse_rtp)
-        ]
+        bump_map_count = initial_bump_map_count
 
-        for filename, parse_function in files_to_process:
+        for filename in RECIPE_FOLDER_FILES:
+            self.check_cancelled()
             file_path = self.find_file(filename, folder_path)
             if file_path:
                 print(f"Found and processing {filename} in {folder_type}")
-                parse_function(file_path, folder_type)
+                if filename in INI_EXTRACTION_PLANS:
+                    self.extract_ini_fields(filename, file_path, folder_type)
+                else:
+                    self.parse_rtp(file_path, folder_type)
             else:
-                print(f"File not found: {filename} in {folder_type}")
+                self.warn(f"File not found: {filename} in {folder_type}", reason='missing_ini' if filename.lower().endswith('.ini') else 'missing_file')
 
-        print(f"Finished processing {folder_type}, found {self.bump_map_count} Bump Maps")
+        print(f"Finished processing {folder_type}, found {bump_map_count} Bump Maps")
 
         # 列出 Zones 資料夾中的所有文件
         zones_path = os.path.join(folder_path, 'Zones')
-        if os.path.exists(zones_path):
+        if self.recipe_tree.exists(zones_path):
             print(f"Files in {folder_type} Zones folder:")
-            for file in os.listdir(zones_path):
+            for file in self.recipe_tree.listdir(zones_path):
                 print(f"  - {file}")
         else:
-            print(f"Zones folder not found in {folder_type}")
+            self.warn(f"Zones folder not found in {folder_type}", reason='missing_folder')
 
     def find_file(self, filename, search_path):
-        for root, dirs, files in os.walk(search_path):
-            if filename in files:
-                return os.path.join(root, filename)
-        return None
-
-    def parse_optics_preset(self, file_path, folder_type):
-        config = configparser.ConfigParser()
-        config.optionxform = str  # 保持鍵的大小寫
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            config.read_file(file)
-
-        if 'RobotSetup' in config:
-            robotsetup_name = config['RobotSetup'].get('Name', '')
-            if robotsetup_name:
-                self.variables[folder_type]['OpticsPreset_Robotsetup_Name'] = robotsetup_name
-
-        if 'General' in config:
-            general = config['General']
-
-            scan2d_mag = next((v for k, v in general.items() if k.startswith('Scan2d-Mag')), None)
-            if scan2d_mag:
-                self.variables[folder_type]['OpticsPreset_General_Scan2d_Mag'] = scan2d_mag
-
-            verify_color_mag = next((v for k, v in general.items() if 'VerifyColorMag' in k and k.endswith('-Mag')), None)
-            if verify_color_mag:
-                self.variables[folder_type]['OpticsPreset_General_VerifyColorMag_Mag'] = verify_color_mag
-
-            diff_light = next((v for k, v in general.items() if k.startswith('DiffLight') and '-' not in k), None)
-            if diff_light:
-                self.variables[folder_type]['OpticsPreset_General_DiffLight'] = self.round_to_one_decimal(diff_light)
-
-            ref_light = next((v for k, v in general.items() if k.startswith('RefLight') and '-' not in k), None)
-            if ref_light:
-                self.variables[folder_type]['OpticsPreset_General_RefLight'] = self.round_to_one_decimal(ref_light)
-
-            verify_color_ref_light = next((v for k, v in general.items() if 'VerifyColorMag' in k and k.endswith('-RefLight')), None)
-            if verify_color_ref_light:
-                self.variables[folder_type]['OpticsPreset_General_VerifyColorMag_RefLight'] = self.round_to_one_decimal(verify_color_ref_light)
-
-    def round_to_one_decimal(self, value):
-        try:
-            return f"{float(value):.1f}"
-        except ValueError:
-            return value
-
-    def parse_wafer_map_recipe(self, file_path):
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        cleaned_content = self.clean_text(content)
-        config.read_string(cleaned_content)
-
-        self.variables['WaferMapRecipe_GENERAL_ExportInAutoCycle'] = self.clean_text(config.get('GENERAL', 'ExportInAutoCycle', fallback=''))
-        self.variables['WaferMapRecipe_Input_Update_Enable'] = self.clean_text(config.get('Input_Update', 'Enable', fallback=''))
-        self.variables['WaferMapRecipe_Input_Update_FileMask'] = self.clean_text(config.get('Input_Update', 'FileMask', fallback=''))
-        self.variables['WaferMapRecipe_Input_Update_ImportDirectory'] = self.clean_text(config.get('Input_Update', 'ImportDirectory', fallback=''))
-        self.variables['WaferMapRecipe_Input_Update_ConverterName'] = self.clean_text(config.get('Input_Update', 'ConverterName', fallback=''))
-
-    def parse_align_rtp(self, file_path, folder_type):
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        cleaned_content = self.clean_text(content)
-        config.read_string(cleaned_content)
-
-        self.variables[folder_type]['AlignRtp_DIE_Alignment_Die__MinScore'] = self.clean_text(config.get('DIE Alignment', 'Die__MinScore', fallback=''))
-
-    def parse_product_info(self, file_path, folder_type):
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        cleaned_content = self.clean_text(content)
-        config.read_string(cleaned_content)
-
-        self.variables[folder_type]['ProductInfo_General_OCRWaferIDMask'] = self.clean_text(config.get('General', 'OCRWaferIDMask', fallback=''))
-        self.variables[folder_type]['ProductInfo_Geometric_XDieIndex'] = self.clean_text(config.get('Geometric', 'XDieIndex', fallback=''))
-        self.variables[folder_type]['ProductInfo_Geometric_YDieIndex'] = self.clean_text(config.get('Geometric', 'YDieIndex', fallback=''))
-        self.variables[folder_type]['ProductInfo_Geometric_Diameter'] = self.clean_text(config.get('Geometric', 'Diameter', fallback=''))
-        self.variables[folder_type]['ProductInfo_UpperIdReader_Enabled'] = self.clean_text(config.get('UpperIdReader', 'Enabled', fallback=''))
-        self.variables[folder_type]['ProductInfo_UpperIdReader_JobName'] = self.clean_text(config.get('UpperIdReader', 'JobName', fallback=''))
-
-    def parse_alignment_data(self, file_path, folder_type):
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        cleaned_content = self.clean_text(content)
-        config.read_string(cleaned_content)
-
-        self.variables[folder_type]['AlignmentData_General_MinScore'] = self.clean_text(config.get('General', 'MinScore', fallback=''))
-
-    def parse_recipe(self, file_path, folder_type):
-        config = configparser.ConfigParser()
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        cleaned_content = self.clean_text(content)
-        config.read_string(cleaned_content)
-
-        self.variables[folder_type]['Recipe_AutoCycle_ExportPMdata'] = self.clean_text(config.get('AutoCycle', 'ExportPMdata', fallback=''))
-        self.variables[folder_type]['Recipe_AutoCycle_MaxImagesToGrabDie'] = self.clean_text(config.get('AutoCycle', 'MaxImagesToGrabDie', fallback=''))
+        return self.recipe_tree.find_file(filename, search_path)
+
+    def extract_ini_fields(self, filename, file_path, folder_type=None):
+        # 依 INI_EXTRACTION_SPEC 擷取欄位；Recipe 層級的檔案寫入 self.variables 的頂層
+        plan = INI_EXTRACTION_PLANS[filename]
+        items = plan.extract(self.recipe_tree.read_text(file_path))
+        if plan.recipe_level:
+            self.variables.update(items)
+        else:
+            self.variables[folder_type].update(items)
 
     def parse_rtp(self, file_path, folder_type):
         logging.info(f"Starting parse_rtp for folder_type: {folder_type}")
         logging.info(f"self.avi_recipe_path: {self.avi_recipe_path}")
         logging.info(f"Parsing RTP file: {file_path}")
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
-        except IOError as e:
-            logging.error(f"Error reading file {file_path}: {e}")
-            return
 
-        cleaned_content = self.clean_text(content)
-        sections = re.split(r'(\[.*?\].*?\n)', cleaned_content)
-        
-        result_sections = []
+        actual_folder_type = self.default1_actual_name if folder_type == 'Default1' else folder_type
+
+        # RTP.txt 以串流方式掃描兩次（大型檔案以 mmap 對應），不建立整份內容的副本，
+        # 同時只保留一個段落，檔案格式異常時也維持線性時間
+        with contextlib.ExitStack() as stack:
+            try:
+                buffer = stack.enter_context(self.recipe_tree.open_buffer(file_path))
+            except IOError as e:
+                logging.error(f"Error reading file {file_path}: {e}")
+                return
+
+            print(f"\n--- {folder_type} Zones ---")
+            zone_to_bump_map = scan_rtp_zones(buffer, self.check_cancelled)
+            logging.info(f"Identified zones: {zone_to_bump_map}")
+
+            zone_status = self.read_rtp_zone_status(folder_type, zone_to_bump_map)
+
+            bump_map_items = {}
+            scan_area_items = None
+            for name, section in iter_rtp_sections(buffer, zone_to_bump_map, zone_status, self.check_cancelled):
+                self.check_cancelled()
+                if name == 'Scan_Area':
+                    scan_area_items = self.section_items(section, 'RTP_Scan_Area_Surface')
+                else:
+                    bump_map_items.setdefault(name, []).extend(
+                        self.bump_map_section_items(section, name, zone_status[name], actual_folder_type))
+
+        # 處理 Bump Map 部分（依區域順序寫入，與原本逐一搜尋各 Bump Map 的順序相同）
+        variables = self.variables.setdefault(folder_type, {})
+        for bump_map_name in zone_status:
+            variables.update(bump_map_items.get(bump_map_name, []))
+
+        # 處理 Scan Area 部分
+        if scan_area_items is not None:
+            logging.info(f"Parsing Scan Area Surface section for {actual_folder_type}")
+            variables.update(scan_area_items)
+        else:
+            self.warn(f"Scan Area Surface section not found for {actual_folder_type}", logging.warning, reason='missing_section')
+
+        logging.info(f"Parsed data for {actual_folder_type}: {self.variables.get(folder_type, {})}")
+
+    def read_rtp_zone_status(self, folder_type, zone_to_bump_map):
         zone_status = {}
-        bump_map_count = 0  # 重置計數
-        zone_to_bump_map = {}
-
-        print(f"\n--- {folder_type} Zones ---")
-        for section in sections:
-            if section.strip().startswith('[') and section.strip().endswith('; Zone name'):
-                zone_name = re.search(r'\[(.*?)\]', section).group(1)
-                if zone_name not in ['PostProcess', 'Scan_Area']:
-                    bump_map_count += 1
-                    if bump_map_count <= 5:
-                        zone_to_bump_map[zone_name] = f'Bump_Map_{bump_map_count}'
-
-        logging.info(f"Identified zones: {zone_to_bump_map}")
-
-        # 定義不區分大小寫的文件查找函數
-        def find_file_case_insensitive(dir_path, filename):
-            for file in os.listdir(dir_path):
-                if file.lower() == filename.lower():
-                    return os.path.join(dir_path, file)
-            return None
+        # 分析所有區域的狀態：Zones 資料夾只列出一次，各 INI 交由執行緒池同時讀取
+        actual_folder_type = self.default1_actual_name if folder_type == 'Default1' else folder_type
+        zones_dir = os.path.join(self.folder_paths[folder_type], 'Zones')
+        zone_files = {file.lower(): file for file in reversed(self.recipe_tree.listdir(zones_dir))} if zone_to_bump_map else {}
 
-        # 分析所有區域的狀態
+        zone_futures = {}
         for zone_name, bump_map_name in zone_to_bump_map.items():
             normalized_zone_name = zone_name.replace('_', ' ')
-            actual_folder_type = self.default1_actual_name if folder_type == 'Default1' else folder_type
-            zones_dir = os.path.join(self.avi_recipe_path, 'Setup1', 'Recipes', actual_folder_type, 'Zones')
             ini_file = os.path.join(zones_dir, f'{normalized_zone_name}.ini')
-            
+
             logging.info(f"Processing zone: {zone_name} as {bump_map_name} for {actual_folder_type}")
             logging.info(f"Looking for INI file: {ini_file}")
-            
+
             # 使用不區分大小寫的文件查找
-            found_ini_file = find_file_case_insensitive(zones_dir, f'{normalized_zone_name}.ini')
-            
-            if found_ini_file:
+            actual_file_name = zone_files.get(f'{normalized_zone_name}.ini'.lower())
+            if actual_file_name:
+                found_ini_file = os.path.join(zones_dir, actual_file_name)
+                if self.io_executor is not None:
+                    zone_futures[bump_map_name] = self.io_executor.submit(self.read_zone_status, found_ini_file)
+                else:
+                    zone_futures[bump_map_name] = found_ini_file
+
+        for zone_name, bump_map_name in zone_to_bump_map.items():
+            self.check_cancelled()
+            normalized_zone_name = zone_name.replace('_', ' ')
+            zone_future = zone_futures.get(bump_map_name)
+
+            if zone_future is not None:
+                found_ini_file = os.path.join(zones_dir, zone_files[f'{normalized_zone_name}.ini'.lower()])
                 print(f"Found INI file: {os.path.basename(found_ini_file)}")
                 logging.info(f"INI file exists: {found_ini_file}")
-                zone_status[bump_map_name] = {}
-                config = configparser.ConfigParser()
-                config.read(found_ini_file)
-                for alg in ['Solder Bump', 'Surface on SB', 'Uniform Surface on SB', 'Surface', 'PMI Advanced', 'Probe Mark Inspection']:
-                    zone_status[bump_map_name][alg] = config.getboolean(alg, 'Enable', fallback=False)
+                if isinstance(zone_future, str):
+                    zone_status[bump_map_name] = self.read_zone_status(zone_future)
+                else:
+                    zone_status[bump_map_name] = zone_future.result()
             else:
-                print(f"INI file not found for: {normalized_zone_name}.ini")
+                self.warn(f"INI file not found for: {normalized_zone_name}.ini in {actual_folder_type}", reason='missing_ini')
                 logging.warning(f"INI file not found for {zone_name} in {actual_folder_type}. Assuming all algorithms are disabled.")
                 # 列出目標目錄中的所有文件
                 logging.info(f"Files in {zones_dir}:")
-                for file in os.listdir(zones_dir):
+                for file in zone_files.values():
                     logging.info(f"  - {file}")
-                zone_status[bump_map_name] = {alg: False for alg in ['Solder Bump', 'Surface on SB', 'Uniform Surface on SB', 'Surface', 'PMI Advanced', 'Probe Mark Inspection']}
-            
+                zone_status[bump_map_name] = {alg: False for alg in ZONE_ALGORITHMS}
+
             logging.info(f"Zone status for {bump_map_name} in {actual_folder_type}: {zone_status[bump_map_name]}")
 
-        # 處理每個區域
-        for section in sections:
-            if section.strip().startswith('[') and section.strip().endswith('; Zone name'):
-                zone_name = re.search(r'\[(.*?)\]', section).group(1)
-                if zone_name in ['PostProcess', 'Scan_Area']:
-                    result_sections.append(section)
-                elif zone_name in zone_to_bump_map:
-                    bump_map_name = zone_to_bump_map[zone_name]
-                    if any(zone_status.get(bump_map_name, {}).values()):
-                        new_section = f'[{bump_map_name}]   ; Zone name\n'
-                        logging.info(f"Converted {zone_name} to {new_section.strip()} for {actual_folder_type}")
-                    else:
-                        new_section = '[Fail]   ; Zone name\n'
-                        logging.info(f"Marked {zone_name} as Fail for {actual_folder_type}")
-                    result_sections.append(new_section)
+        return zone_status
+
+    def bump_map_section_items(self, section, bump_map_name, status, actual_folder_type):
+        items = []
+        alg_sections = re.split(r'\nAlg\s*=\s*', section)
+        for alg_section in alg_sections[1:]:
+            alg_type = alg_section.partition('\n')[0].strip()
+            alg_type_normalized = alg_type.replace('_', ' ')
+            if status.get(alg_type_normalized, False):
+                prefix = f'RTP_{bump_map_name}_{alg_type}'
+                logging.info(f"Parsing section for {prefix} in {actual_folder_type}")
+                items.extend(self.section_items(alg_section, prefix))
             else:
-                result_sections.append(section)
-
-        new_content = ''.join(result_sections)
-
-        # 處理 Bump Map 部分
-        for bump_map_name, status in zone_status.items():
-            bump_map_sections = re.findall(f'\[{bump_map_name}\].*?(?=\[Bump_Map|\[Fail|\[Scan_Area|\Z)', new_content, re.DOTALL)
-            for section in bump_map_sections:
-                alg_sections = re.split(r'\nAlg\s*=\s*', section)
-                for alg_section in alg_sections[1:]:
-                    alg_type = alg_section.split('\n')[0].strip()
-                    alg_type_normalized = alg_type.replace('_', ' ')
-                    if status.get(alg_type_normalized, False):
-                        prefix = f'RTP_{bump_map_name}_{alg_type}'
-                        logging.info(f"Parsing section for {prefix} in {actual_folder_type}")
-                        self.parse_section(alg_section, prefix, folder_type)
-                    else:
-                        logging.warning(f"Skipping disabled algorithm {alg_type} for {bump_map_name} in {actual_folder_type}")
+                self.warn(f"Skipping disabled algorithm {alg_type} for {bump_map_name} in {actual_folder_type}", logging.warning, reason='disabled_algorithm')
+        return items
 
-        # 處理 Scan Area 部分
-        scan_area_surface = re.search(r'\[Scan_Area\].*?(?=\[|\Z)', new_content, re.DOTALL)
-        if scan_area_surface:
-            logging.info(f"Parsing Scan Area Surface section for {actual_folder_type}")
-            self.parse_section(scan_area_surface.group(), 'RTP_Scan_Area_Surface', folder_type)
-        else:
-            logging.warning(f"Scan Area Surface section not found for {actual_folder_type}")
+    def read_zone_status(self, ini_file):
+        # 多個區域對應同一個 Zones INI 時本次執行只讀取一次，內容相同的 INI 在整個批次中只解析一次
+        def parse_zone_status():
+            config = self.ini_memo.config(ini_file)
+            return {alg: config.getboolean(alg, 'Enable', fallback=False) for alg in ZONE_ALGORITHMS}
+        return dict(self.ini_memo.result('zone_status', ini_file, lambda: PARSE_CACHE.get_or_compute(
+            'zone_status', self.recipe_tree.read_bytes(ini_file), parse_zone_status)))
 
-        # 處理 Fail 部分
-        fail_sections = re.findall(r'\[Fail\].*?(?=\[Bump_Map|\[Scan_Area|\Z)', new_content, re.DOTALL)
-        for section in fail_sections:
-            logging.info(f"Parsing Fail section for {actual_folder_type}, but not parsing it")
+    def parse_section(self, section_content, prefix, folder_type):
+        self.variables.setdefault(folder_type, {}).update(self.section_items(section_content, prefix))
 
-        logging.info(f"Parsed data for {actual_folder_type}: {self.variables.get(folder_type, {})}")
+    def section_items(self, section_content, prefix):
+        # 前綴與內容都相同的段落在整個批次中只解析一次
+        return PARSE_CACHE.get_or_compute('rtp_section', f'{prefix}\n{section_content}'.encode('utf-8'),
+                                          lambda: self.parse_section_items(section_content, prefix))
 
-    def parse_section(self, section_content, prefix, folder_type):
+    def parse_section_items(self, section_content, prefix):
+        items = []
         lines = section_content.split('\n')
         for line in lines[1:]: 
+            self.check_cancelled()
             if '=' in line:
                 key, value = line.split('=', 1)
                 key = self.clean_text(key.strip())
@@ -383,9 +3449,10 @@ class FileProcessor(QThread):
                 value = self.clean_text(value.split(';')[0].strip())
                 if value.startswith('.'):
                     value = '0' + value
-                self.variables.setdefault(folder_type, {})[f"{prefix}_{key}"] = value
+                items.append((f"{prefix}_{key}", value))
 
-        self.variables.setdefault(folder_type, {})[f"{prefix}_Alg"] = prefix.split('_')[-1]
+        items.append((f"{prefix}_Alg", prefix.split('_')[-1]))
+        return tuple(items)
 
     def parse_uniform_surface_on_sb(self, section_content, bump_map_number):
         allowed_params = [
@@ -409,22 +3476,56 @@ class FileProcessor(QThread):
                         value = '0' + value
                     self.uniform_surface_on_sb_variables[f"RTP_Bump_Map_{bump_map_number}_Uniform_Surface_on_SB_{key}"] = value
 
+    def check_scan_area_ini(self, folder_type):
+        # 使用解析時已確定的資料夾（Default1 可能是其他名稱），不再由 folder_type 組出路徑
+        folder_path = self.folder_paths.get(folder_type)
+        if folder_path is None:
+            print(f"Scan Area.ini not found for {folder_type}")
+            return False
+        ini_path = os.path.join(folder_path, 'Zones', 'Scan Area.ini')
+        print(f"Checking Scan Area.ini for {folder_type}: {ini_path}")
+        if self.recipe_tree.exists(ini_path):
+            config = self.ini_memo.config(ini_path)
+            enable_value = config.get('Surface', 'Enable', fallback='1')
+            print(f"Enable value for {folder_type}: {enable_value}")
+            return enable_value == '0'  # 如果 Enable 為 0，則返回 True（表示需要刪除工作表）
+        print(f"Scan Area.ini not found for {folder_type}")
+        return False  # 如果文件不存在，默認不刪除工作表
+
+    def load_template(self):
+        # 未傳入範本內容時由設定的存放位置讀取（網路磁碟上的範本使用本機快取）
+        return self.template_bytes if self.template_bytes is not None else STORAGE.template_bytes()
+
     def update_excel_file(self):
-        template_path = r"D:\本地應用程式\AVI Check list\Camtek Falcon Check list_V4.xlsx"
-        downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
         # 從 avi_recipe_path 提取檔案名稱
-        recipe_name = os.path.basename(self.avi_recipe_path)
-        # 創建新的檔案名稱
-        new_file_name = f"{recipe_name}_AVI check list.xlsx"
+        new_file_name = check_list_file_name(self.avi_recipe_path)
         # 組合完整的輸出路徑
-        output_path = os.path.join(downloads_folder, new_file_name)
-
-        # Copy the template file to the Downloads folder
-        shutil.copy2(template_path, output_path)
+        output_path = self.output_storage.path(new_file_name)
+        self.output_path = output_path
 
         try:
-            # Open the copied file
-            wb = load_workbook(output_path)
+            # 在 update_excel_file 方法中
+            default_should_delete = self.check_scan_area_ini('Default')
+            default1_should_delete = self.check_scan_area_ini('Default1')
+
+            print(f"Should delete Default Surface sheet: {default_should_delete}")
+            print(f"Should delete Default1 Surface sheet: {default1_should_delete}")
+
+            template_bytes = self.load_template()
+
+            # 先依解析結果決定保留的工作表，會被刪除的工作表在載入前就從範本移除，不需載入、填值後再刪除
+            sheet_names = template_sheet_names(template_bytes)
+            surviving_sheets = surviving_check_list_sheets(
+                sheet_names, self.parameters, {'Default': default_should_delete, 'Default1': default1_should_delete})
+            removed_sheets = [sheet_name for sheet_name in sheet_names if sheet_name not in surviving_sheets]
+            if removed_sheets:
+                print(f"Removing sheets before loading the template: {removed_sheets}")
+                template_bytes = remove_template_sheets(template_bytes, removed_sheets)
+
+            wb = load_workbook(io.BytesIO(template_bytes))
+            template_bytes = None  # 載入後不再需要範本內容
+            self.check_cancelled()
+            self.report_progress(50)
 
             # 解鎖所有工作表
             for ws in wb.worksheets:
@@ -433,919 +3534,36 @@ class FileProcessor(QThread):
                     ws.protection.enable()
                     ws.protection.disable()  # 解除保護
             
-            # Define mappings
-            check_list_mappings = {
-                'AVI_recipe_group_ID': 'C4',
-                'ProductInfo_Geometric_Diameter': 'C5',
-                'ProductInfo_Geometric_XDieIndex': 'C7',
-                'ProductInfo_Geometric_YDieIndex': 'C8',
-                'AVI_recipe_name': 'C16',
-                'AVI_recipe_EQP_ID': 'C17',
-                'AlignRtp_DIE_Alignment_Die__MinScore': 'C18',
-                'AlignmentData_General_MinScore': 'C19',  
-                'ProductInfo_UpperIdReader_JobName': 'C20',  
-                'OpticsPreset_Robotsetup_Name': 'C21',
-                'OpticsPreset_General_DiffLight': 'C23',
-                'OpticsPreset_General_RefLight': 'C24',
-                'OpticsPreset_General_VerifyColorMag_RefLight': 'C25',
-                'OpticsPreset_General_VerifyColorMag_Mag': 'C31',
-                'Recipe_AutoCycle_ExportPMdata': 'C35',
-                'Recipe_AutoCycle_MaxImagesToGrabDie': 'C36',
-                'ProductInfo_General_OCRWaferIDMask': 'C37',
-                'Recipe_file_count': 'C38',
-                'WaferMapRecipe_GENERAL_ExportInAutoCycle': 'C40',
-                'WaferMapRecipe_Input_Update_Enable': 'C42',
-                'WaferMapRecipe_Input_Update_FileMask': 'C43',
-                'WaferMapRecipe_Input_Update_ImportDirectory': 'C44',
-                'WaferMapRecipe_Input_Update_ConverterName': 'C45',
-            }
-
-            surface_mappings = {
-                'RTP_Scan_Area_Surface_Min_Defect_Area_-_Bright': 'F4',
-                'RTP_Scan_Area_Surface_Min_Defect_Width_-_Bright': 'F5',
-                'RTP_Scan_Area_Surface_Min_Defect_Length_-_Bright': 'F6',
-                'RTP_Scan_Area_Surface_Contrast_Delta_-_Bright': 'F7',
-                'RTP_Scan_Area_Surface_Contrast_Factor_-_Bright': 'F8',
-                'RTP_Scan_Area_Surface_Min_Defect_Area_-_Dark': 'F9',
-                'RTP_Scan_Area_Surface_Min_Defect_Width_-_Dark': 'F10',
-                'RTP_Scan_Area_Surface_Min_Defect_Length_-_Dark': 'F11',
-                'RTP_Scan_Area_Surface_Contrast_Delta_-_Dark': 'F12',
-                'RTP_Scan_Area_Surface_Contrast_Factor_-_Dark': 'F13',
-                'RTP_Scan_Area_Surface_Big_Area_Status_-_Bright': 'F14',
-                'RTP_Scan_Area_Surface_Big_Area_Status_-_Dark': 'F15',
-                'RTP_Scan_Area_Surface_Cluster_Area': 'F16',
-                'RTP_Scan_Area_Surface_Cluster_Distance': 'F17',
-                'RTP_Scan_Area_Surface_Cluster_Diameter': 'F18',
-                'RTP_Scan_Area_Surface_Adaptive_Histogram_Mode': 'F19',
-                'RTP_Scan_Area_Surface_CollectForGlobalSum': 'F20',
-                'RTP_Scan_Area_Surface_MaxAreaSum': 'F21',
-                'RTP_Scan_Area_Surface_Zone_CD_Radius': 'F22',
-                'RTP_Scan_Area_Surface_Dark_Zone_CD_Percent': 'F23',
-                'RTP_Scan_Area_Surface_Bright_Zone_CD_Percent': 'F24',
-                'RTP_Scan_Area_Surface_MaxCountSum': 'F25'
-                }
-
-            pad_device_mappings = {
-                #[Bump_Map_1]
-                'RTP_Bump_Map_1_Surface_Min_Defect_Area_-_Bright': 'F4',
-                'RTP_Bump_Map_1_Surface_Min_Defect_Width_-_Bright': 'F5',
-                'RTP_Bump_Map_1_Surface_Min_Defect_Length_-_Bright': 'F6',
-                'RTP_Bump_Map_1_Surface_Contrast_Delta_-_Bright': 'F7',
-                'RTP_Bump_Map_1_Surface_Contrast_Factor_-_Bright': 'F8',
-                'RTP_Bump_Map_1_Surface_Min_Defect_Area_-_Dark': 'F9',
-                'RTP_Bump_Map_1_Surface_Min_Defect_Width_-_Dark': 'F10',
-                'RTP_Bump_Map_1_Surface_Min_Defect_Length_-_Dark': 'F11',
-                'RTP_Bump_Map_1_Surface_Contrast_Delta_-_Dark': 'F12',
-                'RTP_Bump_Map_1_Surface_Contrast_Factor_-_Dark': 'F13',
-                'RTP_Bump_Map_1_Surface_Big_Area_Status_-_Bright': 'F14',
-                'RTP_Bump_Map_1_Surface_Big_Area_Status_-_Dark': 'F15',
-                'RTP_Bump_Map_1_Surface_Cluster_Area': 'F16',
-                'RTP_Bump_Map_1_Surface_Cluster_Distance': 'F17',
-                'RTP_Bump_Map_1_Surface_Cluster_Diameter': 'F18',
-                'RTP_Bump_Map_1_Surface_Adaptive_Histogram_Mode': 'F19',
-                'RTP_Bump_Map_1_Surface_CollectForGlobalSum': 'F20',
-                'RTP_Bump_Map_1_Surface_MaxAreaSum': 'F21',
-                'RTP_Bump_Map_1_Surface_Zone_CD_Radius': 'F22',
-                'RTP_Bump_Map_1_Surface_Dark_Zone_CD_Percent': 'F23',
-                'RTP_Bump_Map_1_Surface_Bright_Zone_CD_Percent': 'F24',
-                'RTP_Bump_Map_1_Surface_MaxCountSum': 'F25',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F125',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F126',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F127',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F128',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F129',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F130',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F131',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Sensitivity': 'F132',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Probe__Sensitivity': 'F133',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_Low_Threshold': 'F134',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Pad_High_Threshold': 'F135',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F136',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F137',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_PM_Min_Area': 'F138',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F139',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F140',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F141',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F142',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Enable_surface_zone': 'F143',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Dont_Care_zone': 'F144',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Surface_Zone': 'F145',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F146',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F147',
-                'RTP_Bump_Map_1_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F148',
-                'RTP_Bump_Map_1_PMI_Advanced_USL_Pad_Size_X': 'F256',
-                'RTP_Bump_Map_1_PMI_Advanced_LSL_Pad_Size_X': 'F257',
-                'RTP_Bump_Map_1_PMI_Advanced_USL_Pad_Size_Y': 'F258',
-                'RTP_Bump_Map_1_PMI_Advanced_LSL_Pad_Size_Y': 'F259',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Mislocation_X': 'F260',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Mislocation_Y': 'F261',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Edge_Sensitivity': 'F262',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Sensitivity': 'F263',
-                'RTP_Bump_Map_1_PMI_Advanced_PM_Sensitivity': 'F264',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Gray_Level': 'F265',
-                'RTP_Bump_Map_1_PMI_Advanced_Pad_Edge_Gray_Level': 'F266',
-                'RTP_Bump_Map_1_PMI_Advanced_Surface_Gray_Level': 'F267',
-                'RTP_Bump_Map_1_PMI_Advanced_USL_PM_Area_[%]': 'F268',
-                'RTP_Bump_Map_1_PMI_Advanced_LSL_PM_Area': 'F269',
-                'RTP_Bump_Map_1_PMI_Advanced_PM_Min_Spot_Area': 'F270',
-                'RTP_Bump_Map_1_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F271',
-                'RTP_Bump_Map_1_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F272',
-                'RTP_Bump_Map_1_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F273',
-                'RTP_Bump_Map_1_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F274',
-                'RTP_Bump_Map_1_PMI_Advanced_Enable_surface_zone': 'F275',
-                'RTP_Bump_Map_1_PMI_Advanced_Don**_Care_zone': 'F276',
-                'RTP_Bump_Map_1_PMI_Advanced_Surface_Zone': 'F277',
-                'RTP_Bump_Map_1_PMI_Advanced_Min_Defect_Area': 'F278',
-                'RTP_Bump_Map_1_PMI_Advanced_Contrast_Delta_-_Dark': 'F279',
-                'RTP_Bump_Map_1_PMI_Advanced_Contrast_Delta_-_bright': 'F280',
-                'RTP_Bump_Map_1_PMI_Advanced_nspection_Sensitivity': 'F281',
-                'RTP_Bump_Map_1_PMI_Advanced_Ref_Sensitivity': 'F282',
-
-                #[Bump_Map_2]
-                'RTP_Bump_Map_2_Surface_Min_Defect_Area_-_Bright': 'F28',
-                'RTP_Bump_Map_2_Surface_Min_Defect_Width_-_Bright': 'F29',
-                'RTP_Bump_Map_2_Surface_Min_Defect_Length_-_Bright': 'F30',
-                'RTP_Bump_Map_2_Surface_Contrast_Delta_-_Bright': 'F31',
-                'RTP_Bump_Map_2_Surface_Contrast_Factor_-_Bright': 'F32',
-                'RTP_Bump_Map_2_Surface_Min_Defect_Area_-_Dark': 'F33',
-                'RTP_Bump_Map_2_Surface_Min_Defect_Width_-_Dark': 'F34',
-                'RTP_Bump_Map_2_Surface_Min_Defect_Length_-_Dark': 'F35',
-                'RTP_Bump_Map_2_Surface_Contrast_Delta_-_Dark': 'F36',
-                'RTP_Bump_Map_2_Surface_Contrast_Factor_-_Dark': 'F37',
-                'RTP_Bump_Map_2_Surface_Big_Area_Status_-_Bright': 'F38',
-                'RTP_Bump_Map_2_Surface_Big_Area_Status_-_Dark': 'F39',
-                'RTP_Bump_Map_2_Surface_Cluster_Area': 'F40',
-                'RTP_Bump_Map_2_Surface_Cluster_Distance': 'F41',
-                'RTP_Bump_Map_2_Surface_Cluster_Diameter': 'F42',
-                'RTP_Bump_Map_2_Surface_Adaptive_Histogram_Mode': 'F43',
-                'RTP_Bump_Map_2_Surface_CollectForGlobalSum': 'F44',
-                'RTP_Bump_Map_2_Surface_MaxAreaSum': 'F45',
-                'RTP_Bump_Map_2_Surface_Zone_CD_Radius': 'F46',
-                'RTP_Bump_Map_2_Surface_Dark_Zone_CD_Percent': 'F47',
-                'RTP_Bump_Map_2_Surface_Bright_Zone_CD_Percent': 'F48',
-                'RTP_Bump_Map_2_Surface_MaxCountSum': 'F49',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F151',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F152',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F153',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F154',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F155',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F156',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F157',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Sensitivity': 'F158',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Probe__Sensitivity': 'F159',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_Low_Threshold': 'F160',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Pad_High_Threshold': 'F161',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F162',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F163',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_PM_Min_Area': 'F164',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F165',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F166',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F167',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F168',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Enable_surface_zone': 'F169',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Dont_Care_zone': 'F170',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Surface_Zone': 'F171',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F172',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F173',
-                'RTP_Bump_Map_2_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F174',
-                'RTP_Bump_Map_2_PMI_Advanced_USL_Pad_Size_X': 'F285',
-                'RTP_Bump_Map_2_PMI_Advanced_LSL_Pad_Size_X': 'F286',
-                'RTP_Bump_Map_2_PMI_Advanced_USL_Pad_Size_Y': 'F287',
-                'RTP_Bump_Map_2_PMI_Advanced_LSL_Pad_Size_Y': 'F288',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Mislocation_X': 'F289',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Mislocation_Y': 'F290',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Edge_Sensitivity': 'F291',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Sensitivity': 'F292',
-                'RTP_Bump_Map_2_PMI_Advanced_PM_Sensitivity': 'F293',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Gray_Level': 'F294',
-                'RTP_Bump_Map_2_PMI_Advanced_Pad_Edge_Gray_Level': 'F295',
-                'RTP_Bump_Map_2_PMI_Advanced_Surface_Gray_Level': 'F296',
-                'RTP_Bump_Map_2_PMI_Advanced_USL_PM_Area_[%]': 'F297',
-                'RTP_Bump_Map_2_PMI_Advanced_LSL_PM_Area': 'F298',
-                'RTP_Bump_Map_2_PMI_Advanced_PM_Min_Spot_Area': 'F299',
-                'RTP_Bump_Map_2_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F300',
-                'RTP_Bump_Map_2_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F301',
-                'RTP_Bump_Map_2_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F302',
-                'RTP_Bump_Map_2_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F303',
-                'RTP_Bump_Map_2_PMI_Advanced_Enable_surface_zone': 'F304',
-                'RTP_Bump_Map_2_PMI_Advanced_Don**_Care_zone': 'F305',
-                'RTP_Bump_Map_2_PMI_Advanced_Surface_Zone': 'F306',
-                'RTP_Bump_Map_2_PMI_Advanced_Min_Defect_Area': 'F307',
-                'RTP_Bump_Map_2_PMI_Advanced_Contrast_Delta_-_Dark': 'F308',
-                'RTP_Bump_Map_2_PMI_Advanced_Contrast_Delta_-_bright': 'F309',
-                'RTP_Bump_Map_2_PMI_Advanced_nspection_Sensitivity': 'F310',
-                'RTP_Bump_Map_2_PMI_Advanced_Ref_Sensitivity': 'F311',
-
-                #[Bump_Map_3]
-                'RTP_Bump_Map_3_Surface_Min_Defect_Area_-_Bright': 'F52',
-                'RTP_Bump_Map_3_Surface_Min_Defect_Width_-_Bright': 'F53',
-                'RTP_Bump_Map_3_Surface_Min_Defect_Length_-_Bright': 'F54',
-                'RTP_Bump_Map_3_Surface_Contrast_Delta_-_Bright': 'F55',
-                'RTP_Bump_Map_3_Surface_Contrast_Factor_-_Bright': 'F56',
-                'RTP_Bump_Map_3_Surface_Min_Defect_Area_-_Dark': 'F57',
-                'RTP_Bump_Map_3_Surface_Min_Defect_Width_-_Dark': 'F58',
-                'RTP_Bump_Map_3_Surface_Min_Defect_Length_-_Dark': 'F59',
-                'RTP_Bump_Map_3_Surface_Contrast_Delta_-_Dark': 'F60',
-                'RTP_Bump_Map_3_Surface_Contrast_Factor_-_Dark': 'F61',
-                'RTP_Bump_Map_3_Surface_Big_Area_Status_-_Bright': 'F62',
-                'RTP_Bump_Map_3_Surface_Big_Area_Status_-_Dark': 'F63',
-                'RTP_Bump_Map_3_Surface_Cluster_Area': 'F64',
-                'RTP_Bump_Map_3_Surface_Cluster_Distance': 'F65',
-                'RTP_Bump_Map_3_Surface_Cluster_Diameter': 'F66',
-                'RTP_Bump_Map_3_Surface_Adaptive_Histogram_Mode': 'F67',
-                'RTP_Bump_Map_3_Surface_CollectForGlobalSum': 'F68',
-                'RTP_Bump_Map_3_Surface_MaxAreaSum': 'F69',
-                'RTP_Bump_Map_3_Surface_Zone_CD_Radius': 'F70',
-                'RTP_Bump_Map_3_Surface_Dark_Zone_CD_Percent': 'F71',
-                'RTP_Bump_Map_3_Surface_Bright_Zone_CD_Percent': 'F72',
-                'RTP_Bump_Map_3_Surface_MaxCountSum': 'F73',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F177',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F178',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F179',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F180',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F181',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F182',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F183',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Sensitivity': 'F184',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Probe__Sensitivity': 'F185',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_Low_Threshold': 'F186',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Pad_High_Threshold': 'F187',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F188',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F189',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_PM_Min_Area': 'F190',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F191',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F192',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F193',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F194',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Enable_surface_zone': 'F195',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Dont_Care_zone': 'F196',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Surface_Zone': 'F197',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F198',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F199',
-                'RTP_Bump_Map_3_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F200',
-                'RTP_Bump_Map_3_PMI_Advanced_USL_Pad_Size_X': 'F314',
-                'RTP_Bump_Map_3_PMI_Advanced_LSL_Pad_Size_X': 'F315',
-                'RTP_Bump_Map_3_PMI_Advanced_USL_Pad_Size_Y': 'F316',
-                'RTP_Bump_Map_3_PMI_Advanced_LSL_Pad_Size_Y': 'F317',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Mislocation_X': 'F318',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Mislocation_Y': 'F319',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Edge_Sensitivity': 'F320',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Sensitivity': 'F321',
-                'RTP_Bump_Map_3_PMI_Advanced_PM_Sensitivity': 'F322',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Gray_Level': 'F323',
-                'RTP_Bump_Map_3_PMI_Advanced_Pad_Edge_Gray_Level': 'F324',
-                'RTP_Bump_Map_3_PMI_Advanced_Surface_Gray_Level': 'F325',
-                'RTP_Bump_Map_3_PMI_Advanced_USL_PM_Area_[%]': 'F326',
-                'RTP_Bump_Map_3_PMI_Advanced_LSL_PM_Area': 'F327',
-                'RTP_Bump_Map_3_PMI_Advanced_PM_Min_Spot_Area': 'F328',
-                'RTP_Bump_Map_3_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F329',
-                'RTP_Bump_Map_3_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F330',
-                'RTP_Bump_Map_3_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F331',
-                'RTP_Bump_Map_3_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F332',
-                'RTP_Bump_Map_3_PMI_Advanced_Enable_surface_zone': 'F333',
-                'RTP_Bump_Map_3_PMI_Advanced_Don**_Care_zone': 'F334',
-                'RTP_Bump_Map_3_PMI_Advanced_Surface_Zone': 'F335',
-                'RTP_Bump_Map_3_PMI_Advanced_Min_Defect_Area': 'F336',
-                'RTP_Bump_Map_3_PMI_Advanced_Contrast_Delta_-_Dark': 'F337',
-                'RTP_Bump_Map_3_PMI_Advanced_Contrast_Delta_-_bright': 'F335',
-                'RTP_Bump_Map_3_PMI_Advanced_nspection_Sensitivity': 'F339',
-                'RTP_Bump_Map_3_PMI_Advanced_Ref_Sensitivity': 'F340',
-
-                #[Bump_Map_4]
-                'RTP_Bump_Map_4_Surface_Min_Defect_Area_-_Bright': 'F76',
-                'RTP_Bump_Map_4_Surface_Min_Defect_Width_-_Bright': 'F77',
-                'RTP_Bump_Map_4_Surface_Min_Defect_Length_-_Bright': 'F78',
-                'RTP_Bump_Map_4_Surface_Contrast_Delta_-_Bright': 'F79',
-                'RTP_Bump_Map_4_Surface_Contrast_Factor_-_Bright': 'F80',
-                'RTP_Bump_Map_4_Surface_Min_Defect_Area_-_Dark': 'F81',
-                'RTP_Bump_Map_4_Surface_Min_Defect_Width_-_Dark': 'F82',
-                'RTP_Bump_Map_4_Surface_Min_Defect_Length_-_Dark': 'F83',
-                'RTP_Bump_Map_4_Surface_Contrast_Delta_-_Dark': 'F84',
-                'RTP_Bump_Map_4_Surface_Contrast_Factor_-_Dark': 'F85',
-                'RTP_Bump_Map_4_Surface_Big_Area_Status_-_Bright': 'F86',
-                'RTP_Bump_Map_4_Surface_Big_Area_Status_-_Dark': 'F87',
-                'RTP_Bump_Map_4_Surface_Cluster_Area': 'F88',
-                'RTP_Bump_Map_4_Surface_Cluster_Distance': 'F89',
-                'RTP_Bump_Map_4_Surface_Cluster_Diameter': 'F90',
-                'RTP_Bump_Map_4_Surface_Adaptive_Histogram_Mode': 'F91',
-                'RTP_Bump_Map_4_Surface_CollectForGlobalSum': 'F92',
-                'RTP_Bump_Map_4_Surface_MaxAreaSum': 'F93',
-                'RTP_Bump_Map_4_Surface_Zone_CD_Radius': 'F94',
-                'RTP_Bump_Map_4_Surface_Dark_Zone_CD_Percent': 'F95',
-                'RTP_Bump_Map_4_Surface_Bright_Zone_CD_Percent': 'F96',
-                'RTP_Bump_Map_4_Surface_MaxCountSum': 'F97',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F203',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F204',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F205',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F206',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F207',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F208',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F209',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Sensitivity': 'F210',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Probe__Sensitivity': 'F211',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_Low_Threshold': 'F212',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Pad_High_Threshold': 'F213',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F214',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F215',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_PM_Min_Area': 'F216',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F217',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F218',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F219',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F220',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Enable_surface_zone': 'F221',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Dont_Care_zone': 'F222',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Surface_Zone': 'F223',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F224',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F225',
-                'RTP_Bump_Map_4_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F226',
-                'RTP_Bump_Map_4_PMI_Advanced_USL_Pad_Size_X': 'F343',
-                'RTP_Bump_Map_4_PMI_Advanced_LSL_Pad_Size_X': 'F344',
-                'RTP_Bump_Map_4_PMI_Advanced_USL_Pad_Size_Y': 'F345',
-                'RTP_Bump_Map_4_PMI_Advanced_LSL_Pad_Size_Y': 'F346',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Mislocation_X': 'F347',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Mislocation_Y': 'F348',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Edge_Sensitivity': 'F349',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Sensitivity': 'F350',
-                'RTP_Bump_Map_4_PMI_Advanced_PM_Sensitivity': 'F351',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Gray_Level': 'F351',
-                'RTP_Bump_Map_4_PMI_Advanced_Pad_Edge_Gray_Level': 'F353',
-                'RTP_Bump_Map_4_PMI_Advanced_Surface_Gray_Level': 'F354',
-                'RTP_Bump_Map_4_PMI_Advanced_USL_PM_Area_[%]': 'F355',
-                'RTP_Bump_Map_4_PMI_Advanced_LSL_PM_Area': 'F356',
-                'RTP_Bump_Map_4_PMI_Advanced_PM_Min_Spot_Area': 'F357',
-                'RTP_Bump_Map_4_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F358',
-                'RTP_Bump_Map_4_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F359',
-                'RTP_Bump_Map_4_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F360',
-                'RTP_Bump_Map_4_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F361',
-                'RTP_Bump_Map_4_PMI_Advanced_Enable_surface_zone': 'F362',
-                'RTP_Bump_Map_4_PMI_Advanced_Don**_Care_zone': 'F363',
-                'RTP_Bump_Map_4_PMI_Advanced_Surface_Zone': 'F364',
-                'RTP_Bump_Map_4_PMI_Advanced_Min_Defect_Area': 'F365',
-                'RTP_Bump_Map_4_PMI_Advanced_Contrast_Delta_-_Dark': 'F366',
-                'RTP_Bump_Map_4_PMI_Advanced_Contrast_Delta_-_bright': 'F367',
-                'RTP_Bump_Map_4_PMI_Advanced_nspection_Sensitivity': 'F368',
-                'RTP_Bump_Map_4_PMI_Advanced_Ref_Sensitivity': 'F369',
-
-                #[Bump_Map_5]
-                'RTP_Bump_Map_5_Surface_Min_Defect_Area_-_Bright': 'F100',
-                'RTP_Bump_Map_5_Surface_Min_Defect_Width_-_Bright': 'F101',
-                'RTP_Bump_Map_5_Surface_Min_Defect_Length_-_Bright': 'F102',
-                'RTP_Bump_Map_5_Surface_Contrast_Delta_-_Bright': 'F103',
-                'RTP_Bump_Map_5_Surface_Contrast_Factor_-_Bright': 'F104',
-                'RTP_Bump_Map_5_Surface_Min_Defect_Area_-_Dark': 'F105',
-                'RTP_Bump_Map_5_Surface_Min_Defect_Width_-_Dark': 'F106',
-                'RTP_Bump_Map_5_Surface_Min_Defect_Length_-_Dark': 'F107',
-                'RTP_Bump_Map_5_Surface_Contrast_Delta_-_Dark': 'F108',
-                'RTP_Bump_Map_5_Surface_Contrast_Factor_-_Dark': 'F109',
-                'RTP_Bump_Map_5_Surface_Big_Area_Status_-_Bright': 'F110',
-                'RTP_Bump_Map_5_Surface_Big_Area_Status_-_Dark': 'F111',
-                'RTP_Bump_Map_5_Surface_Cluster_Area': 'F112',
-                'RTP_Bump_Map_5_Surface_Cluster_Distance': 'F113',
-                'RTP_Bump_Map_5_Surface_Cluster_Diameter': 'F114',
-                'RTP_Bump_Map_5_Surface_Adaptive_Histogram_Mode': 'F115',
-                'RTP_Bump_Map_5_Surface_CollectForGlobalSum': 'F116',
-                'RTP_Bump_Map_5_Surface_MaxAreaSum': 'F117',
-                'RTP_Bump_Map_5_Surface_Zone_CD_Radius': 'F118',
-                'RTP_Bump_Map_5_Surface_Dark_Zone_CD_Percent': 'F119',
-                'RTP_Bump_Map_5_Surface_Bright_Zone_CD_Percent': 'F120',
-                'RTP_Bump_Map_5_Surface_MaxCountSum': 'F121',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Is_Rectangle': 'F229',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_USL_Pad_Size_[X]': 'F230',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_LSL_Pad_Size_[X]': 'F231',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_USL_Pad_Size_[Y]': 'F232',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_LSL_Pad_Size_[Y]': 'F233',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Mislocation_[X]': 'F234',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Mislocation_[Y]': 'F235',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Sensitivity': 'F236',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Probe__Sensitivity': 'F237',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_Low_Threshold': 'F238',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Pad_High_Threshold': 'F239',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_Area_For_Noise_[Spots]': 'F240',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_PM_Max_Area_[%_From_pad]': 'F241',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_PM_Min_Area': 'F242',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_Number_Of_Prob_Marks': 'F243',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Min_Number_Of_Prob_Marks': 'F244',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Min_acceptable_distance__from_Pad': 'F245',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Max_PM_size_allowed_touching_the_Pad': 'F246',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Enable_surface_zone': 'F247',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Dont_Care_zone': 'F248',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Surface_Zone': 'F249',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Defect_Area_Inside_Surface': 'F250',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Contrast_Delta_-_Dark': 'F251',
-                'RTP_Bump_Map_5_Probe_Mark_Inspection_Contrast_Delta_-_bright': 'F252',
-                'RTP_Bump_Map_5_PMI_Advanced_USL_Pad_Size_X': 'F372',
-                'RTP_Bump_Map_5_PMI_Advanced_LSL_Pad_Size_X': 'F373',
-                'RTP_Bump_Map_5_PMI_Advanced_USL_Pad_Size_Y': 'F374',
-                'RTP_Bump_Map_5_PMI_Advanced_LSL_Pad_Size_Y': 'F375',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Mislocation_X': 'F376',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Mislocation_Y': 'F377',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Edge_Sensitivity': 'F378',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Sensitivity': 'F379',
-                'RTP_Bump_Map_5_PMI_Advanced_PM_Sensitivity': 'F380',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Gray_Level': 'F381',
-                'RTP_Bump_Map_5_PMI_Advanced_Pad_Edge_Gray_Level': 'F382',
-                'RTP_Bump_Map_5_PMI_Advanced_Surface_Gray_Level': 'F383',
-                'RTP_Bump_Map_5_PMI_Advanced_USL_PM_Area_[%]': 'F384',
-                'RTP_Bump_Map_5_PMI_Advanced_LSL_PM_Area': 'F385',
-                'RTP_Bump_Map_5_PMI_Advanced_PM_Min_Spot_Area': 'F386',
-                'RTP_Bump_Map_5_PMI_Advanced_Max_Number_Of_Prob_Marks': 'F387',
-                'RTP_Bump_Map_5_PMI_Advanced_Min_Number_Of_Prob_Marks': 'F388',
-                'RTP_Bump_Map_5_PMI_Advanced_Min_acceptable_distance__from_Pad': 'F389',
-                'RTP_Bump_Map_5_PMI_Advanced_Max_PM_size_allowed_touching_the_Pad': 'F390',
-                'RTP_Bump_Map_5_PMI_Advanced_Enable_surface_zone': 'F391',
-                'RTP_Bump_Map_5_PMI_Advanced_Don**_Care_zone': 'F392',
-                'RTP_Bump_Map_5_PMI_Advanced_Surface_Zone': 'F393',
-                'RTP_Bump_Map_5_PMI_Advanced_Min_Defect_Area': 'F394',
-                'RTP_Bump_Map_5_PMI_Advanced_Contrast_Delta_-_Dark': 'F395',
-                'RTP_Bump_Map_5_PMI_Advanced_Contrast_Delta_-_bright': 'F396',
-                'RTP_Bump_Map_5_PMI_Advanced_nspection_Sensitivity': 'F397',
-                'RTP_Bump_Map_5_PMI_Advanced_Ref_Sensitivity': 'F398'
-            }
-
-            bump_device_mappings = {
-                #[Bump_Map_1]
-                'RTP_Bump_Map_1_Solder_Bump_Bump_Color_is_White': 'F4',
-                'RTP_Bump_Map_1_Solder_Bump_Bump_is_Contaminated': 'F5',
-                'RTP_Bump_Map_1_Solder_Bump_Bump_Diamter_LSL': 'F6',
-                'RTP_Bump_Map_1_Solder_Bump_Bump_Diamter_USL': 'F7',
-                'RTP_Bump_Map_1_Solder_Bump_Mislocation_X': 'F8',
-                'RTP_Bump_Map_1_Solder_Bump_Mislocation_Y': 'F9',
-                'RTP_Bump_Map_1_Solder_Bump_Detection_Threshold': 'F10',
-                'RTP_Bump_Map_1_Solder_Bump_Detection_Gradient': 'F11',
-                'RTP_Bump_Map_1_Solder_Bump_Bump_Roundness': 'F12',
-                'RTP_Bump_Map_1_Solder_Bump_Number_Of_Lines': 'F13',
-                'RTP_Bump_Map_1_Solder_Bump_Min_Points_for_bump_detection': 'F14',
-                'RTP_Bump_Map_1_Solder_Bump_RadiusPercentIn': 'F15',
-                'RTP_Bump_Map_1_Solder_Bump_RadiusPercentOut': 'F16',
-                'RTP_Bump_Map_1_Solder_Bump_LSL_ShapeViolation': 'F17',
-                'RTP_Bump_Map_1_Solder_Bump_USL_ShapeViolation': 'F18',
-                'RTP_Bump_Map_1_Solder_Bump_EdgeDetectThreshold': 'F19',
-                'RTP_Bump_Map_1_Solder_Bump_EdgeDetectArea': 'F20',
-                'RTP_Bump_Map_1_Solder_Bump_EdgeDetectLength': 'F21',
-                'RTP_Bump_Map_1_Solder_Bump_EdgeDetectDiameter': 'F22',
-                'RTP_Bump_Map_1_Solder_Bump_Edge_-_MinGL': 'F23',
-                'RTP_Bump_Map_1_Solder_Bump_Edge_-_MaxGL': 'F24',
-                'RTP_Bump_Map_1_Solder_Bump_Mislocation': 'F25',
-                'RTP_Bump_Map_1_Surface_on_SB_Enable_Surface_Moving': 'F27',
-                'RTP_Bump_Map_1_Surface_on_SB_Exposed_Area_High_TH': 'F28',
-                'RTP_Bump_Map_1_Surface_on_SB_Exposed_Area_Low_TH': 'F29',
-                'RTP_Bump_Map_1_Surface_on_SB_Actual__position_don\'t_care_width': 'F30',
-                'RTP_Bump_Map_1_Surface_on_SB_Original_position_don\'t_care_width': 'F31',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Area_-_Bright': 'F32',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Width_-_Bright': 'F33',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Length_-_Bright': 'F34',
-                'RTP_Bump_Map_1_Surface_on_SB_Contrast_Delta_-_Bright': 'F35',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Area_-_Dark': 'F36',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Width_-_Dark': 'F37',
-                'RTP_Bump_Map_1_Surface_on_SB_Min_Defect_Length_-_Dark': 'F38',
-                'RTP_Bump_Map_1_Surface_on_SB_Contrast_Delta_-_Dark': 'F39',
-                'RTP_Bump_Map_1_Surface_on_SB_Elongation': 'F40',
-                'RTP_Bump_Map_1_Surface_on_SB_MaxAreaSum': 'F41',
-                'RTP_Bump_Map_1_Surface_on_SB_CollectForGlobalSum': 'F42',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F44',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F45',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F46',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F47',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F48',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F49',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F50',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F51',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F52',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F53',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F54',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F55',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F56',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_MaxAreaSum': 'F57',
-                'RTP_Bump_Map_1_Uniform_Surface_on_SB_CollectForGlobalSum': 'F58',
-
-                #[Bump_Map_2]
-                'RTP_Bump_Map_2_Solder_Bump_Bump_Color_is_White': 'F62',
-                'RTP_Bump_Map_2_Solder_Bump_Bump_is_Contaminated': 'F63',
-                'RTP_Bump_Map_2_Solder_Bump_Bump_Diamter_LSL': 'F64',
-                'RTP_Bump_Map_2_Solder_Bump_Bump_Diamter_USL': 'F65',
-                'RTP_Bump_Map_2_Solder_Bump_Mislocation_X': 'F66',
-                'RTP_Bump_Map_2_Solder_Bump_Mislocation_Y': 'F67',
-                'RTP_Bump_Map_2_Solder_Bump_Detection_Threshold': 'F68',
-                'RTP_Bump_Map_2_Solder_Bump_Detection_Gradient': 'F69',
-                'RTP_Bump_Map_2_Solder_Bump_Bump_Roundness': 'F70',
-                'RTP_Bump_Map_2_Solder_Bump_Number_Of_Lines': 'F71',
-                'RTP_Bump_Map_2_Solder_Bump_Min_Points_for_bump_detection': 'F72',
-                'RTP_Bump_Map_2_Solder_Bump_RadiusPercentIn': 'F73',
-                'RTP_Bump_Map_2_Solder_Bump_RadiusPercentOut': 'F74',
-                'RTP_Bump_Map_2_Solder_Bump_LSL_ShapeViolation': 'F75',
-                'RTP_Bump_Map_2_Solder_Bump_USL_ShapeViolation': 'F76',
-                'RTP_Bump_Map_2_Solder_Bump_EdgeDetectThreshold': 'F77',
-                'RTP_Bump_Map_2_Solder_Bump_EdgeDetectArea': 'F78',
-                'RTP_Bump_Map_2_Solder_Bump_EdgeDetectLength': 'F79',
-                'RTP_Bump_Map_2_Solder_Bump_EdgeDetectDiameter': 'F80',
-                'RTP_Bump_Map_2_Solder_Bump_Edge_-_MinGL': 'F81',
-                'RTP_Bump_Map_2_Solder_Bump_Edge_-_MaxGL': 'F82',
-                'RTP_Bump_Map_2_Solder_Bump_Mislocation': 'F83',
-                'RTP_Bump_Map_2_Surface_on_SB_Enable_Surface_Moving': 'F85',
-                'RTP_Bump_Map_2_Surface_on_SB_Exposed_Area_High_TH': 'F86',
-                'RTP_Bump_Map_2_Surface_on_SB_Exposed_Area_Low_TH': 'F87',
-                'RTP_Bump_Map_2_Surface_on_SB_Actual__position_don\'t_care_width': 'F88',
-                'RTP_Bump_Map_2_Surface_on_SB_Original_position_don\'t_care_width': 'F89',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Area_-_Bright': 'F90',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Width_-_Bright': 'F91',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Length_-_Bright': 'F92',
-                'RTP_Bump_Map_2_Surface_on_SB_Contrast_Delta_-_Bright': 'F93',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Area_-_Dark': 'F94',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Width_-_Dark': 'F95',
-                'RTP_Bump_Map_2_Surface_on_SB_Min_Defect_Length_-_Dark': 'F96',
-                'RTP_Bump_Map_2_Surface_on_SB_Contrast_Delta_-_Dark': 'F97',
-                'RTP_Bump_Map_2_Surface_on_SB_Elongation': 'F98',
-                'RTP_Bump_Map_2_Surface_on_SB_MaxAreaSum': 'F99',
-                'RTP_Bump_Map_2_Surface_on_SB_CollectForGlobalSum': 'F100',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F102',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F103',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F104',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F105',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F106',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F107',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F108',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F109',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F110',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F111',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F112',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F113',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F114',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_MaxAreaSum': 'F115',
-                'RTP_Bump_Map_2_Uniform_Surface_on_SB_CollectForGlobalSum': 'F116',
-
-                #[Bump_Map_3]
-                'RTP_Bump_Map_3_Solder_Bump_Bump_Color_is_White': 'F120',
-                'RTP_Bump_Map_3_Solder_Bump_Bump_is_Contaminated': 'F121',
-                'RTP_Bump_Map_3_Solder_Bump_Bump_Diamter_LSL': 'F122',
-                'RTP_Bump_Map_3_Solder_Bump_Bump_Diamter_USL': 'F123',
-                'RTP_Bump_Map_3_Solder_Bump_Mislocation_X': 'F124',
-                'RTP_Bump_Map_3_Solder_Bump_Mislocation_Y': 'F125',
-                'RTP_Bump_Map_3_Solder_Bump_Detection_Threshold': 'F126',
-                'RTP_Bump_Map_3_Solder_Bump_Detection_Gradient': 'F127',
-                'RTP_Bump_Map_3_Solder_Bump_Bump_Roundness': 'F128',
-                'RTP_Bump_Map_3_Solder_Bump_Number_Of_Lines': 'F129',
-                'RTP_Bump_Map_3_Solder_Bump_Min_Points_for_bump_detection': 'F130',
-                'RTP_Bump_Map_3_Solder_Bump_RadiusPercentIn': 'F131',
-                'RTP_Bump_Map_3_Solder_Bump_RadiusPercentOut': 'F132',
-                'RTP_Bump_Map_3_Solder_Bump_LSL_ShapeViolation': 'F133',
-                'RTP_Bump_Map_3_Solder_Bump_USL_ShapeViolation': 'F134',
-                'RTP_Bump_Map_3_Solder_Bump_EdgeDetectThreshold': 'F135',
-                'RTP_Bump_Map_3_Solder_Bump_EdgeDetectArea': 'F136',
-                'RTP_Bump_Map_3_Solder_Bump_EdgeDetectLength': 'F137',
-                'RTP_Bump_Map_3_Solder_Bump_EdgeDetectDiameter': 'F138',
-                'RTP_Bump_Map_3_Solder_Bump_Edge_-_MinGL': 'F139',
-                'RTP_Bump_Map_3_Solder_Bump_Edge_-_MaxGL': 'F140',
-                'RTP_Bump_Map_3_Solder_Bump_Mislocation': 'F141',
-                'RTP_Bump_Map_3_Surface_on_SB_Enable_Surface_Moving': 'F143',
-                'RTP_Bump_Map_3_Surface_on_SB_Exposed_Area_High_TH': 'F144',
-                'RTP_Bump_Map_3_Surface_on_SB_Exposed_Area_Low_TH': 'F145',
-                'RTP_Bump_Map_3_Surface_on_SB_Actual__position_don\'t_care_width': 'F146',
-                'RTP_Bump_Map_3_Surface_on_SB_Original_position_don\'t_care_width': 'F147',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Area_-_Bright': 'F148',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Width_-_Bright': 'F149',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Length_-_Bright': 'F150',
-                'RTP_Bump_Map_3_Surface_on_SB_Contrast_Delta_-_Bright': 'F151',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Area_-_Dark': 'F152',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Width_-_Dark': 'F153',
-                'RTP_Bump_Map_3_Surface_on_SB_Min_Defect_Length_-_Dark': 'F154',
-                'RTP_Bump_Map_3_Surface_on_SB_Contrast_Delta_-_Dark': 'F155',
-                'RTP_Bump_Map_3_Surface_on_SB_Elongation': 'F156',
-                'RTP_Bump_Map_3_Surface_on_SB_MaxAreaSum': 'F157',
-                'RTP_Bump_Map_3_Surface_on_SB_CollectForGlobalSum': 'F158',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F160',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F161',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F162',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F163',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F164',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F165',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F166',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F167',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F168',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F169',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F170',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F171',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F172',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_MaxAreaSum': 'F173',
-                'RTP_Bump_Map_3_Uniform_Surface_on_SB_CollectForGlobalSum': 'F174',
-
-                #[Bump_Map_4]
-                'RTP_Bump_Map_4_Solder_Bump_Bump_Color_is_White': 'F178',
-                'RTP_Bump_Map_4_Solder_Bump_Bump_is_Contaminated': 'F179',
-                'RTP_Bump_Map_4_Solder_Bump_Bump_Diamter_LSL': 'F180',
-                'RTP_Bump_Map_4_Solder_Bump_Bump_Diamter_USL': 'F181',
-                'RTP_Bump_Map_4_Solder_Bump_Mislocation_X': 'F182',
-                'RTP_Bump_Map_4_Solder_Bump_Mislocation_Y': 'F183',
-                'RTP_Bump_Map_4_Solder_Bump_Detection_Threshold': 'F184',
-                'RTP_Bump_Map_4_Solder_Bump_Detection_Gradient': 'F185',
-                'RTP_Bump_Map_4_Solder_Bump_Bump_Roundness': 'F186',
-                'RTP_Bump_Map_4_Solder_Bump_Number_Of_Lines': 'F187',
-                'RTP_Bump_Map_4_Solder_Bump_Min_Points_for_bump_detection': 'F188',
-                'RTP_Bump_Map_4_Solder_Bump_RadiusPercentIn': 'F189',
-                'RTP_Bump_Map_4_Solder_Bump_RadiusPercentOut': 'F190',
-                'RTP_Bump_Map_4_Solder_Bump_LSL_ShapeViolation': 'F191',
-                'RTP_Bump_Map_4_Solder_Bump_USL_ShapeViolation': 'F192',
-                'RTP_Bump_Map_4_Solder_Bump_EdgeDetectThreshold': 'F193',
-                'RTP_Bump_Map_4_Solder_Bump_EdgeDetectArea': 'F194',
-                'RTP_Bump_Map_4_Solder_Bump_EdgeDetectLength': 'F195',
-                'RTP_Bump_Map_4_Solder_Bump_EdgeDetectDiameter': 'F196',
-                'RTP_Bump_Map_4_Solder_Bump_Edge_-_MinGL': 'F197',
-                'RTP_Bump_Map_4_Solder_Bump_Edge_-_MaxGL': 'F198',
-                'RTP_Bump_Map_4_Solder_Bump_Mislocation': 'F199',
-                'RTP_Bump_Map_4_Surface_on_SB_Enable_Surface_Moving': 'F201',
-                'RTP_Bump_Map_4_Surface_on_SB_Exposed_Area_High_TH': 'F202',
-                'RTP_Bump_Map_4_Surface_on_SB_Exposed_Area_Low_TH': 'F203',
-                'RTP_Bump_Map_4_Surface_on_SB_Actual__position_don\'t_care_width': 'F204',
-                'RTP_Bump_Map_4_Surface_on_SB_Original_position_don\'t_care_width': 'F205',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Area_-_Bright': 'F206',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Width_-_Bright': 'F207',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Length_-_Bright': 'F208',
-                'RTP_Bump_Map_4_Surface_on_SB_Contrast_Delta_-_Bright': 'F209',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Area_-_Dark': 'F210',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Width_-_Dark': 'F211',
-                'RTP_Bump_Map_4_Surface_on_SB_Min_Defect_Length_-_Dark': 'F212',
-                'RTP_Bump_Map_4_Surface_on_SB_Contrast_Delta_-_Dark': 'F213',
-                'RTP_Bump_Map_4_Surface_on_SB_Elongation': 'F214',
-                'RTP_Bump_Map_4_Surface_on_SB_MaxAreaSum': 'F215',
-                'RTP_Bump_Map_4_Surface_on_SB_CollectForGlobalSum': 'F216',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F218',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F219',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F220',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F221',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F222',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F223',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F224',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F225',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F226',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F227',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F228',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F229',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F230',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_MaxAreaSum': 'F231',
-                'RTP_Bump_Map_4_Uniform_Surface_on_SB_CollectForGlobalSum': 'F232',
-
-                #[Bump_Map_5]
-                'RTP_Bump_Map_5_Solder_Bump_Bump_Color_is_White': 'F236',
-                'RTP_Bump_Map_5_Solder_Bump_Bump_is_Contaminated': 'F237',
-                'RTP_Bump_Map_5_Solder_Bump_Bump_Diamter_LSL': 'F238',
-                'RTP_Bump_Map_5_Solder_Bump_Bump_Diamter_USL': 'F239',
-                'RTP_Bump_Map_5_Solder_Bump_Mislocation_X': 'F240',
-                'RTP_Bump_Map_5_Solder_Bump_Mislocation_Y': 'F241',
-                'RTP_Bump_Map_5_Solder_Bump_Detection_Threshold': 'F242',
-                'RTP_Bump_Map_5_Solder_Bump_Detection_Gradient': 'F243',
-                'RTP_Bump_Map_5_Solder_Bump_Bump_Roundness': 'F244',
-                'RTP_Bump_Map_5_Solder_Bump_Number_Of_Lines': 'F245',
-                'RTP_Bump_Map_5_Solder_Bump_Min_Points_for_bump_detection': 'F246',
-                'RTP_Bump_Map_5_Solder_Bump_RadiusPercentIn': 'F247',
-                'RTP_Bump_Map_5_Solder_Bump_RadiusPercentOut': 'F248',
-                'RTP_Bump_Map_5_Solder_Bump_LSL_ShapeViolation': 'F249',
-                'RTP_Bump_Map_5_Solder_Bump_USL_ShapeViolation': 'F250',
-                'RTP_Bump_Map_5_Solder_Bump_EdgeDetectThreshold': 'F251',
-                'RTP_Bump_Map_5_Solder_Bump_EdgeDetectArea': 'F252',
-                'RTP_Bump_Map_5_Solder_Bump_EdgeDetectLength': 'F253',
-                'RTP_Bump_Map_5_Solder_Bump_EdgeDetectDiameter': 'F254',
-                'RTP_Bump_Map_5_Solder_Bump_Edge_-_MinGL': 'F255',
-                'RTP_Bump_Map_5_Solder_Bump_Edge_-_MaxGL': 'F256',
-                'RTP_Bump_Map_5_Solder_Bump_Mislocation': 'F257',
-                'RTP_Bump_Map_5_Surface_on_SB_Enable_Surface_Moving': 'F259',
-                'RTP_Bump_Map_5_Surface_on_SB_Exposed_Area_High_TH': 'F260',
-                'RTP_Bump_Map_5_Surface_on_SB_Exposed_Area_Low_TH': 'F261',
-                'RTP_Bump_Map_5_Surface_on_SB_Actual__position_don\'t_care_width': 'F262',
-                'RTP_Bump_Map_5_Surface_on_SB_Original_position_don\'t_care_width': 'F263',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Area_-_Bright': 'F264',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Width_-_Bright': 'F265',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Length_-_Bright': 'F266',
-                'RTP_Bump_Map_5_Surface_on_SB_Contrast_Delta_-_Bright': 'F267',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Area_-_Dark': 'F268',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Width_-_Dark': 'F269',
-                'RTP_Bump_Map_5_Surface_on_SB_Min_Defect_Length_-_Dark': 'F270',
-                'RTP_Bump_Map_5_Surface_on_SB_Contrast_Delta_-_Dark': 'F271',
-                'RTP_Bump_Map_5_Surface_on_SB_Elongation': 'F272',
-                'RTP_Bump_Map_5_Surface_on_SB_MaxAreaSum': 'F273',
-                'RTP_Bump_Map_5_Surface_on_SB_CollectForGlobalSum': 'F274',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Enable_Moving_Surface': 'F276',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Exposed_Area_High_TH': 'F277',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Exposed_Area_Low_TH': 'F278',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Position_Don\'t-Care_Width': 'F279',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Original_position_don\'t_care_width': 'F280',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Area_-_Bright': 'F281',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Width_-_Bright': 'F282',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Length_-_Bright': 'F283',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Contrast_Upper_value_-_Bright': 'F284',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Area_-_Dark': 'F285',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Width_-_Dark': 'F286',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Min_Defect_Length_-_Dark': 'F287',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_Contrast_Lower_value_-_Dark': 'F288',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_MaxAreaSum': 'F289',
-                'RTP_Bump_Map_5_Uniform_Surface_on_SB_CollectForGlobalSum': 'F290',
-            }
-
-            all_mappings = {
-                'Default': {
-                    "Check list": check_list_mappings,
-                    "Surface": surface_mappings,
-                    "Pad device": pad_device_mappings,
-                    "Bump device": bump_device_mappings
-                },
-                'Default1': {
-                    "Check list_Multi": check_list_mappings,
-                    "Surface_Multi": surface_mappings,
-                    "Pad device_Multi": pad_device_mappings,
-                    "Bump device_Multi": bump_device_mappings
-                }
-            }
-
-            # Track empty sheets
-            empty_sheets = []
+            all_mappings = ALL_MAPPINGS
 
             for folder_type, mappings in all_mappings.items():
                 for sheet_name, sheet_mappings in mappings.items():
                     if sheet_name in wb.sheetnames:
                         ws = wb[sheet_name]
                         for var, cell in sheet_mappings.items():
-                            if var in self.variables.get(folder_type, {}) or var in self.variables:
-                                value = self.variables.get(folder_type, {}).get(var) or self.variables.get(var)
-                                try:
-                                    value = float(value)
-                                except ValueError:
-                                    pass
-                            
+                            if self.parameters.contains(folder_type, var):
+                                value = excel_cell_value(self.parameters.lookup(folder_type, var))
+                                if isinstance(value, str):
                                     ws[cell] = value
-                            sheet_updated = True
-                        
-                        if not sheet_updated:
-                            empty_sheets.append(sheet_name)
-
-            def check_scan_area_ini(folder_type):
-                ini_path = os.path.join(self.avi_recipe_path, 'Setup1', 'Recipes', folder_type, 'Zones', 'Scan Area.ini')
-                print(f"Checking Scan Area.ini for {folder_type}: {ini_path}")
-                if os.path.exists(ini_path):
-                    config = configparser.ConfigParser()
-                    config.read(ini_path)
-                    enable_value = config.get('Surface', 'Enable', fallback='1')
-                    print(f"Enable value for {folder_type}: {enable_value}")
-                    return enable_value == '0'  # 如果 Enable 為 0，則返回 True（表示需要刪除工作表）
-                print(f"Scan Area.ini not found for {folder_type}")
-                return False  # 如果文件不存在，默認不刪除工作表
-
-            # 在 update_excel_file 方法中
-            default_should_delete = check_scan_area_ini('Default')
-            default1_should_delete = check_scan_area_ini(self.default1_actual_name)
-
-            print(f"Should delete Default Surface sheet: {default_should_delete}")
-            print(f"Should delete Default1 Surface sheet: {default1_should_delete}")
-
-            # Track empty sheets
-            empty_sheets = []
 
             for folder_type, mappings in all_mappings.items():
                 for sheet_name, sheet_mappings in mappings.items():
                     if sheet_name in wb.sheetnames:
                         ws = wb[sheet_name]
-                        sheet_updated = False
                         for var, cell in sheet_mappings.items():
-                            if var in self.variables.get(folder_type, {}):
-                                value = self.variables[folder_type][var]
-                            elif var in self.variables:
-                                value = self.variables[var]
-                            else:
+                            if not self.parameters.contains(folder_type, var):
                                 continue
-                            
-                            try:
-                                value = float(value)
-                            except ValueError:
-                                pass
+
+                            value = excel_cell_value(self.parameters.get(folder_type, var))
                             print(f"Updating cell {cell} in sheet {sheet_name} with value {value}")
                             ws[cell] = value
-                            sheet_updated = True
-                        
-                        if not sheet_updated:
-                            empty_sheets.append(sheet_name)
-
-            # Remove empty sheets
-            for sheet_name in empty_sheets:
-                if sheet_name in wb.sheetnames:
-                    print(f"Removing empty sheet: {sheet_name}")
-                    wb.remove(wb[sheet_name])
-
-            # 更新 Excel 後，根據檢查結果刪除工作表
-            if default_should_delete and 'Surface' in wb.sheetnames:
-                wb.remove(wb['Surface'])
-                print("工作表 'Surface' 已被刪除，因為 Default 的 Scan Area.ini 中 Enable=0")
-            else:
-                print("工作表 'Surface' 未被刪除")
-
-            if default1_should_delete and 'Surface_Multi' in wb.sheetnames:
-                wb.remove(wb['Surface_Multi'])
-                print("工作表 'Surface_Multi' 已被刪除，因為 Default1 的 Scan Area.ini 中 Enable=0")
-            else:
-                print("工作表 'Surface_Multi' 未被刪除")
 
-            for sheet_name in ["Pad device", "Bump device", "Pad device_Multi", "Bump device_Multi"]:
+            for sheet_name in DEVICE_SHEETS:
                 if sheet_name in wb.sheetnames:
-                    ws = wb[sheet_name]
-                    for row in range(1, ws.max_row + 1): 
-                        current_cell = ws.cell(row=row, column=6)  # Column F
-                        
-                        if row < ws.max_row:
-                            next_cell = ws.cell(row=row+1, column=6)  # Next row's Column F
-                        else:
-                            next_cell = None  
-                        
-                        # Check if the cell is part of a merged range
-                        is_merged = any(current_cell.coordinate in merged_range for merged_range in ws.merged_cells.ranges)
-                        
-                        if not is_merged:  # Only hide if not part of a merged cell
-                            if current_cell.value is None:
-                                # If F column is empty, hide the row
-                                ws.row_dimensions[row].hidden = True
-                            elif current_cell.value == "Setup File Value" and (next_cell is None or next_cell.value is None):
-                                # If current cell is "Setup File Value" and next cell is empty or doesn't exist, hide the current row
-                                ws.row_dimensions[row].hidden = True
-                            else:
-                                # Otherwise, make sure the row is visible
-                                ws.row_dimensions[row].hidden = False
-                        else:
-                            # If the cell is part of a merged range, make sure the row is visible
-                            ws.row_dimensions[row].hidden = False
-                    
-                    if sheet_name in ["Bump device", "Bump device_Multi"]:
-                        if all(ws.row_dimensions[row].hidden for row in range(3, 59)):
-                            ws.row_dimensions[2].hidden = True
-                        
-                        if all(ws.row_dimensions[row].hidden for row in range(61, 117)):
-                            ws.row_dimensions[60].hidden = True
-                        
-                        if all(ws.row_dimensions[row].hidden for row in range(119, 175)):
-                            ws.row_dimensions[118].hidden = True
-                        
-                        if all(ws.row_dimensions[row].hidden for row in range(177, 233)):
-                            ws.row_dimensions[176].hidden = True
-                        
-                        if all(ws.row_dimensions[row].hidden for row in range(235, 291)):
-                            ws.row_dimensions[234].hidden = True
-                    
-                    if sheet_name in ["Pad device", "Pad device_Multi"]:
-                        if all(ws.row_dimensions[row].hidden for row in range(3, 25)):
-                            ws.row_dimensions[2].hidden = True
-
-                        if all(ws.row_dimensions[row].hidden for row in range(27, 49)):
-                            ws.row_dimensions[26].hidden = True
-
-                        if all(ws.row_dimensions[row].hidden for row in range(51, 73)):
-                            ws.row_dimensions[50].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(75, 97)):
-                            ws.row_dimensions[74].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(99, 121)):
-                            ws.row_dimensions[98].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(124, 148)):
-                            ws.row_dimensions[123].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(150, 174)):
-                            ws.row_dimensions[149].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(176, 200)):
-                            ws.row_dimensions[175].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(202, 226)):
-                            ws.row_dimensions[201].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(228, 252)):
-                            ws.row_dimensions[227].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(255, 282)):
-                            ws.row_dimensions[254].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(284, 311)):
-                            ws.row_dimensions[283].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(313, 340)):
-                            ws.row_dimensions[312].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(342, 369)):
-                            ws.row_dimensions[341].hidden = True 
-
-                        if all(ws.row_dimensions[row].hidden for row in range(371, 398)):
-                            ws.row_dimensions[370].hidden = True 
-
+                    hide_empty_device_rows(wb[sheet_name], sheet_name, self.check_cancelled)
                 else:
                     print(f"Sheet '{sheet_name}' not found, skipping.")
 
-                sheets_to_check = ['Surface', 'Pad device', 'Bump device']
-                multi_sheets_to_check = ['Surface_Multi', 'Pad device_Multi', 'Bump device_Multi']
-
-                if all(sheet not in wb.sheetnames for sheet in sheets_to_check):
-                    if 'Check list' in wb.sheetnames:
-                        print("刪除 'Check list' 工作表，因為 'Surface'、'Pad device' 和 'Bump device' 都已被刪除")
-                        wb.remove(wb['Check list'])
-
-                if all(sheet not in wb.sheetnames for sheet in multi_sheets_to_check):
-                    if 'Check list_Multi' in wb.sheetnames:
-                        print("刪除 'Check list_Multi' 工作表，因為 'Surface_Multi'、'Pad device_Multi' 和 'Bump device_Multi' 都已被刪除")
-                        wb.remove(wb['Check list_Multi'])
-
                 # Protect updated cells and enable sheet protection
                 updated_cells = set()
 
@@ -1354,62 +3572,91 @@ class FileProcessor(QThread):
                         if sheet_name in wb.sheetnames:
                             ws = wb[sheet_name]
                             for var, cell in sheet_mappings.items():
-                                if var in self.variables.get(folder_type, {}) or var in self.variables:
-                                    value = self.variables.get(folder_type, {}).get(var) or self.variables.get(var)
-                                    try:
-                                        value = float(value)
-                                    except ValueError:
-                                        pass
+                                if self.parameters.contains(folder_type, var):
+                                    value = excel_cell_value(self.parameters.lookup(folder_type, var))
                                     print(f"Updating cell {cell} in sheet {sheet_name} with value {value}")
                                     ws[cell] = value
                                     updated_cells.add((sheet_name, cell))
 
+            # 所有儲存格共用同一組 Protection 物件，不為每個儲存格各建立一個
+            locked_protection = openpyxl.styles.Protection(locked=True)
+            unlocked_protection = openpyxl.styles.Protection(locked=False)
+
             # Protect updated cells and enable sheet protection
             for sheet_name, cell in updated_cells:
                 ws = wb[sheet_name]
-                ws[cell].protection = openpyxl.styles.Protection(locked=True)
+                ws[cell].protection = locked_protection
 
-            for ws in wb.worksheets:
+            for sheet_index, ws in enumerate(wb.worksheets):
+                self.report_progress(60 + 30 * sheet_index / len(wb.worksheets))
                 if ws.title not in ['Check list', 'Check list_Multi', 'Snapshot', 'Die shift check', 'Trial run']:
                     for row in ws.iter_rows(min_col=1, max_col=7):  # 從A列到G列
+                        self.check_cancelled()
                         for cell in row:
-                            cell.protection = openpyxl.styles.Protection(locked=True)
+                            cell.protection = locked_protection
                     
                     # 對於這些工作表,其他列保持解鎖狀態
                     for row in ws.iter_rows(min_col=8): 
+                        self.check_cancelled()
                         for cell in row:
-                            cell.protection = openpyxl.styles.Protection(locked=False)
+                            cell.protection = unlocked_protection
 
                 else:
                     for row in ws.iter_rows():
+                        self.check_cancelled()
                         for cell in row:
                             if (ws.title, cell.coordinate) not in updated_cells:
                                 if ws.title in ['Check list', 'Check list_Multi']:
                                     if cell.column == 2:  # 這裡鎖定 B 列
-                                        cell.protection = openpyxl.styles.Protection(locked=True)
+                                        cell.protection = locked_protection
                                     elif cell.coordinate in ['C26', 'C27', 'C28', 'C32', 'C33', 'C34', 'C40', 'C41', 'C49', 'C51', 'C52', 
                                                              'C53', 'C54', 'C55' , 'C58', 'C59', 'C62', 'C63', 'E4', 'F4', 'E5', 'F5', 'E7', 'F7', 'E8', 'F8',
                                                                'E16', 'F16', 'E17', 'F17', 'E18', 'F18', 'E19', 'F19', 'E20', 'F20', 'E21', 'F21', 'E23', 'F23',
                                                                  'E24', 'F24', 'E25', 'F25', 'E26', 'F26', 'E27', 'F27', 'E28', 'F28', 'E29', 'F29', 'E30' 'F30',
                                                                    'E31', 'F31', 'E35', 'F35', 'E36', 'F36', 'E37', 'F37', 'E38', 'F38', 'E42', 'F42', 'E43', 'F43',
                                                                      'E44', 'F44', 'E45', 'F45']:
-                                        cell.protection = openpyxl.styles.Protection(locked=True)
+                                        cell.protection = locked_protection
                                     elif cell.column == 4 and cell.coordinate in ['D4', 'D5', 'D7', 'D8', 'D16', 'D17', 'D18', 'D19', 'D20', 'D21', 'D23',
                                                                                    'D24', 'D25', 'D26', 'D27', 'D28', 'D30', 'D31', 'D35', 'D36', 'D37', 'D38','D42', 'D43', 'D44', 'D45', 'D64']:
-                                        cell.protection = openpyxl.styles.Protection(locked=True)
+                                        cell.protection = locked_protection
                                     else:
-                                        cell.protection = openpyxl.styles.Protection(locked=False)
+                                        cell.protection = unlocked_protection
                                 else:
-                                    cell.protection = openpyxl.styles.Protection(locked=False)
+                                    cell.protection = unlocked_protection
                 ws.protection.sheet = True
                 ws.protection.password = 'Ardentec'
                 ws.protection.enable()
 
+            # 標示超出規格或離群的參數
+            if self.spec_flags:
+                highlight_spec_flags(wb, self.spec_flags)
+
+            # 計算範本中的公式並寫入快取值，不需 Excel 重新計算也能讀取通過／不通過的結果
+            formula_evaluator = CheckListFormulaEvaluator(wb)
+            formula_values = formula_evaluator.evaluate_all()
+            self.formula_summary = formula_evaluator.summary()
+            self.run_stats['formulas'] = {key: value for key, value in self.formula_summary.items() if key != 'failed_cells'}
+            if formula_evaluator.unsupported:
+                unsupported = {f"{sheet_name}!{coordinate}": reason for (sheet_name, coordinate), reason in formula_evaluator.unsupported.items()}
+                print(f"Formulas not evaluated: {json.dumps(unsupported, ensure_ascii=False)}")
+
+            if self.fingerprint is None:
+                self.fingerprint = self.compute_fingerprint()
+            stamp_check_list(wb, self.fingerprint, self.formula_summary if self.formula_summary['formulas'] else None)
+
             # Save the workbook after all updates
-            wb.save(output_path)
+            self.check_cancelled()
+            self.report_progress(95)
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            data = buffer.getvalue()
+            self.output_storage.write_bytes(new_file_name, store_formula_values(data, formula_values) if formula_values else data)
             print(f"Excel file updated and protected successfully: {output_path}")
                         
+        except ProcessingCancelled:
+            raise  # 取消不記錄為 Excel 錯誤
         except Exception as e:
+            self.excel_error = str(e)
             print(f"An error occurred while updating the Excel file: {str(e)}")
             print("Traceback:")
             print(traceback.format_exc()) 
@@ -1417,15 +3664,182 @@ class FileProcessor(QThread):
             if 'wb' in locals():
                 wb.close()
 
-    def run(self):
+    @contextlib.contextmanager
+    def stage(self, name):
+        # 記錄每個處理階段的耗時（秒），tracemalloc 追蹤中時也記錄該階段的記憶體峰值；每個階段開始前檢查是否已取消
+        self.check_cancelled()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start_time = datetime.datetime.now()
+        try:
+            yield
+        finally:
+            self.stage_timings[name] = round((datetime.datetime.now() - start_time).total_seconds(), 4)
+            if tracing:
+                self.stage_peaks[name] = tracemalloc.get_traced_memory()[1]
+
+    def compute_fingerprint(self):
+        # Recipe 內容、範本、產生邏輯與規格標示相同時，產生的 check list 也相同
+        parts = [CHECK_LIST_ENGINE_VERSION, MAPPINGS_DIGEST, self.variables['AVI_recipe_name'],
+                 self.recipe_tree.fingerprint(self.content_hash),
+                 template_digest(self.load_template())]
+        if self.spec_checker is not None:
+            parts.append(self.spec_checker.digest())
+        elif self.spec_flags:
+            parts.append(repr(sorted(self.spec_flags.items(), key=repr)))
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def reuse_previous_output(self):
+        # 已有相同指紋的 check list 時直接沿用（在其他資料夾找到時複製到輸出資料夾），不重新產生
+        with ThreadPoolExecutor(max_workers=MAX_IO_WORKERS) as io_executor:
+            self.recipe_tree.build_index(io_executor)
+            if self.content_hash:
+                self.recipe_tree.prefetch(io_executor)
+        self.fingerprint = self.compute_fingerprint()
+
+        file_name = check_list_file_name(self.avi_recipe_path)
+        output_path = os.path.join(self.output_dir, file_name)
+        for folder in [self.output_dir] + self.reuse_dirs:
+            candidate = os.path.join(folder, file_name)
+            if read_check_list_fingerprint(candidate) != self.fingerprint:
+                continue
+            if os.path.abspath(candidate) != os.path.abspath(output_path):
+                os.makedirs(self.output_dir, exist_ok=True)
+                shutil.copy2(candidate, output_path)
+            self.output_path = output_path
+            self.reused_output = candidate
+            self.formula_summary = read_check_list_formula_results(candidate)
+            self.run_stats['reused_output'] = candidate
+            print(f"Recipe unchanged, reusing check list: {candidate}")
+            return True
+        return False
+
+    def generate(self):
+        # trace_memory 時以 tracemalloc 記錄各階段的記憶體峰值（已在追蹤中時沿用）
+        start_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        profiler = RecipeProfiler() if self.profile else None
+        if profiler is not None:
+            profiler.start()
+        try:
+            if self.reuse_output:
+                with self.stage('fingerprint'):
+                    if self.reuse_previous_output():
+                        return self.output_path
+            with self.stage('parse'):
+                self.process_files()
+            if self.spec_checker is not None and self.spec_flags is None:
+                with self.stage('spec_check'):
+                    self.spec_flags = self.spec_checker.check([self.parameters])[0]
+            with self.stage('excel'):
+                self.update_excel_file()
+            if self.history_dir and self.excel_error is None:
+                with self.stage('history'):
+                    self.record_history()
+            return self.output_path
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                self.save_profile(profiler)
+            if start_tracing:
+                tracemalloc.stop()
+
+    def save_profile(self, profiler):
+        # 產生失敗時也寫入分析結果；寫入失敗不影響 check list 的產生
+        base_path = os.path.join(self.output_dir, os.path.splitext(check_list_file_name(self.avi_recipe_path))[0])
         try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.profile_report = profiler.report(profiler.save(base_path))
+            print(self.profile_report)
+        except Exception as e:
+            print(f"寫入效能分析結果時發生錯誤: {e}")
+
+    def plan_check_list(self):
+        """預檢：解析 Recipe 並決定 check list 會寫入的儲存格、刪除的工作表與隱藏的列，不載入也不寫入活頁簿。
+
+        寫入與隱藏列在 TemplateSheetLayout 上依 update_excel_file 的順序模擬，結果與實際產生的 check list 相同；
+        寫入合併儲存格等會讓產生失敗的問題列在 errors。
+        """
+        with self.stage('parse'):
             self.process_files()
-            self.update_excel_file()
+        with self.stage('plan'):
+            disabled_surfaces = {folder_type: self.check_scan_area_ini(folder_type) for folder_type in RecipeRecord.FOLDER_TYPES}
+            template_bytes = self.load_template()
+            sheet_names = template_sheet_names(template_bytes)
+            surviving_sheets = surviving_check_list_sheets(sheet_names, self.parameters, disabled_surfaces)
+            layouts = {sheet_name: layout.copy() for sheet_name, layout in template_layouts(template_bytes).items()
+                       if sheet_name in surviving_sheets}
+
+            targets = [(sheet_name, cell, folder_type, var)
+                       for folder_type, mappings in ALL_MAPPINGS.items()
+                       for sheet_name, sheet_mappings in mappings.items() if sheet_name in layouts
+                       for var, cell in sheet_mappings.items() if self.parameters.contains(folder_type, var)]
+
+            def write_cells(resolve):
+                written = {}
+                for sheet_name, cell, folder_type, var in targets:
+                    value = excel_cell_value(resolve(folder_type, var))
+                    layouts[sheet_name][cell] = value
+                    written[(sheet_name, cell)] = (folder_type, var, value)
+                return written
+
+            # 與 update_excel_file 相同：先以 get 寫入，之後每處理一個 device 工作表就再以 lookup 寫入一次
+            written = write_cells(self.parameters.get)
+            for sheet_name in DEVICE_SHEETS:
+                if sheet_name in layouts:
+                    hide_empty_device_rows(layouts[sheet_name], sheet_name)
+                written = write_cells(self.parameters.lookup)
+
+            errors = [f"{sheet_name}!{cell} 位於合併儲存格中，無法寫入 {var}"
+                      for (sheet_name, cell), (folder_type, var, value) in written.items() if layouts[sheet_name].is_merged_cell(cell)]
+        return {
+            'recipe': self.variables['AVI_recipe_name'],
+            'path': self.avi_recipe_path,
+            'output': check_list_file_name(self.avi_recipe_path),
+            'recipe_file_count': self.variables.get('Recipe_file_count'),
+            'sheets': surviving_sheets,
+            'deleted_sheets': [sheet_name for sheet_name in sheet_names if sheet_name not in surviving_sheets],
+            'cells': [{'sheet': sheet_name, 'cell': cell, 'folder': folder_type, 'parameter': var, 'value': value}
+                      for (sheet_name, cell), (folder_type, var, value) in written.items()],
+            'hidden_rows': {sheet_name: layouts[sheet_name].hidden_rows() for sheet_name in DEVICE_SHEETS if sheet_name in layouts},
+            'warnings': self.warning_snapshot()[0],
+            'errors': errors,
+            'stage_timings': self.stage_timings,
+        }
+
+    def record_history(self):
+        # 寫入參數歷史失敗時不影響 check list 的產生
+        try:
+            ParameterHistory(self.history_dir).append(self.parameters, self.fingerprint)
+        except Exception as e:
+            print(f"寫入參數歷史時發生錯誤: {e}")
+
+    def peak_memory(self):
+        return max(self.stage_peaks.values(), default=0)
+
+    def run(self):
+        try:
+            self.generate()
             
             print("Result：")
-            print(json.dumps(self.variables, indent=2))
+            if self.low_memory and self.parameters is not None:
+                print(json.dumps(self.parameters.to_variables(), indent=2))
+            else:
+                print(json.dumps(self.variables, indent=2))
+            self.run_stats['ini_parses'] = self.ini_memo.parse_count
+            self.run_stats['duplicate_parses_avoided'] = self.ini_memo.duplicates_avoided
+            self.run_stats['parse_cache'] = PARSE_CACHE.stats()
+            print(f"Stage timings: {json.dumps(self.stage_timings)}")
+            if self.stage_peaks:
+                print(f"Stage peak memory (bytes): {json.dumps(self.stage_peaks)}")
+            print(f"Run summary: {json.dumps(self.run_stats)}")
             
             self.processing_completed.emit()
+        except ProcessingCancelled:
+            print("Processing cancelled")
+            self.processing_cancelled.emit()
         except Exception as e:
             error_message = str(e)
             if "Setup1\\Recipes\\file count >=" in error_message:
@@ -1435,23 +3849,1625 @@ class FileProcessor(QThread):
             else:
                 self.error_occurred.emit(str(e))
 
+# 匯出時每筆資料都帶有的 Recipe 識別欄位
+EXPORT_IDENTITY_FIELDS = ['AVI_recipe_name', 'AVI_recipe_EQP_ID', 'AVI_recipe_group_ID']
+
+# RTP 參數名稱：RTP_<Bump_Map_N|Scan_Area>_<演算法>_<參數>
+RTP_KEY_PATTERN = re.compile(r'RTP_(Bump_Map_\d+|Scan_Area)_(Uniform_Surface_on_SB|Surface_on_SB|Solder_Bump|PMI_Advanced|Probe_Mark_Inspection|Surface)_(.+)')
+
+def is_recipe_level_key(key):
+    # 不屬於 Default/Default1 資料夾、而是整個 Recipe 共用的參數
+    return key in EXPORT_IDENTITY_FIELDS or key == 'Recipe_file_count' or key.startswith('WaferMapRecipe_')
+
+def mapped_parameter_keys():
+    # 所有對應到 check list 儲存格的參數名稱，依工作表與儲存格順序排列
+    mappings = [CHECK_LIST_MAPPINGS, SURFACE_MAPPINGS, PAD_DEVICE_MAPPINGS, BUMP_DEVICE_MAPPINGS]
+    return list(dict.fromkeys(key for sheet_mappings in mappings for key in sheet_mappings))
+
+def flat_parameter_keys():
+    # 每個 Recipe 一筆時的參數欄位（不含識別欄位）：Recipe 層級參數在前，接著依序為各資料夾的參數
+    mapped_keys = mapped_parameter_keys()
+    recipe_keys = [key for key in mapped_keys if is_recipe_level_key(key) and key not in EXPORT_IDENTITY_FIELDS]
+    folder_keys = [f'{folder_type}.{key}' for folder_type in RecipeRecord.FOLDER_TYPES for key in mapped_keys if not is_recipe_level_key(key)]
+    return recipe_keys + folder_keys
+
+def expand_recipe_paths(paths):
+    # 逐一產生 Recipe 路徑；若指定的資料夾本身不是 Recipe，則展開其中的 Recipe 資料夾與壓縮檔
+    def is_recipe(path):
+        return is_recipe_archive(path) or os.path.isdir(os.path.join(path, 'Setup1'))
+
+    for path in paths:
+        if is_recipe(path):
+            yield path
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                child = os.path.join(path, name)
+                if is_recipe(child):
+                    yield child
+        else:
+            print(f"警告: 不是 Recipe 資料夾或壓縮檔: {path}", file=sys.stderr)
+
+def parse_recipe_record(recipe_path):
+    # 只解析 Recipe，不產生 Excel
+    processor = FileProcessor(recipe_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_files()
+    return processor.parameters
+
+def flatten_recipe_record(record):
+    row = dict(record.recipe.items())
+    for folder_type in RecipeRecord.FOLDER_TYPES:
+        for key, value in record.folder(folder_type).items():
+            row[f'{folder_type}.{key}'] = value
+    return row
+
+def iter_zone_rows(record):
+    # 每個資料夾中每個區域/演算法一筆
+    identity = {field: record.recipe.get(field) for field in EXPORT_IDENTITY_FIELDS}
+    for folder_type in RecipeRecord.FOLDER_TYPES:
+        rows = {}
+        for key, value in record.folder(folder_type).items():
+            match = RTP_KEY_PATTERN.fullmatch(key)
+            if match:
+                zone, algorithm, parameter = match.groups()
+                row = rows.setdefault((zone, algorithm), dict(identity, folder=folder_type, zone=zone, algorithm=algorithm))
+                row[parameter] = value
+        yield from rows.values()
+
+class ParameterExporter:
+    """將解析結果以串流方式逐筆寫成 JSON Lines 或 CSV。
+
+    每個 Recipe 寫完即可丟棄，記憶體用量與 Recipe 數量無關。granularity 為 'recipe' 時
+    每個 Recipe 一筆（資料夾參數以 Default.<參數> 命名），為 'zone' 時每個區域/演算法一筆。
+    CSV 的欄位固定為 check list 有對應儲存格的參數；JSON Lines 則保留所有解析出的參數。
+    """
+
+    FORMATS = ('jsonl', 'csv')
+    GRANULARITIES = ('recipe', 'zone')
+
+    def __init__(self, path, fmt=None, granularity='recipe'):
+        self.path = path
+        self.fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        if self.fmt not in self.FORMATS:
+            raise ValueError(f"不支援的匯出格式: {self.fmt}")
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"不支援的匯出粒度: {granularity}")
+        self.granularity = granularity
+        self.recipe_count = 0
+        self.row_count = 0
+        self._file = None
+        self._writer = None
+
+    def columns(self):
+        if self.granularity == 'recipe':
+            return EXPORT_IDENTITY_FIELDS + flat_parameter_keys()
+        mapped_keys = mapped_parameter_keys()
+        parameters = [RTP_KEY_PATTERN.fullmatch(key).group(3) for key in mapped_keys if RTP_KEY_PATTERN.fullmatch(key)]
+        return EXPORT_IDENTITY_FIELDS + ['folder', 'zone', 'algorithm'] + list(dict.fromkeys(parameters))
+
+    def __enter__(self):
+        if self.fmt == 'csv':
+            self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns(), restval='', extrasaction='ignore')
+            self._writer.writeheader()
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._file.close()
+
+    def _write_row(self, row):
+        if self.fmt == 'csv':
+            self._writer.writerow({key: '' if value is None else format_parameter_value(value) for key, value in row.items()})
+        else:
+            # NaN/Infinity 不是合法的 JSON，以原本的字串輸出
+            row = {key: format_parameter_value(value) if isinstance(value, float) and not math.isfinite(value) else value
+                   for key, value in row.items()}
+            self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.row_count += 1
+
+    def write(self, record):
+        rows = [flatten_recipe_record(record)] if self.granularity == 'recipe' else iter_zone_rows(record)
+        for row in rows:
+            self._write_row(row)
+        self.recipe_count += 1
+
+def export_recipes(recipe_paths, output_path, fmt=None, granularity='recipe'):
+    start_time = datetime.datetime.now()
+    failures = 0
+    with ParameterExporter(output_path, fmt, granularity) as exporter:
+        for recipe_path in expand_recipe_paths(recipe_paths):
+            try:
+                exporter.write(parse_recipe_record(recipe_path))
+            except Exception as e:
+                failures += 1
+                print(f"匯出失敗: {recipe_path}: {e}", file=sys.stderr)
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Exported {exporter.recipe_count} recipes ({exporter.row_count} rows) to {output_path} in {elapsed:.2f}s, {failures} failed")
+    return failures
+
+# 彙整活頁簿每列開頭的參數欄位，之後每個 Recipe 一欄
+SUMMARY_PARAMETER_COLUMNS = ['Folder', 'Parameter', 'Match']
+
+def summary_sheet_title(group):
+    title = re.sub(r'[\[\]:*?/\\]', '_', group or 'Ungrouped')
+    return title[:31]
+
+class RecipeSummaryWriter:
+    """多個 Recipe 的參數對照活頁簿，以 openpyxl write-only 模式串流寫出。
+
+    每個 AVI_recipe_group_ID 一個工作表，每個 check list 參數一列、每個 Recipe 一欄；
+    Match 欄標示各 Recipe 的值是否完全相同，方便篩選出機台之間的差異。
+    每個 Recipe 只保留與列順序對齊的值，不建立儲存格物件，數百個 Recipe 也不會耗用大量記憶體。
+    """
+
+    def __init__(self, path, group=None, include_empty=False):
+        self.path = path
+        self.group = group
+        self.include_empty = include_empty
+        self.keys = ['AVI_recipe_EQP_ID'] + flat_parameter_keys()
+        self.columns = {}  # 群組 -> [(Recipe 名稱, 依 self.keys 排列的值)]
+        self.recipe_count = 0
+
+    def add(self, row):
+        # row 為攤平後的參數（flatten_recipe_record 或 --export 匯出的 JSON Lines）
+        group = row.get('AVI_recipe_group_ID') or ''
+        if self.group is not None and group != self.group:
+            return False
+        self.columns.setdefault(group, []).append((row.get('AVI_recipe_name'), tuple(row.get(key) for key in self.keys)))
+        self.recipe_count += 1
+        return True
+
+    def parameter_label(self, key):
+        folder_type, _, parameter = key.partition('.')
+        if folder_type in RecipeRecord.FOLDER_TYPES and parameter:
+            return folder_type, parameter
+        return 'Recipe', key
+
+    def _write_sheet(self, wb, group, recipes):
+        ws = wb.create_sheet(title=summary_sheet_title(group))
+        # 凍結標題列與參數欄位，參數欄位可篩選
+        ws.freeze_panes = f'{openpyxl.utils.get_column_letter(len(SUMMARY_PARAMETER_COLUMNS) + 1)}2'
+        ws.column_dimensions['A'].width = 10
+        ws.column_dimensions['B'].width = 60
+        ws.column_dimensions['C'].width = 8
+        for column in range(len(SUMMARY_PARAMETER_COLUMNS) + 1, len(SUMMARY_PARAMETER_COLUMNS) + len(recipes) + 1):
+            ws.column_dimensions[openpyxl.utils.get_column_letter(column)].width = 22
+
+        header = SUMMARY_PARAMETER_COLUMNS + [name for name, _ in recipes]
+        header_cells = []
+        for title in header:
+            cell = openpyxl.cell.WriteOnlyCell(ws, value=title)
+            cell.font = openpyxl.styles.Font(bold=True)
+            header_cells.append(cell)
+        ws.append(header_cells)
+        row_count = 1
+        for index, key in enumerate(self.keys):
+            values = [recipe_values[index] for _, recipe_values in recipes]
+            present = [value for value in values if value is not None]
+            if not present and not self.include_empty:
+                continue
+            same = len(present) == len(values) and len({format_parameter_value(value) for value in present}) <= 1
+            folder_type, parameter = self.parameter_label(key)
+            ws.append([folder_type, parameter, 'Same' if same else 'Diff'] +
+                      [None if value is None else excel_cell_value(value) for value in values])
+            row_count += 1
+        ws.auto_filter.ref = f'A1:{openpyxl.utils.get_column_letter(len(header))}{row_count}'
+        return row_count - 1
+
+    def save(self):
+        wb = openpyxl.Workbook(write_only=True)
+        for group in sorted(self.columns):
+            self._write_sheet(wb, group, self.columns[group])
+        if not self.columns:
+            wb.create_sheet(title='Summary')
+        wb.save(self.path)
+
+def summarize_recipes(paths, output_path, group=None, include_empty=False):
+    # 由 Recipe 資料夾／壓縮檔，或 --export 匯出的 .jsonl（每個 Recipe 一筆）產生參數對照活頁簿
+    start_time = datetime.datetime.now()
+    failures = 0
+    writer = RecipeSummaryWriter(output_path, group, include_empty)
+    for path in paths:
+        if path.lower().endswith('.jsonl') and os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        writer.add(json.loads(line))
+            continue
+        for recipe_path in expand_recipe_paths([path]):
+            try:
+                writer.add(flatten_recipe_record(parse_recipe_record(recipe_path)))
+            except Exception as e:
+                failures += 1
+                print(f"解析失敗: {recipe_path}: {e}", file=sys.stderr)
+    writer.save()
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Summarized {writer.recipe_count} recipes in {len(writer.columns)} groups to {output_path} in {elapsed:.2f}s, {failures} failed")
+    return failures
+
+# 群組一致性檢查允許各機台不同的參數清單，預設放在執行檔旁
+GROUP_WHITELIST_FILENAME = 'AVI Check list group whitelist.json'
+
+GROUP_CHECK_COLUMNS = ['Folder', 'Block', 'Parameter']
+GROUP_CHECK_MISMATCH_FILL = 'FFFF9999'
+
+def parameter_block_name(key):
+    # 攤平後參數所屬的區塊：RTP 參數以區域/演算法分區塊，其他參數以來源設定（名稱第一段）分區塊
+    folder_type, _, parameter = key.partition('.')
+    if folder_type not in RecipeRecord.FOLDER_TYPES or not parameter:
+        folder_type, parameter = 'Recipe', key
+    match = RTP_KEY_PATTERN.fullmatch(parameter)
+    if match:
+        return folder_type, f"{match.group(1)}/{match.group(2)}", parameter
+    return folder_type, parameter.split('_', 1)[0], parameter
+
+class GroupConsistencyChecker:
+    """同一 AVI_recipe_group_ID 的各機台 Recipe 與 golden Recipe 比對，列出不一致的參數。
+
+    白名單為 JSON，groups 以 AVI_recipe_group_ID 分組（'*' 適用所有群組），每個群組為允許各機台不同的參數名稱，
+    可使用萬用字元，並可比對攤平後的名稱（Default.<參數>）或參數名稱本身。
+    每個 Recipe 先依區塊計算雜湊，只有雜湊與 golden 不同的區塊才逐一比對參數，整個群組的比對不需要逐值進行。
+    未指定 golden 時，選擇各區塊與最多其他 Recipe 相同的 Recipe。
+    """
+
+    def __init__(self, whitelist=None):
+        self.whitelist = whitelist or {}
+        self._patterns = {
+            group: re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+            for group, patterns in self.whitelist.get('groups', {}).items() if patterns
+        }
+        self.members = {}  # 群組 -> {Recipe 名稱: {區塊: {攤平後參數: 值字串}}}
+        self.hashes = {}  # 群組 -> {Recipe 名稱: {區塊: 雜湊}}
+        self.skipped = 0
+        self._key_blocks = {}  # (群組, 攤平後參數) -> (資料夾, 區塊)；白名單中的參數為 None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls(json.load(file))
+
+    def is_whitelisted(self, group, key):
+        parameter = parameter_block_name(key)[2]
+        patterns = [self._patterns.get(group_name) for group_name in (group, '*')]
+        return any(pattern.match(key) or pattern.match(parameter) for pattern in patterns if pattern is not None)
+
+    def key_block(self, group, key):
+        # 同一群組的 Recipe 參數名稱大多相同，區塊與白名單判斷只做一次
+        try:
+            return self._key_blocks[(group, key)]
+        except KeyError:
+            block = None if self.is_whitelisted(group, key) else parameter_block_name(key)[:2]
+            self._key_blocks[(group, key)] = block
+            return block
+
+    def add(self, row):
+        # row 為攤平後的參數（flatten_recipe_record 或 --export 匯出的 JSON Lines）
+        group = row.get('AVI_recipe_group_ID') or ''
+        blocks = {}
+        for key, value in row.items():
+            if key in EXPORT_IDENTITY_FIELDS or value is None:
+                continue
+            block = self.key_block(group, key)
+            if block is None:
+                self.skipped += 1
+                continue
+            blocks.setdefault(block, {})[key] = format_parameter_value(value)
+        name = row.get('AVI_recipe_name')
+        self.members.setdefault(group, {})[name] = blocks
+        self.hashes.setdefault(group, {})[name] = {
+            block: hashlib.sha256(json.dumps(sorted(values.items())).encode('utf-8')).hexdigest()
+            for block, values in blocks.items()
+        }
+
+    def pick_golden(self, group):
+        # 每個區塊的雜湊有幾個 Recipe 相同，加總最多者最接近群組的共同設定；同分時取名稱排序最前者
+        hashes = self.hashes[group]
+        counts = {}
+        for block_hashes in hashes.values():
+            for item in block_hashes.items():
+                counts[item] = counts.get(item, 0) + 1
+        return min(hashes, key=lambda name: (-sum(counts[item] for item in hashes[name].items()), name))
+
+    def compare(self, group, golden):
+        """回傳 {Recipe 名稱: {(資料夾, 區塊, 攤平後參數): 值字串或 None}}，只含與 golden 不同的參數"""
+        golden_blocks = self.members[group][golden]
+        golden_hashes = self.hashes[group][golden]
+        mismatches = {}
+        for name, block_hashes in self.hashes[group].items():
+            if name == golden:
+                continue
+            blocks = self.members[group][name]
+            differences = {}
+            for block in set(block_hashes) | set(golden_hashes):
+                if block_hashes.get(block) == golden_hashes.get(block):
+                    continue
+                values = blocks.get(block, {})
+                expected = golden_blocks.get(block, {})
+                for key in set(values) | set(expected):
+                    if values.get(key) != expected.get(key):
+                        differences[block + (key,)] = values.get(key)
+            mismatches[name] = differences
+        return mismatches
+
+    def _write_sheet(self, wb, group, golden, mismatches):
+        ws = wb.create_sheet(title=summary_sheet_title(group))
+        names = [golden] + sorted(mismatches)
+        ws.freeze_panes = f'{openpyxl.utils.get_column_letter(len(GROUP_CHECK_COLUMNS) + 2)}2'
+        ws.column_dimensions['A'].width = 10
+        ws.column_dimensions['B'].width = 36
+        ws.column_dimensions['C'].width = 60
+        for column in range(len(GROUP_CHECK_COLUMNS) + 1, len(GROUP_CHECK_COLUMNS) + len(names) + 1):
+            ws.column_dimensions[openpyxl.utils.get_column_letter(column)].width = 22
+
+        header_cells = []
+        for title in GROUP_CHECK_COLUMNS + [f'{golden} (golden)'] + names[1:]:
+            cell = openpyxl.cell.WriteOnlyCell(ws, value=title)
+            cell.font = openpyxl.styles.Font(bold=True)
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        # 只列出至少一個 Recipe 與 golden 不同的參數；不同的儲存格以底色標示，缺少的參數留白
+        fill = openpyxl.styles.PatternFill(fill_type='solid', start_color=GROUP_CHECK_MISMATCH_FILL, end_color=GROUP_CHECK_MISMATCH_FILL)
+        order = {key: index for index, key in enumerate(flat_parameter_keys())}
+        keys = sorted({key for differences in mismatches.values() for key in differences},
+                      key=lambda key: (order.get(key[2], len(order)), key))
+        golden_values = {}
+        for block, values in self.members[group][golden].items():
+            for key, value in values.items():
+                golden_values[block + (key,)] = excel_cell_value(value)
+        for key in keys:
+            folder_type, block, parameter = key
+            row = [folder_type, block, parameter_block_name(parameter)[2], golden_values.get(key)]
+            for name in names[1:]:
+                differences = mismatches[name]
+                if key in differences:
+                    cell = openpyxl.cell.WriteOnlyCell(ws, value=None if differences[key] is None else excel_cell_value(differences[key]))
+                    cell.fill = fill
+                    row.append(cell)
+                else:
+                    row.append(golden_values.get(key))
+            ws.append(row)
+        ws.auto_filter.ref = f'A1:{openpyxl.utils.get_column_letter(len(GROUP_CHECK_COLUMNS) + len(names))}{len(keys) + 1}'
+
+    def check(self, report_path=None, golden=None):
+        """比對每個群組，回傳 {群組: (golden, mismatches)}；golden 為 Recipe 名稱，不在該群組中時自動選擇"""
+        results = {}
+        for group in sorted(self.members):
+            group_golden = golden if golden in self.members[group] else self.pick_golden(group)
+            results[group] = (group_golden, self.compare(group, group_golden))
+        if report_path:
+            wb = openpyxl.Workbook(write_only=True)
+            for group, (group_golden, mismatches) in results.items():
+                self._write_sheet(wb, group, group_golden, mismatches)
+            if not results:
+                wb.create_sheet(title='Summary')
+            wb.save(report_path)
+        return results
+
+def check_group_consistency(paths, report_path=None, golden=None, whitelist_path=None, group=None):
+    # 由 Recipe 資料夾／壓縮檔，或 --export 匯出的 .jsonl 比對每個群組；golden 可為 Recipe 名稱或 Recipe 路徑
+    start_time = datetime.datetime.now()
+    failures = 0
+    checker = GroupConsistencyChecker.from_file(whitelist_path) if whitelist_path else GroupConsistencyChecker()
+
+    def add(row):
+        if group is None or (row.get('AVI_recipe_group_ID') or '') == group:
+            checker.add(row)
+
+    if golden and (is_recipe_archive(golden) or os.path.isdir(golden)):
+        paths = [golden] + [path for path in paths if os.path.abspath(path) != os.path.abspath(golden)]
+        golden = recipe_display_name(os.path.basename(os.path.normpath(golden)))
+    for path in paths:
+        if path.lower().endswith('.jsonl') and os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        add(json.loads(line))
+            continue
+        for recipe_path in expand_recipe_paths([path]):
+            try:
+                add(flatten_recipe_record(parse_recipe_record(recipe_path)))
+            except Exception as e:
+                failures += 1
+                print(f"解析失敗: {recipe_path}: {e}", file=sys.stderr)
+
+    if golden and not any(golden in members for members in checker.members.values()):
+        print(f"警告: 找不到 golden Recipe {golden}，改為自動選擇", file=sys.stderr)
+    results = checker.check(report_path, golden)
+    recipe_count = 0
+    for group_name, (group_golden, mismatches) in results.items():
+        recipe_count += len(mismatches) + 1
+        print(f"Group {group_name or '(none)'}: golden {group_golden}, {len(mismatches)} compared")
+        for name, differences in sorted(mismatches.items()):
+            if differences:
+                failures += 1
+                blocks = sorted({f'{folder_type}:{block}' for folder_type, block, _ in differences})
+                print(f"  {name}: {len(differences)} parameters differ in {len(blocks)} blocks ({', '.join(blocks[:5])}"
+                      f"{' ...' if len(blocks) > 5 else ''})")
+            else:
+                print(f"  {name}: identical")
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Checked {recipe_count} recipes in {len(results)} groups in {elapsed:.2f}s "
+          f"({checker.skipped} whitelisted values ignored){f' to {report_path}' if report_path else ''}, {failures} failed")
+    return failures
+
+# 參數歷史的預設資料夾（每台電腦各自保存）
+HISTORY_DIRNAME = 'AVI Check list history'
+
+# 參數歷史中每筆紀錄都有的欄位；其他欄位是各參數（與 flatten_recipe_record 的欄位名稱相同）
+HISTORY_META_COLUMNS = ['timestamp', 'fingerprint'] + EXPORT_IDENTITY_FIELDS
+# 每個欄位區塊的參數數量、月份中自動合併前的區段數上限、合併鎖定檔視為中斷的秒數
+HISTORY_COLUMN_BLOCK = 1024
+HISTORY_MAX_SEGMENTS = 32
+HISTORY_LOCK_TIMEOUT = 600
+
+def default_history_dir():
+    return os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), HISTORY_DIRNAME)
+
+class ParameterHistory:
+    """每次產生 check list 時解析出的參數歷史，以 .npz 檔依月份分區保存。
+
+    每次產生寫入一個小區段檔（<YYYY-MM>/segment-*.npz），同一個月份的區段超過 HISTORY_MAX_SEGMENTS 個時
+    自動合併成一個檔案（compact）。區段內時間與識別欄位各為一欄；參數名稱只存一次（parameters），
+    參數值依參數順序每 HISTORY_COLUMN_BLOCK 個參數存成一個 參數 × 紀錄 的代碼陣列（codes_<n>）與
+    其對應的值（values_<n>）。查詢時只開啟時間範圍內的月份，並只載入含符合參數的欄位區塊。
+    """
+
+    def __init__(self, root):
+        if np is None:
+            raise RuntimeError('參數歷史需要 numpy')
+        self.root = root
+
+    def append(self, record, fingerprint=None, timestamp=None):
+        timestamp = timestamp or datetime.datetime.now()
+        flat = flatten_recipe_record(record)
+        columns = {'timestamp': np.array([timestamp.timestamp()]), 'fingerprint': np.array([fingerprint or ''])}
+        for field in EXPORT_IDENTITY_FIELDS:
+            value = flat.pop(field, None)
+            columns[field] = np.array(['' if value is None else str(value)])
+        parameters = list(flat)
+        values = ['' if value is None else str(value) for value in flat.values()]
+
+        def blocks():
+            for start in range(0, len(values), HISTORY_COLUMN_BLOCK):
+                block_values = values[start:start + HISTORY_COLUMN_BLOCK]
+                dictionary = {value: code for code, value in enumerate(dict.fromkeys(value for value in block_values if value != ''))}
+                yield np.array([[dictionary.get(value, -1)] for value in block_values], dtype=np.int32), list(dictionary)
+
+        month = timestamp.strftime('%Y-%m')
+        partition = os.path.join(self.root, month)
+        os.makedirs(partition, exist_ok=True)
+        file_name = f"segment-{timestamp:%Y%m%d%H%M%S%f}-{os.getpid()}-{threading.get_ident()}.npz"
+        self._write(os.path.join(partition, file_name), columns, parameters, blocks())
+        if len(self.segments(month)) > HISTORY_MAX_SEGMENTS:
+            self.compact_month(month)
+
+    def _write(self, path, columns, parameters, blocks):
+        # blocks 依參數順序產生 (代碼陣列, 值)：代碼為值的索引，-1 表示沒有值；
+        # 參數名稱與值以 JSON 編碼成 bytes，避免 numpy 固定寬度 unicode 陣列放大記憶體
+        columns = dict(columns)
+        columns['parameters'] = np.array(json.dumps(parameters).encode('utf-8'))
+        for block, (codes, values) in enumerate(blocks):
+            columns[f'codes_{block}'] = codes
+            columns[f'values_{block}'] = np.array(json.dumps(values).encode('utf-8'))
+        # 先寫入暫存檔再改名，查詢不會讀到寫到一半的檔案
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as file:
+            np.savez_compressed(file, **columns)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _block(data, block):
+        return data[f'codes_{block}'], json.loads(data[f'values_{block}'].item())
+
+    def partitions(self, start=None, end=None):
+        if not os.path.isdir(self.root):
+            return []
+        months = sorted(name for name in os.listdir(self.root) if re.fullmatch(r'\d{4}-\d{2}', name))
+        if start is not None:
+            months = [month for month in months if month >= start.strftime('%Y-%m')]
+        if end is not None:
+            months = [month for month in months if month <= end.strftime('%Y-%m')]
+        return months
+
+    def segments(self, month):
+        partition = os.path.join(self.root, month)
+        return sorted(os.path.join(partition, name) for name in os.listdir(partition) if name.endswith('.npz'))
+
+    def query(self, parameter, start=None, end=None, group=None):
+        """依時間排序回傳 start（含）到 end（不含）之間的參數值。
+
+        parameter 可以是萬用字元樣式（例如 *Contrast_Delta_-_Dark），每筆結果為一個字典，
+        包含 timestamp、parameter、value、fingerprint 與 Recipe 識別欄位；沒有值的紀錄不列出。
+        """
+        rows = []
+        # 同一批 Recipe 的參數名稱通常相同，符合的位置只計算一次
+        matches = {}
+        for month in self.partitions(start, end):
+            for path in self.segments(month):
+                try:
+                    data = np.load(path)
+                except FileNotFoundError:
+                    continue  # 已被合併
+                with data:
+                    timestamps = data['timestamp']
+                    selected = np.ones(len(timestamps), dtype=bool)
+                    if start is not None:
+                        selected &= timestamps >= start.timestamp()
+                    if end is not None:
+                        selected &= timestamps < end.timestamp()
+                    if group is not None:
+                        selected &= data['AVI_recipe_group_ID'] == group
+                    indexes = np.flatnonzero(selected)
+                    if not len(indexes):
+                        continue
+                    encoded = data['parameters'].item()
+                    if encoded not in matches:
+                        blocks = {}
+                        for position, name in enumerate(json.loads(encoded)):
+                            if fnmatch.fnmatchcase(name, parameter):
+                                blocks.setdefault(position // HISTORY_COLUMN_BLOCK, []).append((position % HISTORY_COLUMN_BLOCK, name))
+                        matches[encoded] = blocks
+                    blocks = matches[encoded]
+                    if not blocks:
+                        continue
+                    meta_columns = {column: data[column][indexes].tolist() for column in HISTORY_META_COLUMNS}
+                    meta = [dict(zip(meta_columns, row_values)) for row_values in zip(*meta_columns.values())]
+                    for block, names in blocks.items():
+                        codes, values = self._block(data, block)
+                        for offset, name in names:
+                            for row_meta, code in zip(meta, codes[offset, indexes].tolist()):
+                                if code >= 0:
+                                    rows.append(dict(row_meta, parameter=name, value=values[code]))
+        rows.sort(key=lambda row: row['timestamp'])
+        return rows
+
+    def compact(self):
+        # 每個月份的多個區段合併為一個檔案（依時間排序），回傳合併掉的區段數
+        return sum(self.compact_month(month) for month in self.partitions())
+
+    def compact_month(self, month):
+        # 其他行程或執行緒正在合併同一個月份時略過；超過 HISTORY_LOCK_TIMEOUT 的鎖定檔視為中斷後留下的
+        lock_path = os.path.join(self.root, month, 'compact.lock')
+        try:
+            lock = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = datetime.datetime.now().timestamp() - os.path.getmtime(lock_path)
+            except FileNotFoundError:
+                return 0
+            if age < HISTORY_LOCK_TIMEOUT:
+                return 0
+            os.remove(lock_path)
+            return self.compact_month(month)
+        try:
+            paths = self.segments(month)
+            if len(paths) < 2:
+                return 0
+            self._merge(paths, os.path.join(self.root, month, f"compact-{datetime.datetime.now():%Y%m%d%H%M%S%f}.npz"))
+            for path in paths:
+                os.remove(path)
+            return len(paths)
+        finally:
+            os.close(lock)
+            os.remove(lock_path)
+
+    def _merge(self, paths, target):
+        # 依參數區塊逐一合併：每個區段同時只載入一個區塊，值的代碼改為合併後的代碼
+        with contextlib.ExitStack() as stack:
+            tables = [stack.enter_context(np.load(path)) for path in paths]
+            names = [json.loads(data['parameters'].item()) for data in tables]
+            parameters = list(dict.fromkeys(name for table_names in names for name in table_names))
+            positions = [{name: position for position, name in enumerate(table_names)} for table_names in names]
+            counts = [len(data['timestamp']) for data in tables]
+            columns = {column: np.concatenate([data[column] for data in tables]) for column in HISTORY_META_COLUMNS}
+            order = np.argsort(columns['timestamp'], kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
+
+            def blocks():
+                loaded = [(None, None, None)] * len(tables)
+                for start in range(0, len(parameters), HISTORY_COLUMN_BLOCK):
+                    dictionary = {}
+                    remaps = {}
+                    rows = []
+                    for name in parameters[start:start + HISTORY_COLUMN_BLOCK]:
+                        parts = []
+                        for index, data in enumerate(tables):
+                            position = positions[index].get(name)
+                            if position is None:
+                                parts.append(np.full(counts[index], -1, dtype=np.int32))
+                                continue
+                            block = position // HISTORY_COLUMN_BLOCK
+                            if loaded[index][0] != block:
+                                loaded[index] = (block, *self._block(data, block))
+                                remaps.pop(index, None)
+                            if index not in remaps:
+                                # 最後一個元素對應代碼 -1（沒有值）
+                                remaps[index] = np.array([dictionary.setdefault(value, len(dictionary)) for value in loaded[index][2]] + [-1],
+                                                         dtype=np.int32)
+                            parts.append(remaps[index][loaded[index][1][position % HISTORY_COLUMN_BLOCK]])
+                        rows.append(np.concatenate(parts)[order])
+                    yield np.stack(rows), list(dictionary)
+
+            self._write(target, columns, parameters, blocks())
+
+def query_parameter_history(history_dir, parameter, since=None, until=None, group=None, output=None):
+    # 以 CSV 輸出參數歷史；since/until 為 YYYY-MM-DD（皆含）
+    start = datetime.datetime.strptime(since, '%Y-%m-%d') if since else None
+    end = datetime.datetime.strptime(until, '%Y-%m-%d') + datetime.timedelta(days=1) if until else None
+    start_time = datetime.datetime.now()
+    rows = ParameterHistory(history_dir).query(parameter, start, end, group)
+    writer = csv.writer(output or sys.stdout)
+    writer.writerow(['timestamp', 'parameter', 'value', 'fingerprint'] + EXPORT_IDENTITY_FIELDS)
+    for row in rows:
+        writer.writerow([datetime.datetime.fromtimestamp(row['timestamp']).isoformat(timespec='seconds'), row['parameter'], row['value'],
+                         row.get('fingerprint', '')] + [row.get(field, '') for field in EXPORT_IDENTITY_FIELDS])
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"{len(rows)} history values in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+# 規格檢查結果在 Excel 中的標示顏色
+SPEC_FLAG_FILLS = {
+    'below_min': 'FFFF9999',
+    'above_max': 'FFFF9999',
+    'outlier': 'FFFFEB84',
+}
+
+# 規格檔預設放在執行檔旁
+SPEC_RULES_FILENAME = 'AVI Check list spec rules.json'
+
+class SpecChecker:
+    """以 NumPy 一次檢查大量 Recipe 的規格上下限與離群值。
+
+    規格檔為 JSON，groups 以 AVI_recipe_group_ID 分組（'*' 適用所有群組），
+    參數名稱可使用萬用字元，例如 "*Min_Defect_Area_-_Bright": {"min": 5, "max": 50}。
+    比對順序為：該群組的完全相符名稱、該群組的萬用字元、'*' 的完全相符名稱、'*' 的萬用字元。
+    離群值以整批 Recipe 每個參數的中位數與 MAD 計算 robust z-score。
+    """
+
+    def __init__(self, rules, outlier_z=None, min_outlier_samples=None):
+        if np is None:
+            raise RuntimeError('規格檢查需要安裝 numpy')
+        self.rules = rules
+        self.groups = rules.get('groups', {})
+        self.outlier_z = outlier_z if outlier_z is not None else rules.get('outlier_z', 3.5)
+        self.min_outlier_samples = min_outlier_samples if min_outlier_samples is not None else rules.get('min_outlier_samples', 5)
+        self._patterns = {
+            group: [(re.compile(fnmatch.translate(pattern)), limits) for pattern, limits in group_rules.items()]
+            for group, group_rules in self.groups.items()
+        }
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls(json.load(file), **kwargs)
+
+    def digest(self):
+        # 規格檔與離群值設定的雜湊，作為 check list 指紋的一部分
+        settings = json.dumps([self.rules, self.outlier_z, self.min_outlier_samples], sort_keys=True)
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def limits_for(self, group, key):
+        for group_name in (group, '*'):
+            group_rules = self.groups.get(group_name)
+            if not group_rules:
+                continue
+            if key in group_rules:
+                return group_rules[key]
+            for pattern, limits in self._patterns[group_name]:
+                if pattern.match(key):
+                    return limits
+        return None
+
+    def _matrix(self, records):
+        # 每個 Recipe 一列、每個數值參數一欄，缺少的參數為 NaN
+        columns = {}
+        row_entries = []
+        for record in records:
+            indexes = []
+            values = []
+            blocks = [(None, record.recipe)] + [(folder_type, record.folder(folder_type)) for folder_type in RecipeRecord.FOLDER_TYPES]
+            for folder_type, block in blocks:
+                for key, value in block.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        indexes.append(columns.setdefault((folder_type, key), len(columns)))
+                        values.append(value)
+            row_entries.append((indexes, values))
+
+        matrix = np.full((len(records), len(columns)), np.nan)
+        for row, (indexes, values) in enumerate(row_entries):
+            matrix[row, indexes] = values
+        return list(columns), matrix
+
+    def check(self, records):
+        """回傳與 records 對應的清單，每個元素為 {(folder_type, key): 原因}；folder_type 為 None 表示 Recipe 層級參數"""
+        records = list(records)
+        columns, matrix = self._matrix(records)
+        flags = [{} for _ in records]
+        if not columns:
+            return flags
+
+        groups = [record.recipe.get('AVI_recipe_group_ID') for record in records]
+        group_names = list(dict.fromkeys(groups))
+        lower = np.full((len(group_names), len(columns)), -np.inf)
+        upper = np.full((len(group_names), len(columns)), np.inf)
+        for group_index, group in enumerate(group_names):
+            for column, (folder_type, key) in enumerate(columns):
+                limits = self.limits_for(group, key)
+                if limits:
+                    lower[group_index, column] = limits.get('min', -np.inf)
+                    upper[group_index, column] = limits.get('max', np.inf)
+        row_groups = np.array([group_names.index(group) for group in groups])
+
+        below_min = matrix < lower[row_groups]
+        above_max = matrix > upper[row_groups]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # 全為 NaN 的欄位
+            median = np.nanmedian(matrix, axis=0)
+            mad = np.nanmedian(np.abs(matrix - median), axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                robust_z = 0.6745 * (matrix - median) / mad
+        sample_count = np.sum(~np.isnan(matrix), axis=0)
+        usable = (sample_count >= self.min_outlier_samples) & (mad > 0)
+        outlier = (np.abs(robust_z) > self.outlier_z) & usable
+
+        for reason, mask in (('outlier', outlier), ('above_max', above_max), ('below_min', below_min)):
+            for row, column in zip(*np.nonzero(mask)):
+                flags[row][columns[column]] = reason
+        return flags
+
+def highlight_spec_flags(wb, spec_flags):
+    for folder_type, sheets in ALL_MAPPINGS.items():
+        for sheet_name, sheet_mappings in sheets.items():
+            if sheet_name not in wb.sheetnames:
+                continue
+            ws = wb[sheet_name]
+            for var, cell in sheet_mappings.items():
+                reason = spec_flags.get((folder_type, var)) or spec_flags.get((None, var))
+                if reason:
+                    fill_color = SPEC_FLAG_FILLS[reason]
+                    ws[cell].fill = openpyxl.styles.PatternFill(fill_type='solid', start_color=fill_color, end_color=fill_color)
+
+def write_spec_report(path, records, flags, checker):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['AVI_recipe_name', 'AVI_recipe_group_ID', 'folder', 'parameter', 'value', 'reason', 'min', 'max'])
+        for record, record_flags in zip(records, flags):
+            group = record.recipe.get('AVI_recipe_group_ID')
+            for (folder_type, key), reason in record_flags.items():
+                block = record.recipe if folder_type is None else record.folder(folder_type)
+                limits = checker.limits_for(group, key) or {}
+                writer.writerow([record.recipe.get('AVI_recipe_name'), group, folder_type or '', key,
+                                 format_parameter_value(block.get(key)), reason, limits.get('min', ''), limits.get('max', '')])
+
+# 運作統計：各處理階段耗時的 histogram 上限（秒）與寫入 textfile 的間隔（秒）
+METRICS_STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+METRICS_WRITE_INTERVAL = 15
+
+METRICS_HELP = {
+    'avi_checklist_recipes_total': ('counter', 'Recipes processed by result (generated, reused, failed).'),
+    'avi_checklist_failures_total': ('counter', 'Failed recipes by reason.'),
+    'avi_checklist_warnings_total': ('counter', 'Parse warnings by reason; recipes with warnings are still generated.'),
+    'avi_checklist_stage_duration_seconds': ('histogram', 'Duration of each processing stage per recipe.'),
+    'avi_checklist_recipe_bytes_read_total': ('counter', 'Bytes read from recipe folders and archives.'),
+    'avi_checklist_template_bytes_read_total': ('counter', 'Bytes of the check list template read from the share.'),
+    'avi_checklist_template_cache_total': ('counter', 'Template reads served by the local cache (hit), the share (miss) or the cache while the share was unreachable (offline).'),
+    'avi_checklist_parse_cache_hits_total': ('counter', 'Parse cache hits by kind.'),
+    'avi_checklist_parse_cache_misses_total': ('counter', 'Parse cache misses by kind.'),
+    'avi_checklist_metrics_start_time_seconds': ('gauge', 'Unix time the process started collecting metrics.'),
+}
+
+def failure_reason(error, processor=None):
+    # 失敗原因的分類：Recipe 名稱格式錯誤、Recipes 子資料夾過多、找不到檔案、Excel 產生錯誤、取消，其餘為 other
+    message = str(error)
+    if isinstance(error, ProcessingCancelled):
+        return 'cancelled'
+    if 'Recipe檔名錯誤' in message:
+        return 'name_format'
+    if 'Setup1\\Recipes\\file count >=' in message:
+        return 'subfolder_count'
+    if processor is not None and processor.excel_error:
+        return 'excel'
+    if isinstance(error, FileNotFoundError):
+        return 'missing_file'
+    return 'other'
+
+def _metric_labels(labels):
+    if not labels:
+        return ''
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in labels]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+class CheckListMetrics:
+    """批次與常駐服務的運作統計，以 Prometheus 文字格式輸出，供 node-exporter 的 textfile collector 讀取。
+
+    計數器與 histogram 由處理完的 Recipe 累加；解析快取與範本快取的統計在輸出時讀取。
+    整個程序共用一份（METRICS），各執行緒都可記錄。
+    """
+
+    def __init__(self, buckets=METRICS_STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.start_time = datetime.datetime.now().timestamp()
+        self._counters = {}  # (名稱, 標籤) -> 值
+        self._histograms = {}  # (名稱, 標籤) -> [各 bucket 的次數, 總和, 次數]
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def record_recipe(self, processor=None, error=None):
+        # processor 為 None 表示建立 FileProcessor 時就失敗（例如 Recipe 名稱格式錯誤）
+        if error is not None:
+            self.inc('avi_checklist_recipes_total', (('result', 'failed'),))
+            self.inc('avi_checklist_failures_total', (('reason', failure_reason(error, processor)),))
+        elif processor.reused_output:
+            self.inc('avi_checklist_recipes_total', (('result', 'reused'),))
+        else:
+            self.inc('avi_checklist_recipes_total', (('result', 'generated'),))
+        if processor is None:
+            return
+        for stage_name, seconds in processor.stage_timings.items():
+            self.observe('avi_checklist_stage_duration_seconds', (('stage', stage_name),), seconds)
+        for reason, count in processor.warning_snapshot()[1].items():
+            self.inc('avi_checklist_warnings_total', (('reason', reason),), count)
+        self.inc('avi_checklist_recipe_bytes_read_total', (), processor.recipe_tree.bytes_fetched)
+
+    def samples(self):
+        # 回傳 {名稱: [(樣本名稱, 標籤, 值)]}
+        samples = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                samples.setdefault(name, []).append((name, labels, value))
+            for (name, labels), (bucket_counts, total, count) in self._histograms.items():
+                entries = samples.setdefault(name, [])
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    entries.append((f'{name}_bucket', labels + (('le', repr(float(bound))),), bucket_count))
+                entries.append((f'{name}_bucket', labels + (('le', '+Inf'),), count))
+                entries.append((f'{name}_sum', labels, total))
+                entries.append((f'{name}_count', labels, count))
+        for kind, kind_stats in PARSE_CACHE.stats().items():
+            samples.setdefault('avi_checklist_parse_cache_hits_total', []).append(
+                ('avi_checklist_parse_cache_hits_total', (('kind', kind),), kind_stats['hits']))
+            samples.setdefault('avi_checklist_parse_cache_misses_total', []).append(
+                ('avi_checklist_parse_cache_misses_total', (('kind', kind),), kind_stats['misses']))
+        template_counts = dict(STORAGE.template_cache.counts)
+        samples['avi_checklist_template_bytes_read_total'] = [
+            ('avi_checklist_template_bytes_read_total', (), template_counts.pop('bytes_read', 0))]
+        samples['avi_checklist_template_cache_total'] = [
+            ('avi_checklist_template_cache_total', (('result', result),), count) for result, count in sorted(template_counts.items())]
+        samples['avi_checklist_metrics_start_time_seconds'] = [('avi_checklist_metrics_start_time_seconds', (), self.start_time)]
+        return samples
+
+    def render(self):
+        lines = []
+        for name, entries in sorted(self.samples().items()):
+            metric_type, help_text = METRICS_HELP[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for sample_name, labels, value in entries:
+                lines.append(f'{sample_name}{_metric_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        # textfile collector 只讀取 .prom 檔，先寫入暫存檔再改名，不會讀到寫到一半的內容
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
+
+METRICS = CheckListMetrics()
+
+@contextlib.contextmanager
+def metrics_textfile(path, interval=METRICS_WRITE_INTERVAL):
+    # 處理期間每 interval 秒將 METRICS 寫入 path，結束時再寫入一次；path 為 None 時不寫入
+    if not path:
+        yield
+        return
+    stopped = threading.Event()
+
+    def write():
+        try:
+            METRICS.write(path)
+        except OSError as e:
+            print(f"寫入運作統計時發生錯誤: {e}", file=sys.stderr)
+
+    def run():
+        while not stopped.wait(interval):
+            write()
+
+    writer = threading.Thread(target=run, name='MetricsTextfile', daemon=True)
+    writer.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        writer.join()
+        write()
+
+def generate_check_lists(recipe_paths, output_dir=None, spec_flags=None, reuse_output=True, reuse_dirs=(), content_hash=False,
+                         low_memory=False, trace_memory=False, history_dir=None, profile=False):
+    # 批次產生 check list；spec_flags 為 {Recipe 路徑: 標示}。範本只讀取一次，未變動的 Recipe 沿用先前的 check list
+    failures = 0
+    reused = 0
+    template_bytes = STORAGE.template_bytes()
+    for recipe_path in recipe_paths:
+        processor = None
+        try:
+            processor = FileProcessor(recipe_path, output_dir=output_dir, template_bytes=template_bytes,
+                                      reuse_output=reuse_output, reuse_dirs=reuse_dirs, content_hash=content_hash,
+                                      low_memory=low_memory, trace_memory=trace_memory, history_dir=history_dir, profile=profile)
+            processor.spec_flags = (spec_flags or {}).get(recipe_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.generate()
+            if processor.excel_error:
+                raise RuntimeError(processor.excel_error)
+            if processor.reused_output:
+                reused += 1
+                print(f"Unchanged {processor.output_path}")
+            else:
+                print(f"Generated {processor.output_path}")
+            if processor.formula_summary:
+                print(f"  Formulas: {format_formula_summary(processor.formula_summary)}")
+            if processor.stage_peaks:
+                print('  Peak memory: ' + ', '.join(f"{stage_name} {peak / 1024 / 1024:.1f} MB" for stage_name, peak in processor.stage_peaks.items()))
+            if processor.profile_report:
+                print('\n'.join('  ' + line for line in processor.profile_report.splitlines()))
+            METRICS.record_recipe(processor)
+        except Exception as e:
+            failures += 1
+            METRICS.record_recipe(processor, e)
+            print(f"產生失敗: {recipe_path}: {e}", file=sys.stderr)
+    if reused:
+        print(f"Reused {reused} unchanged check lists")
+    return failures
+
+def plan_check_lists(recipe_paths, output_path):
+    """預檢多個 Recipe，每個 Recipe 一行 JSON 寫入 output_path，不載入範本活頁簿也不產生 check list。
+
+    無法解析（例如 Recipe 名稱格式錯誤、Recipes 資料夾過多）或產生時會失敗的 Recipe 記錄在 errors 並計為失敗。
+    """
+    start_time = datetime.datetime.now()
+    failures = 0
+    count = 0
+    template_bytes = STORAGE.template_bytes()
+    with open(output_path, 'w', encoding='utf-8') as output:
+        for recipe_path in expand_recipe_paths(recipe_paths):
+            count += 1
+            try:
+                processor = FileProcessor(recipe_path, template_bytes=template_bytes)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    plan = processor.plan_check_list()
+            except Exception as e:
+                plan = {'recipe': recipe_display_name(os.path.basename(recipe_path)), 'path': recipe_path, 'errors': [str(e).split('|')[0]]}
+            output.write(json.dumps(plan, ensure_ascii=False) + '\n')
+            if plan['errors']:
+                failures += 1
+                for error in plan['errors']:
+                    print(f"預檢失敗: {recipe_path}: {error}", file=sys.stderr)
+            else:
+                hidden_count = sum(len(rows) for rows in plan['hidden_rows'].values())
+                print(f"{plan['recipe']}: {len(plan['cells'])} cells, {len(plan['deleted_sheets'])} sheets deleted, "
+                      f"{hidden_count} rows hidden, {len(plan['warnings'])} warnings")
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Planned {count} recipes to {output_path} in {elapsed:.2f}s "
+          f"({elapsed * 1000 / max(count, 1):.1f} ms/recipe), {failures} failed")
+    return failures
+
+def check_recipes_against_spec(recipe_paths, rules_path, report_path=None, generate=False, output_dir=None, **generate_options):
+    start_time = datetime.datetime.now()
+    checker = SpecChecker.from_file(rules_path)
+    paths = []
+    records = []
+    failures = 0
+    for recipe_path in expand_recipe_paths(recipe_paths):
+        try:
+            records.append(parse_recipe_record(recipe_path))
+            paths.append(recipe_path)
+        except Exception as e:
+            failures += 1
+            print(f"解析失敗: {recipe_path}: {e}", file=sys.stderr)
+
+    flags = checker.check(records)
+    flagged = sum(len(record_flags) for record_flags in flags)
+    elapsed = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Checked {len(records)} recipes in {elapsed:.2f}s: {flagged} flagged values")
+    if report_path:
+        write_spec_report(report_path, records, flags, checker)
+    if generate:
+        failures += generate_check_lists(paths, output_dir, dict(zip(paths, flags)), **generate_options)
+    return failures
+
+# golden 資料夾中記錄各 Recipe 耗時與記憶體峰值的檔案
+GOLDEN_BASELINE_FILENAME = 'golden.json'
+
+def snapshot_check_list(path):
+    # 比對用的 check list 內容：工作表順序，以及各工作表的保護狀態、隱藏列、儲存格值與鎖定狀態
+    wb = load_workbook(path)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            cells = {}
+            for row in ws.iter_rows():
+                for cell in row:
+                    locked = bool(cell.protection.locked)
+                    if cell.value is not None or not locked:  # 空白且鎖定是預設狀態，不需比對
+                        cells[cell.coordinate] = (cell.value, locked)
+            sheets[ws.title] = {
+                'protected': bool(ws.protection.sheet),
+                'hidden_rows': sorted(row for row, dimension in ws.row_dimensions.items() if dimension.hidden),
+                'cells': cells,
+            }
+        return {'sheets': wb.sheetnames, 'sheet': sheets}
+    finally:
+        wb.close()
+
+def compare_check_list_snapshots(expected, actual, limit=20):
+    differences = []
+    if expected['sheets'] != actual['sheets']:
+        differences.append(f"sheets: expected {expected['sheets']}, got {actual['sheets']}")
+    for title in expected['sheets']:
+        if title not in actual['sheet']:
+            continue
+        expected_sheet, actual_sheet = expected['sheet'][title], actual['sheet'][title]
+        if expected_sheet['protected'] != actual_sheet['protected']:
+            differences.append(f"{title}: sheet protection expected {expected_sheet['protected']}, got {actual_sheet['protected']}")
+        if expected_sheet['hidden_rows'] != actual_sheet['hidden_rows']:
+            expected_rows, actual_rows = set(expected_sheet['hidden_rows']), set(actual_sheet['hidden_rows'])
+            differences.append(f"{title}: hidden rows only in golden {sorted(expected_rows - actual_rows)}, "
+                               f"only in output {sorted(actual_rows - expected_rows)}")
+        for coordinate in sorted(set(expected_sheet['cells']) | set(actual_sheet['cells'])):
+            expected_cell = expected_sheet['cells'].get(coordinate, (None, True))
+            actual_cell = actual_sheet['cells'].get(coordinate, (None, True))
+            if expected_cell != actual_cell:
+                differences.append(f"{title}!{coordinate}: expected (value, locked) {expected_cell}, got {actual_cell}")
+    if len(differences) > limit:
+        differences = differences[:limit] + [f"... {len(differences) - limit} more differences"]
+    return differences
+
+def performance_regressions(expected, actual, max_slowdown, max_memory_growth, slack_seconds=0.05):
+    # 每個階段的耗時超過基準 × max_slowdown（另加少許誤差）或記憶體峰值超過基準 × max_memory_growth 即視為退步
+    regressions = []
+    for stage_name, expected_seconds in expected.get('seconds', {}).items():
+        actual_seconds = actual['seconds'].get(stage_name)
+        if actual_seconds is not None and actual_seconds > expected_seconds * max_slowdown + slack_seconds:
+            regressions.append(f"{stage_name}: {actual_seconds:.3f}s > golden {expected_seconds:.3f}s x {max_slowdown}")
+    expected_peak = expected.get('peak_bytes')
+    if expected_peak and actual['peak_bytes'] > expected_peak * max_memory_growth:
+        regressions.append(f"peak memory: {actual['peak_bytes'] / 1024 / 1024:.1f} MB > golden "
+                           f"{expected_peak / 1024 / 1024:.1f} MB x {max_memory_growth}")
+    return regressions
+
+def measure_generation(recipe_path, output_dir, template_bytes, repeat=1, low_memory=False):
+    # 取 repeat 次中最快的一次耗時，再以 tracemalloc 另外執行一次量測各階段與整體的記憶體峰值
+    best = None
+    for _ in range(max(repeat, 1)):
+        processor = FileProcessor(recipe_path, output_dir=output_dir, template_bytes=template_bytes, reuse_output=False,
+                                  low_memory=low_memory)
+        start_time = datetime.datetime.now()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.generate()
+        if processor.excel_error:
+            raise RuntimeError(processor.excel_error)
+        timings = dict(processor.stage_timings, total=round((datetime.datetime.now() - start_time).total_seconds(), 4))
+        if best is None or timings['total'] < best['total']:
+            best = timings
+
+    processor = FileProcessor(recipe_path, output_dir=output_dir, template_bytes=template_bytes, reuse_output=False,
+                              low_memory=low_memory, trace_memory=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.generate()
+    if processor.excel_error:
+        raise RuntimeError(processor.excel_error)
+    return processor.output_path, {'seconds': best, 'peak_bytes': processor.peak_memory(), 'stage_peak_bytes': processor.stage_peaks}
+
+def run_golden_harness(recipe_paths, golden_dir, record=False, max_slowdown=1.5, max_memory_growth=1.5, repeat=1, low_memory=False,
+                       strict_performance=False):
+    """以一組 Recipe 比對產生的 check list 與 golden 活頁簿，並檢查耗時與記憶體是否退步。
+
+    record 時將輸出存為 golden 活頁簿，並把各 Recipe 的各階段耗時與記憶體峰值寫入 golden.json；
+    比對時逐一檢查工作表（含被刪除的工作表）、儲存格值、隱藏列、儲存格鎖定與工作表保護，內容不同即為失敗。
+    耗時與記憶體受機器負載影響，超過門檻時只列出警告；strict_performance 時（建議搭配 repeat 取多次中最快的一次）才視為失敗。
+    low_memory 時以低記憶體模式產生，輸出仍須與 golden 相同，且記憶體峰值不得超過 LOW_MEMORY_PEAK_TARGET。
+    """
+    baseline_path = os.path.join(golden_dir, GOLDEN_BASELINE_FILENAME)
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+    template_bytes = STORAGE.template_bytes()
+
+    failures = 0
+    checked = 0
+    seen = set()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for recipe_path in expand_recipe_paths(recipe_paths):
+            name = recipe_display_name(os.path.basename(recipe_path))
+            # golden 活頁簿以 Recipe 名稱命名，同名的 Recipe 會互相覆蓋
+            if name in seen:
+                failures += 1
+                print(f"FAIL  {name}: duplicate recipe name in corpus ({recipe_path})")
+                continue
+            seen.add(name)
+            try:
+                output_path, measurement = measure_generation(recipe_path, work_dir, template_bytes, repeat, low_memory)
+            except Exception as e:
+                failures += 1
+                print(f"FAIL  {name}: {e}")
+                continue
+            checked += 1
+            summary = f"{measurement['seconds']['total']:.3f}s, peak {measurement['peak_bytes'] / 1024 / 1024:.1f} MB"
+            golden_path = os.path.join(golden_dir, os.path.basename(output_path))
+            if record:
+                os.makedirs(golden_dir, exist_ok=True)
+                shutil.copy2(output_path, golden_path)
+                baseline[name] = measurement
+                print(f"SAVED {name} ({summary})")
+                continue
+
+            if os.path.exists(golden_path):
+                problems = compare_check_list_snapshots(snapshot_check_list(golden_path), snapshot_check_list(output_path))
+            else:
+                problems = [f"golden workbook not found: {golden_path}"]
+            regressions = performance_regressions(baseline[name], measurement, max_slowdown, max_memory_growth) if name in baseline else []
+            if strict_performance:
+                problems += regressions
+                regressions = []
+            if low_memory and measurement['peak_bytes'] > LOW_MEMORY_PEAK_TARGET:
+                problems.append(f"peak memory: {measurement['peak_bytes'] / 1024 / 1024:.1f} MB > low memory target "
+                                f"{LOW_MEMORY_PEAK_TARGET / 1024 / 1024:.0f} MB")
+            if problems:
+                failures += 1
+                print(f"FAIL  {name} ({summary})")
+                for problem in problems:
+                    print(f"      {problem}")
+            else:
+                print(f"OK    {name} ({summary})")
+            for regression in regressions:
+                print(f"      warning: {regression}")
+
+    if record:
+        with open(baseline_path, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, ensure_ascii=False, indent=2)
+    print(f"{'Recorded' if record else 'Checked'} {checked} recipes against {golden_dir}, {failures} failed")
+    return failures
+
+# 本機 check list 產生服務的預設埠號
+SERVICE_PORT = 8765
+
+class CheckListEngine:
+    """常駐的 check list 產生引擎。
+
+    Qt、openpyxl 與參數對應在程序啟動時只載入一次，範本內容保留在記憶體中（範本修改後自動重新讀取），
+    每個請求不再需要複製與讀取範本檔，並交由有上限的執行緒池處理。
+    """
+
+    def __init__(self, output_dir=None, max_workers=2, history_dir=None):
+        self.template_path = STORAGE.template_path()
+        self.output_dir = output_dir
+        self.history_dir = history_dir
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.template_bytes()
+
+    def template_bytes(self):
+        return STORAGE.template_bytes()
+
+    def _generate(self, recipe_path, output_dir):
+        start_time = datetime.datetime.now()
+        processor = None
+        try:
+            processor = FileProcessor(recipe_path, output_dir=output_dir or self.output_dir, template_bytes=self.template_bytes(),
+                                      history_dir=self.history_dir)
+            processor.generate()
+            if processor.excel_error:
+                raise RuntimeError(processor.excel_error)
+        except Exception as e:
+            METRICS.record_recipe(processor, e)
+            raise
+        METRICS.record_recipe(processor)
+        timings = dict(processor.stage_timings)
+        timings['total'] = round((datetime.datetime.now() - start_time).total_seconds(), 4)
+        return {'output_path': processor.output_path, 'reused': processor.reused_output is not None, 'timings': timings,
+                'formulas': processor.formula_summary}
+
+    def submit(self, recipe_path, output_dir=None):
+        return self.executor.submit(self._generate, recipe_path, output_dir)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+class CheckListRequestHandler(BaseHTTPRequestHandler):
+    """GET /health；POST /generate，內容為 {"recipe_path": ..., "output_dir": ...}"""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'template_path': self.server.engine.template_path})
+        else:
+            self._send_json(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._send_json(404, {'error': f'Unknown path: {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            recipe_path = request['recipe_path']
+            if not isinstance(recipe_path, str):
+                raise TypeError('recipe_path must be a string')
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Invalid request: {e}'})
+            return
+        if not os.path.exists(recipe_path):
+            self._send_json(404, {'error': f'Recipe not found: {recipe_path}'})
+            return
+        try:
+            result = self.server.engine.submit(recipe_path, request.get('output_dir')).result()
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, result)
+
+def create_check_list_server(host='127.0.0.1', port=SERVICE_PORT, output_dir=None, max_workers=2, history_dir=None):
+    server = ThreadingHTTPServer((host, port), CheckListRequestHandler)
+    server.engine = CheckListEngine(output_dir=output_dir, max_workers=max_workers, history_dir=history_dir)
+    return server
+
+def serve_check_lists(host='127.0.0.1', port=SERVICE_PORT, output_dir=None, max_workers=2, history_dir=None):
+    server = create_check_list_server(host, port, output_dir, max_workers, history_dir)
+    print(f"AVI check list service listening on http://{host}:{server.server_address[1]}", file=sys.stderr)
+    # 各請求的處理訊息不輸出到主控台
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            server.engine.close()
+    return 0
+
+def request_check_list(recipe_path, host='127.0.0.1', port=SERVICE_PORT, output_dir=None, timeout=600):
+    # 由常駐服務產生 check list，回傳 {'output_path': ..., 'timings': {...}}
+    body = json.dumps({'recipe_path': recipe_path, 'output_dir': output_dir}).encode('utf-8')
+    request = urllib.request.Request(f'http://{host}:{port}/generate', data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(json.loads(e.read().decode('utf-8')).get('error', str(e)))
+
+def generate_via_service(recipe_paths, port=SERVICE_PORT, output_dir=None):
+    failures = 0
+    for recipe_path in recipe_paths:
+        try:
+            result = request_check_list(os.path.abspath(recipe_path), port=port,
+                                        output_dir=os.path.abspath(output_dir) if output_dir else None)
+            print(f"{'Unchanged' if result['reused'] else 'Generated'} {result['output_path']} {json.dumps(result['timings'])}")
+            if result.get('formulas'):
+                print(f"  Formulas: {format_formula_summary(result['formulas'])}")
+        except Exception as e:
+            failures += 1
+            print(f"產生失敗: {recipe_path}: {e}", file=sys.stderr)
+    return failures
+
+# 格式異常的 RTP.txt：原本在整份內容上執行的正規表示式遇到這些輸入時會大量回溯或建立多份副本
+RTP_BENCHMARK_CASES = ['unclosed_brackets', 'single_line_brackets', 'missing_headers', 'huge_section', 'no_scan_area', 'boundary_flood']
+
+def rtp_benchmark_input(case, size):
+    zone_header = b'[Zone_1]   ; Zone name\nAlg = Surface\n'
+    line = b'Min_Defect_Area_-_Bright = 10 ; comment\n'
+    if case == 'unclosed_brackets':
+        return (b'[' * 1023 + b'\n') * (size // 1024)
+    if case == 'single_line_brackets':
+        return b'[' * size
+    if case == 'missing_headers':
+        return (b'Zone_1   ; Zone name\n' + line * 20) * (size // (len(line) * 20 + 20))
+    if case == 'huge_section':
+        return zone_header + line * (size // len(line))
+    if case == 'no_scan_area':
+        zone = b''.join(b'[Zone_%d]   ; Zone name\nAlg = Surface\n' % n + line * 50 for n in range(1, 9))
+        return zone * (size // len(zone))
+    if case == 'boundary_flood':
+        return zone_header + b'[Bump_Map[Fail[Scan_Area' * (size // 24)
+    raise ValueError(f'Unknown RTP benchmark case: {case}')
+
+def rtp_parser_peak(buffer, zone_status):
+    # 解析 buffer 時 Python 配置的記憶體峰值（位元組）
+    tracemalloc.start()
+    try:
+        for _ in iter_rtp_sections(buffer, scan_rtp_zones(buffer), zone_status):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_rtp_parser(sizes_mb=(1, 2, 4, 8)):
+    # 每種輸入逐步放大：耗時應與檔案大小成正比，記憶體峰值只與最大的段落有關
+    zone_status = {f'Bump_Map_{n}': {alg: True for alg in ZONE_ALGORITHMS} for n in range(1, 6)}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for case in RTP_BENCHMARK_CASES:
+            previous_seconds = previous_peak = None
+            for size_mb in sizes_mb:
+                path = os.path.join(temp_dir, f'{case}.txt')
+                with open(path, 'wb') as file:
+                    file.write(rtp_benchmark_input(case, size_mb * 1024 * 1024))
+                with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    start_time = datetime.datetime.now()
+                    zone_to_bump_map = scan_rtp_zones(buffer)
+                    section_count = sum(1 for _ in iter_rtp_sections(buffer, zone_to_bump_map, zone_status))
+                    seconds = (datetime.datetime.now() - start_time).total_seconds()
+
+                    peak = rtp_parser_peak(buffer, zone_status)
+                scaling = f'x{seconds / previous_seconds:.2f}' if previous_seconds else '-'
+                peak_scaling = f'x{peak / previous_peak:.2f}' if previous_peak else '-'
+                print(f"{case:<22}{size_mb:>5} MB {seconds:8.3f}s {size_mb / max(seconds, 1e-9):8.1f} MB/s "
+                      f"peak {peak / 1024 / 1024:7.2f} MB ({peak_scaling})  sections {section_count:<6} scaling {scaling}")
+                previous_seconds, previous_peak = seconds, peak
+    return 0
+
+def run_command_line(argv):
+    parser = argparse.ArgumentParser(description='AVI Recipe check list（命令列模式）')
+    parser.add_argument('recipes', nargs='*', help='Recipe 資料夾、Recipe 壓縮檔，或包含多個 Recipe 的資料夾')
+    parser.add_argument('--export', metavar='PATH', help='將解析結果匯出為 JSON Lines (.jsonl) 或 CSV (.csv)，不產生 Excel')
+    parser.add_argument('--plan', metavar='PATH', help='預檢：將每個 Recipe 會寫入的儲存格、刪除的工作表、隱藏的列與警告寫入 JSON Lines，不載入或產生 Excel')
+    parser.add_argument('--format', choices=ParameterExporter.FORMATS, help='匯出格式，預設依副檔名判斷')
+    parser.add_argument('--granularity', choices=ParameterExporter.GRANULARITIES, default='recipe', help='每個 Recipe 一筆，或每個區域/演算法一筆')
+    parser.add_argument('--spec-rules', metavar='FILE', help='以規格檔檢查所有 Recipe 的上下限與離群值')
+    parser.add_argument('--spec-report', metavar='PATH', help='規格檢查結果輸出的 CSV')
+    parser.add_argument('--generate', action='store_true', help='產生每個 Recipe 的 check list（搭配 --spec-rules 時會標示超出規格的儲存格）')
+    parser.add_argument('--output-dir', metavar='DIR', help='check list 輸出資料夾，預設為 output 存放位置（Downloads）')
+    parser.add_argument('--storage-config', metavar='FILE', help=f'存放位置設定檔（JSON），預設為執行檔旁的 {STORAGE_CONFIG_FILENAME}')
+    parser.add_argument('--storage-root', metavar='DIR', help='以此本機資料夾取代所有存放位置（範本、輸出、log、Apps 為其中的子資料夾），供測試使用')
+    parser.add_argument('--serve', action='store_true', help='啟動本機 check list 產生服務')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f'本機服務埠號，預設 {SERVICE_PORT}')
+    parser.add_argument('--workers', type=int, default=2, help='本機服務同時產生的 check list 數量')
+    parser.add_argument('--via-service', action='store_true', help='搭配 --generate，交由已啟動的本機服務產生')
+    parser.add_argument('--no-reuse', action='store_true', help='一律重新產生，不沿用 Recipe 未變動的 check list')
+    parser.add_argument('--reuse-from', metavar='DIR', action='append', default=[], help='也在此資料夾尋找可沿用的 check list（可重複指定）')
+    parser.add_argument('--content-hash', action='store_true', help='以檔案內容而非修改時間判斷 Recipe 是否變動')
+    parser.add_argument('--low-memory', action='store_true', help='低記憶體模式：解析後釋放中間資料、RTP.txt 以 mmap 讀取')
+    parser.add_argument('--parse-cache', metavar='FILE', help='解析快取檔：相同內容的 Zones INI 與 RTP 段落沿用先前的解析結果，結束時更新')
+    parser.add_argument('--trace-memory', action='store_true', help='以 tracemalloc 顯示各處理階段的記憶體峰值')
+    parser.add_argument('--profile', action='store_true',
+                        help='分析產生 check list 的耗時：在 check list 旁寫入 .prof（pstats）與 .folded（flame graph 用的 collapsed stack），'
+                             '並列出最耗時的函式；一律重新產生。只指定 --profile 時開啟 GUI 並分析每個 Recipe')
+    parser.add_argument('--summary', metavar='PATH', help='產生參數對照活頁簿：每個 Recipe 一欄、每個參數一列（可讀取 --export 的 .jsonl）')
+    parser.add_argument('--group-check', metavar='PATH', help='群組一致性檢查：同一 AVI_recipe_group_ID 的各機台 Recipe 與 golden 比對，不一致的參數寫入此活頁簿')
+    parser.add_argument('--golden', metavar='RECIPE', help='搭配 --group-check，golden Recipe 的名稱或路徑；預設選擇與群組內其他 Recipe 最一致者')
+    parser.add_argument('--whitelist', metavar='FILE', help=f'搭配 --group-check，允許各機台不同的參數（JSON），預設為執行檔旁的 {GROUP_WHITELIST_FILENAME}')
+    parser.add_argument('--group', metavar='ID', help='搭配 --summary、--group-check 或 --history-query，只包含此 AVI_recipe_group_ID')
+    parser.add_argument('--history', metavar='DIR', help=f'參數歷史資料夾，預設為 %%LOCALAPPDATA%%\\{HISTORY_DIRNAME}')
+    parser.add_argument('--no-history', action='store_true', help='產生 check list 時不記錄參數歷史')
+    parser.add_argument('--history-query', metavar='PARAMETER', help='以 CSV 輸出參數的歷史值（可用萬用字元，例如 "*Contrast_Delta_-_Dark"）')
+    parser.add_argument('--since', metavar='YYYY-MM-DD', help='搭配 --history-query，起始日期')
+    parser.add_argument('--until', metavar='YYYY-MM-DD', help='搭配 --history-query，結束日期（含）')
+    parser.add_argument('--history-compact', action='store_true', help='將參數歷史中各月份的區段檔合併')
+    parser.add_argument('--golden-record', metavar='DIR', help='將產生的 check list、耗時與記憶體峰值存為 golden 基準')
+    parser.add_argument('--golden-check', metavar='DIR', help='與 golden 基準比對 check list 內容、耗時與記憶體峰值')
+    parser.add_argument('--max-slowdown', type=float, default=1.5, help='各階段耗時超過基準的倍數即視為退步，預設 1.5')
+    parser.add_argument('--max-memory-growth', type=float, default=1.5, help='記憶體峰值超過基準的倍數即視為退步，預設 1.5')
+    parser.add_argument('--repeat', type=int, default=1, help='每個 Recipe 重複產生的次數，取最快的一次')
+    parser.add_argument('--strict-performance', action='store_true',
+                        help='搭配 --golden-check，耗時或記憶體超過門檻也視為失敗（預設只列出警告）；建議搭配 --repeat')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help='批次產生與本機服務的運作統計以 Prometheus 文字格式定期寫入此檔（供 node-exporter 的 textfile collector 讀取，副檔名需為 .prom）')
+    parser.add_argument('--metrics-interval', type=float, default=METRICS_WRITE_INTERVAL, help=f'運作統計的寫入間隔（秒），預設 {METRICS_WRITE_INTERVAL}')
+    parser.add_argument('--benchmark-rtp', nargs='*', type=int, metavar='MB', help='以格式異常的 RTP.txt 測試解析耗時與記憶體峰值（可指定各次的大小）')
+    args = parser.parse_args(argv)
+    if args.storage_config:
+        configure_storage(StorageConfig.from_file(args.storage_config))
+    if args.storage_root:
+        configure_storage(StorageConfig.from_root(args.storage_root))
+    # 與 GUI 相同的啟動權限與版本檢查、使用紀錄，在任何處理之前進行
+    denied = check_launch_permission()
+    if denied is not None:
+        print(f"{denied[0]}: {denied[1]}", file=sys.stderr)
+        return 1
+    save_usage_log('CLI')
+    generate_options = {'reuse_output': not (args.no_reuse or args.profile), 'reuse_dirs': args.reuse_from, 'content_hash': args.content_hash,
+                        'low_memory': args.low_memory, 'trace_memory': args.trace_memory, 'profile': args.profile}
+    history_dir = args.history or default_history_dir()
+    generate_options['history_dir'] = None if args.no_history or np is None else history_dir
+
+    if args.benchmark_rtp is not None:
+        return benchmark_rtp_parser(args.benchmark_rtp or (1, 2, 4, 8))
+    if args.serve:
+        with metrics_textfile(args.metrics_file, args.metrics_interval):
+            return serve_check_lists(port=args.port, output_dir=args.output_dir, max_workers=args.workers,
+                                     history_dir=generate_options['history_dir'])
+    if args.history_query:
+        return query_parameter_history(history_dir, args.history_query, args.since, args.until, args.group)
+    if args.history_compact:
+        print(f"Merged {ParameterHistory(history_dir).compact()} history segments in {history_dir}")
+        return 0
+    if not args.recipes:
+        parser.error('請指定 Recipe')
+    if args.parse_cache:
+        print(f"Loaded {PARSE_CACHE.load(args.parse_cache)} parse cache entries from {args.parse_cache}")
+
+    if args.golden_record or args.golden_check:
+        failures = run_golden_harness(args.recipes, args.golden_record or args.golden_check, record=bool(args.golden_record),
+                                      max_slowdown=args.max_slowdown, max_memory_growth=args.max_memory_growth, repeat=args.repeat,
+                                      low_memory=args.low_memory, strict_performance=args.strict_performance)
+    elif args.plan:
+        failures = plan_check_lists(args.recipes, args.plan)
+    elif args.summary:
+        failures = summarize_recipes(args.recipes, args.summary, args.group)
+    elif args.group_check:
+        whitelist_path = args.whitelist or os.path.join(get_executable_dir(), GROUP_WHITELIST_FILENAME)
+        failures = check_group_consistency(args.recipes, args.group_check, args.golden,
+                                           whitelist_path if args.whitelist or os.path.exists(whitelist_path) else None, args.group)
+    elif args.export:
+        failures = export_recipes(args.recipes, args.export, args.format, args.granularity)
+    elif args.spec_rules:
+        with metrics_textfile(args.metrics_file, args.metrics_interval):
+            failures = check_recipes_against_spec(args.recipes, args.spec_rules, args.spec_report, args.generate, args.output_dir, **generate_options)
+    elif args.generate and args.via_service:
+        failures = generate_via_service(list(expand_recipe_paths(args.recipes)), args.port, args.output_dir)
+    elif args.generate:
+        with metrics_textfile(args.metrics_file, args.metrics_interval):
+            failures = generate_check_lists(list(expand_recipe_paths(args.recipes)), args.output_dir, **generate_options)
+    else:
+        parser.error('請指定 --export、--plan、--summary、--group-check、--spec-rules 或 --generate')
+    if PARSE_CACHE.stats():
+        print(f"Parse cache: {PARSE_CACHE.summary()}")
+    if args.parse_cache:
+        PARSE_CACHE.save(args.parse_cache)
+    return 1 if failures else 0
+
+LAUNCH_DENIED_TITLE = '未獲取啟動權限'
+LAUNCH_DENIED_MESSAGE = r'未獲取啟動權限, 請申請M:\QA_Program_Raw_Data權限, 並聯絡#1082 Racky'
+LAUNCH_UPDATE_TITLE = '請更新至最新版本'
+
+def check_launch_permission():
+    # GUI 與命令列共用的啟動檢查：可以使用時回傳 None，否則回傳 (標題, 訊息)
+    try:
+        app_storage = STORAGE['apps']
+        exe_files = [f for f in app_storage.listdir() if f.startswith("AVI Check list_V") and f.endswith(".exe")]
+
+        if not exe_files:
+            return LAUNCH_DENIED_TITLE, LAUNCH_DENIED_MESSAGE
+
+        # 修改版本號提取邏輯，只取主版本號
+        latest_version = max(int(re.search(r'_V(\d+)', f).group(1)) for f in exe_files)
+
+        # 修改當前版本號提取邏輯，只取主版本號
+        current_version_match = re.search(r'_V(\d+)', os.path.basename(sys.executable))
+        if current_version_match:
+            current_version = int(current_version_match.group(1))
+        else:
+            current_version = 4
+
+        if current_version < latest_version:
+            return LAUNCH_UPDATE_TITLE, f'請更新至最新版本: {app_storage.path()}'
+
+        hostname = socket.gethostname()
+        match = re.search(r'^(.+)', hostname)
+        if not match or match.group(1) == "A000000":
+            return LAUNCH_DENIED_TITLE, LAUNCH_DENIED_MESSAGE
+
+    except FileNotFoundError:
+        return LAUNCH_DENIED_TITLE, LAUNCH_DENIED_MESSAGE
+    return None
+
+def save_usage_log(action='Open'):
+    # 使用紀錄：每台電腦一個檔案，存放在 log 位置的加密 7z 中
+    try:
+        hostname = socket.gethostname()
+        match = re.search(r'^(.+)', hostname)
+        username = match.group(1) if match else 'Unknown'
+
+        current_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_storage = STORAGE['log']
+        archive_name = 'AVI Check list.7z'
+        log_filename = f'{username}.txt'
+        new_log_message = f"{current_datetime} {username} {action}\n"
+        # 壓縮檔在記憶體中建立後一次寫入存放位置
+        buffer = io.BytesIO()
+
+        if not log_storage.exists(archive_name):
+            with py7zr.SevenZipFile(buffer, mode='w', password='@Joe11111111') as archive:
+                archive.writestr(new_log_message, f'AVI Check list/{log_filename}')
+        else:
+            log_content = ""
+            files_to_keep = []
+
+            with py7zr.SevenZipFile(io.BytesIO(log_storage.read_bytes(archive_name)), mode='r', password='@Joe11111111') as archive:
+                for filename, bio in archive.read().items():
+                    if filename == f'AVI Check list/{log_filename}':
+                        log_content = bio.read().decode('utf-8')
+                    else:
+                        files_to_keep.append((filename, bio.read()))
+
+            if new_log_message not in log_content:
+                log_content += new_log_message
+
+            with py7zr.SevenZipFile(buffer, mode='w', password='@Joe11111111') as archive:
+                archive.writestr(log_content.encode('utf-8'), f'AVI Check list/{log_filename}')
+                for filename, content in files_to_keep:
+                    archive.writestr(content, filename)
+
+        log_storage.write_bytes(archive_name, buffer.getvalue())
+
+    except Exception as e:
+        print(f"寫入log時發生錯誤: {e}")
+
+class RecipeJob:
+    # GUI 佇列中的一個 Recipe；row 為結果表格中的列
+    def __init__(self, recipe_path, row):
+        self.recipe_path = recipe_path
+        self.row = row
+        self.status = 'queued'
+        self.progress = 0
+        self.processor = None
+        self.output_path = None
+        self.error = None
+        self.open_path = None  # 檔案數量錯誤時需要開啟的資料夾
+        self.profile_report = None
+
 class AVIRecipeParser(QWidget):
-    def __init__(self):
+    STATUS_TEXT = {
+        'queued': '等待中',
+        'running': '處理中',
+        'done': '完成',
+        'failed': '失敗',
+        'cancelled': '已取消',
+    }
+    COLUMNS = ['Recipe', '狀態', '進度', '結果']
+
+    def __init__(self, profile=False):
         super().__init__()
+        self.jobs = []
+        self.pending = []
+        # 效能分析時一次只處理一個 Recipe，取樣與耗時才不會混入其他 Recipe
+        self.profile = profile
+        self.max_workers = 1 if profile else GUI_MAX_WORKERS
+        self.spec_checker = None
         self.initUI()
         self.check_version()
         self.save_log()
 
     def initUI(self):
         self.setWindowTitle('AVI Recipe check list')
-        self.setGeometry(100, 100, 400, 250)
+        self.setGeometry(100, 100, 720, 480)
         self.center()
+        # 可直接把 Recipe 資料夾或壓縮檔拖曳到視窗中
+        self.setAcceptDrops(True)
 
         layout = QVBoxLayout()
 
+        select_layout = QHBoxLayout()
         self.select_button = QPushButton('選擇Recipe檔案')
         self.select_button.clicked.connect(self.select_recipe_folder)
-        layout.addWidget(self.select_button)
+        select_layout.addWidget(self.select_button)
+
+        self.select_archive_button = QPushButton('選擇Recipe壓縮檔 (zip/7z)')
+        self.select_archive_button.clicked.connect(self.select_recipe_archive)
+        select_layout.addWidget(self.select_archive_button)
+        layout.addLayout(select_layout)
 
         self.icon_label = QLabel()
         #icon_pixmap = QPixmap('format_1.ico').scaled(140, 140, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -1460,11 +5476,27 @@ class AVIRecipeParser(QWidget):
         self.icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.icon_label)
 
+        # 每個 Recipe 一列：狀態、進度與輸出檔或錯誤訊息；雙擊完成的列開啟 check list
+        self.job_table = QTableWidget(0, len(self.COLUMNS))
+        self.job_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.job_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.job_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.job_table.verticalHeader().setVisible(False)
+        self.job_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.job_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.job_table.cellDoubleClicked.connect(self.open_job_result)
+        layout.addWidget(self.job_table)
+
         self.generate_button = QPushButton('生成AVI check list')
         self.generate_button.clicked.connect(self.generate_check_list)
         self.generate_button.setEnabled(False)
         layout.addWidget(self.generate_button)
 
+        self.cancel_button = QPushButton('取消')
+        self.cancel_button.clicked.connect(self.cancel_generation)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button)
+
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
 
@@ -1477,157 +5509,239 @@ class AVIRecipeParser(QWidget):
         self.move(qr.topLeft())
 
     def select_recipe_folder(self):
+        # 系統的資料夾對話框只能選一個資料夾，改用 Qt 對話框並開放多選
         default_path = r"J:\Setupfile\Camtek\NPI"
-        folder_path = QFileDialog.getExistingDirectory(self, "選擇Recipe檔案", default_path)
-        if folder_path:
-            self.avi_recipe_path = folder_path
-            print(f"User selected path: {self.avi_recipe_path}")
-            
-            # 提取 'Recipe/' 之後的部分作為 AVI_recipe_name
-            recipe_index = self.avi_recipe_path.rfind('Recipe/')
-            if recipe_index != -1:
-                self.AVI_recipe_name = self.avi_recipe_path[recipe_index + 7:]  # 7 是 'Recipe/' 的長度
+        dialog = QFileDialog(self, "選擇Recipe檔案", default_path)
+        dialog.setFileMode(QFileDialog.Directory)
+        dialog.setOption(QFileDialog.ShowDirsOnly, True)
+        dialog.setOption(QFileDialog.DontUseNativeDialog, True)
+        for view in dialog.findChildren((QListView, QTreeView)):
+            if isinstance(view.model(), QFileSystemModel):
+                view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        if dialog.exec_():
+            self.add_recipe_paths(dialog.selectedFiles())
+
+    def select_recipe_archive(self):
+        default_path = r"J:\Setupfile\Camtek\NPI"
+        archive_paths, _ = QFileDialog.getOpenFileNames(self, "選擇Recipe壓縮檔", default_path, "Recipe 壓縮檔 (*.zip *.7z)")
+        if archive_paths:
+            self.add_recipe_paths(archive_paths)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if paths:
+            self.add_recipe_paths(paths)
+            event.acceptProposedAction()
+
+    def add_recipe_paths(self, paths):
+        # 選擇的資料夾若不是 Recipe，則加入其中所有的 Recipe 資料夾與壓縮檔
+        queued = {job.recipe_path for job in self.jobs if job.status in ('queued', 'running')}
+        added = 0
+        for recipe_path in expand_recipe_paths(paths):
+            if recipe_path in queued:
+                continue
+            queued.add(recipe_path)
+            job = self.add_job(recipe_path)
+            if self.is_processing():
+                self.pending.append(job)  # 處理中加入的 Recipe 直接排入目前的批次
+            added += 1
+        print(f"User selected paths: {paths}, {added} recipes queued")
+        if added:
+            self.update_icon('format_2.ico')
+            if self.is_processing():
+                self.start_pending_jobs()
             else:
-                self.AVI_recipe_name = os.path.basename(self.avi_recipe_path)
-            
-            print(f"AVI_recipe_name: {self.AVI_recipe_name}")
-            
-            self.generate_button.setEnabled(True)
-            self.update_icon('format_2.ico') 
+                self.generate_button.setEnabled(True)
+        else:
+            QMessageBox.warning(self, "警告", "選擇的路徑中沒有 Recipe 資料夾或壓縮檔")
+
+    def add_job(self, recipe_path):
+        row = self.job_table.rowCount()
+        self.job_table.insertRow(row)
+        job = RecipeJob(recipe_path, row)
+        self.jobs.append(job)
+
+        name_item = QTableWidgetItem(recipe_display_name(os.path.basename(recipe_path.rstrip('/\\'))))
+        name_item.setToolTip(recipe_path)
+        self.job_table.setItem(row, 0, name_item)
+        self.job_table.setItem(row, 1, QTableWidgetItem())
+        progress_bar = QProgressBar()
+        progress_bar.setTextVisible(True)
+        self.job_table.setCellWidget(row, 2, progress_bar)
+        self.job_table.setItem(row, 3, QTableWidgetItem())
+        self.update_job_row(job)
+        return job
+
+    def update_job_row(self, job):
+        self.job_table.item(job.row, 1).setText(self.STATUS_TEXT[job.status])
+        self.job_table.cellWidget(job.row, 2).setValue(job.progress)
+        result_item = self.job_table.item(job.row, 3)
+        if job.error:
+            result_item.setText(job.error.splitlines()[0])
+            result_item.setToolTip(job.error)
+        elif job.output_path:
+            result_item.setText(os.path.basename(job.output_path))
+            result_item.setToolTip('\n\n'.join(filter(None, [job.output_path, job.profile_report])))
 
     def update_icon(self, icon_file):
         icon_path = resource_path(icon_file)
         icon_pixmap = QPixmap(icon_path).scaled(145, 145, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.icon_label.setPixmap(icon_pixmap)
 
-    def generate_check_list(self):
-        self.progress_bar.setValue(0)
-        self.generate_button.setEnabled(False)
-        self.select_button.setEnabled(False)
+    def running_jobs(self):
+        return [job for job in self.jobs if job.status == 'running']
+
+    def is_processing(self):
+        return bool(self.pending or self.running_jobs())
+
+    def set_processing(self, processing):
+        self.generate_button.setEnabled(not processing and any(job.status == 'queued' for job in self.jobs))
+        self.cancel_button.setEnabled(processing)
+        self.cancel_button.setText('取消')
 
+    def generate_check_list(self):
+        # 加入佇列的 Recipe 依序交給最多 max_workers 個背景執行緒；處理中仍可繼續加入 Recipe
+        if self.is_processing():
+            return
+        self.pending = [job for job in self.jobs if job.status == 'queued']
+        if not self.pending:
+            return
         try:
-            self.file_processor = FileProcessor(self.avi_recipe_path)
-            self.file_processor.progress_updated.connect(self.update_progress)
-            self.file_processor.processing_completed.connect(self.processing_completed)
-            self.file_processor.error_occurred.connect(self.show_error)
-            self.file_processor.open_folder_signal.connect(self.open_folder)
-            self.file_processor.start()
-        except ValueError as e:
-            self.show_error(str(e))
+            spec_rules_path = os.path.join(get_executable_dir(), SPEC_RULES_FILENAME)
+            self.spec_checker = SpecChecker.from_file(spec_rules_path) if np is not None and os.path.exists(spec_rules_path) else None
         except Exception as e:
             self.show_error(f"Wrong: {str(e)}")
-        finally:
-            self.generate_button.setEnabled(True)
-            self.select_button.setEnabled(True)
-
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
-
-    def processing_completed(self):
+            return
+        self.set_processing(True)
+        self.start_pending_jobs()
+
+    def start_pending_jobs(self):
+        while self.pending and len(self.running_jobs()) < self.max_workers:
+            job = self.pending.pop(0)
+            try:
+                processor = FileProcessor(job.recipe_path, spec_checker=self.spec_checker,
+                                          history_dir=default_history_dir() if np is not None else None,
+                                          reuse_output=not self.profile, profile=self.profile)
+            except Exception as e:
+                # Recipe 名稱格式錯誤等問題只讓這一筆失敗，不影響佇列中的其他 Recipe
+                self.set_job_result(job, 'failed', error=str(e))
+                continue
+            job.processor = processor
+            job.status = 'running'
+            processor.progress_updated.connect(lambda value, job=job: self.update_job_progress(job, value))
+            processor.processing_completed.connect(lambda job=job: self.job_completed(job))
+            processor.processing_cancelled.connect(lambda job=job: self.finish_job(job, 'cancelled'))
+            processor.error_occurred.connect(lambda message, job=job: self.finish_job(job, 'failed', error=message))
+            processor.open_folder_signal.connect(lambda path, job=job: setattr(job, 'open_path', path))
+            self.update_job_row(job)
+            processor.start()
+        self.update_total_progress()
+        if not self.is_processing():
+            self.batch_completed()
+
+    def update_job_progress(self, job, value):
+        job.progress = value
+        self.update_job_row(job)
+        self.update_total_progress()
+
+    def update_total_progress(self):
+        # 整體進度為本批所有 Recipe 進度的平均，結束（含失敗與取消）的 Recipe 以 100 計
+        batch = [job for job in self.jobs if job.status != 'queued' or job in self.pending]
+        if batch:
+            total = sum(job.progress if job.status in ('queued', 'running') else 100 for job in batch)
+            self.progress_bar.setValue(total // len(batch))
+
+    def job_completed(self, job):
+        if job.processor.excel_error:
+            self.finish_job(job, 'failed', error=job.processor.excel_error)
+        else:
+            self.finish_job(job, 'done', output_path=job.processor.output_path)
+
+    def finish_job(self, job, status, output_path=None, error=None):
+        self.set_job_result(job, status, output_path, error)
+        self.start_pending_jobs()
+
+    def set_job_result(self, job, status, output_path=None, error=None):
+        job.status = status
+        job.output_path = output_path
+        job.error = error
+        if status == 'done':
+            job.progress = 100
+        if job.processor is not None:
+            job.processor.wait()
+            job.profile_report = job.processor.profile_report
+            job.processor = None  # 釋放已解析的 Recipe 資料
+        self.update_job_row(job)
+
+    def batch_completed(self):
+        self.set_processing(False)
+        counts = {status: sum(1 for job in self.jobs if job.status == status) for status in ('done', 'failed', 'cancelled')}
+        print(f"Batch finished: {json.dumps(counts)}")
         self.progress_bar.setValue(100)
-        reply = QMessageBox.information(self, "完成", "AVI check list 生成完成", QMessageBox.Ok)
-        if reply == QMessageBox.Ok:
-            self.open_output_file()
-            self.close()
+        # 不自動關閉視窗，讓使用者檢查每個 Recipe 的結果
+        QMessageBox.information(self, "完成", f"AVI check list 生成完成\n成功 {counts['done']}、失敗 {counts['failed']}、取消 {counts['cancelled']}\n"
+                                               "雙擊列表中的 Recipe 可開啟 check list 或查看錯誤", QMessageBox.Ok)
+
+    def cancel_generation(self):
+        if self.is_processing():
+            for job in self.pending:
+                self.set_job_result(job, 'cancelled')
+            self.pending = []
+            for job in self.running_jobs():
+                job.processor.cancel()
+            self.cancel_button.setEnabled(False)
+            self.cancel_button.setText('取消中...')
+            if not self.running_jobs():
+                self.batch_completed()
+
+    def closeEvent(self, event):
+        # 關閉視窗時停止處理中的工作，避免執行緒在背景中被終止
+        self.pending = []
+        for job in self.running_jobs():
+            job.processor.cancel()
+        for job in self.running_jobs():
+            job.processor.wait()
+        event.accept()
+
+    def open_job_result(self, row, column):
+        job = self.jobs[row]
+        if job.status == 'done':
+            self.open_output_file(job.output_path)
+        elif job.status == 'failed':
+            self.show_error(job.error)
+            if job.open_path:
+                self.open_folder(job.open_path)
 
     def show_error(self, error_message):
         QMessageBox.critical(self, "錯誤", f"處理過程中發生錯誤：\n{error_message}")
-        self.generate_button.setEnabled(True)
-        self.select_button.setEnabled(True)
 
     def open_folder(self, path):
         os.startfile(path)
 
-    def open_output_file(self):
-        recipe_name = os.path.basename(self.avi_recipe_path)
-        new_file_name = f"{recipe_name}_AVI check list.xlsx"
-        output_path = os.path.join(os.path.expanduser("~"), "Downloads", new_file_name)
-        if os.path.exists(output_path):
+    def open_output_file(self, output_path):
+        if output_path and os.path.exists(output_path):
             os.startfile(output_path)
         else:
-            QMessageBox.warning(self, "警告", f"無法找到文件: {new_file_name}")
+            QMessageBox.warning(self, "警告", f"無法找到文件: {output_path}")
 
     def save_log(self):
-        try:
-            hostname = socket.gethostname()
-            match = re.search(r'^(.+)', hostname)
-            username = match.group(1) if match else 'Unknown'
-
-            current_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_folder = r'M:\QA_Program_Raw_Data\Log History'
-            archive_path = os.path.join(log_folder, 'AVI Check list.7z')
-            log_filename = f'{username}.txt'
-            new_log_message = f"{current_datetime} {username} Open\n"
-            os.makedirs(log_folder, exist_ok=True)
-
-            if not os.path.exists(archive_path):
-                with py7zr.SevenZipFile(archive_path, mode='w', password='@Joe11111111') as archive:
-                    archive.writestr(new_log_message, f'AVI Check list/{log_filename}')
-            else:
-                log_content = ""
-                files_to_keep = []
-
-                with py7zr.SevenZipFile(archive_path, mode='r', password='@Joe11111111') as archive:
-                    for filename, bio in archive.read().items():
-                        if filename == f'AVI Check list/{log_filename}':
-                            log_content = bio.read().decode('utf-8')
-                        else:
-                            files_to_keep.append((filename, bio.read()))
-
-                if new_log_message not in log_content:
-                    log_content += new_log_message
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.7z') as temp_file:
-                    temp_archive_path = temp_file.name
-
-                with py7zr.SevenZipFile(temp_archive_path, mode='w', password='@Joe11111111') as archive:
-                    archive.writestr(log_content.encode('utf-8'), f'AVI Check list/{log_filename}')
-                    for filename, content in files_to_keep:
-                        archive.writestr(content, filename)
-
-                shutil.move(temp_archive_path, archive_path)
-
-        except Exception as e:
-            print(f"寫入log時發生錯誤: {e}")
+        save_usage_log()
 
     def check_version(self):
-        try:
-            app_folder = r"M:\QA_Program_Raw_Data\Apps"
-            exe_files = [f for f in os.listdir(app_folder) if f.startswith("AVI Check list_V") and f.endswith(".exe")]
-
-            if not exe_files:
-                QMessageBox.warning(self, '未獲取啟動權限', '未獲取啟動權限, 請申請M:\QA_Program_Raw_Data權限, 並聯絡#1082 Racky')
-                sys.exit(1)
-
-            # 修改版本號提取邏輯，只取主版本號
-            latest_version = max(int(re.search(r'_V(\d+)', f).group(1)) for f in exe_files)
-
-            # 修改當前版本號提取邏輯，只取主版本號
-            current_version_match = re.search(r'_V(\d+)', os.path.basename(sys.executable))
-            if current_version_match:
-                current_version = int(current_version_match.group(1))
-            else:
-                current_version = 4
-
-            if current_version < latest_version:
-                QMessageBox.information(self, '請更新至最新版本', '請更新至最新版本')
-                os.startfile(app_folder)  # 開啟指定的資料夾
-                sys.exit(0)
-
-            hostname = socket.gethostname()
-            match = re.search(r'^(.+)', hostname)
-            if match:
-                username = match.group(1)
-                if username == "A000000":
-                    QMessageBox.warning(self, '未獲取啟動權限', '未獲取啟動權限, 請申請M:\QA_Program_Raw_Data權限, 並聯絡#1082 Racky')
-                    sys.exit(1)
-            else:
-                QMessageBox.warning(self, '未獲取啟動權限', '未獲取啟動權限, 請申請M:\QA_Program_Raw_Data權限, 並聯絡#1082 Racky')
-                sys.exit(1)
-
-        except FileNotFoundError:
-            QMessageBox.warning(self, '未獲取啟動權限', '未獲取啟動權限, 請申請M:\QA_Program_Raw_Data權限, 並聯絡#1082 Racky')
-            sys.exit(1)
+        denied = check_launch_permission()
+        if denied is None:
+            return
+        title, message = denied
+        if title == LAUNCH_UPDATE_TITLE:
+            QMessageBox.information(self, title, message)
+            os.startfile(STORAGE['apps'].path())  # 開啟指定的資料夾
+            sys.exit(0)
+        QMessageBox.warning(self, title, message)
+        sys.exit(1)
         
 def get_application_path():
     if getattr(sys, 'frozen', False):
@@ -1635,7 +5749,26 @@ def get_application_path():
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
+def get_executable_dir():
+    # 使用者可編輯的設定檔放在執行檔旁，而非 PyInstaller 的暫存資料夾
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    else:
+        return os.path.dirname(os.path.abspath(__file__))
+
+def load_storage_config():
+    # 執行檔旁有存放位置設定檔時，以其設定取代預設的存放位置
+    config_path = os.path.join(get_executable_dir(), STORAGE_CONFIG_FILENAME)
+    if os.path.exists(config_path):
+        configure_storage(StorageConfig.from_file(config_path))
+
 if __name__ == '__main__':
+    load_storage_config()
+    # 只指定 --profile 時開啟 GUI，其餘參數一律以命令列模式執行
+    gui_profile = sys.argv[1:] == ['--profile']
+    if len(sys.argv) > 1 and not gui_profile:
+        sys.exit(run_command_line(sys.argv[1:]))
+
     app = QApplication(sys.argv)
     application_path = get_application_path()
     icon_path = os.path.join(application_path, 'format.ico')
@@ -1649,7 +5782,7 @@ if __name__ == '__main__':
 
     app.setFont(font)
 
-    ex = AVIRecipeParser()
+    ex = AVIRecipeParser(profile=gui_profile)
     ex.check_version()  
     win = qtmodern.windows.ModernWindow(ex)
     win.show()
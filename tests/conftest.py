@@ -0,0 +1,149 @@
+import importlib.util
+import os
+import sys
+
+import openpyxl
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+MODULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'AVI Check list_V4.5.0.py')
+
+
+def load_module():
+    # 程式檔名含空白，無法直接 import
+    if 'avi_check_list' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('avi_check_list', MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['avi_check_list'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['avi_check_list']
+
+
+RTP_TEXT = """Header = 1
+[PostProcess]   ; Zone name
+Alg = Surface
+Min_Defect_Area_-_Bright = 3
+[Zone_A]   ; Zone name
+Alg = Surface
+Min_Defect_Area_-_Bright = 10 ; comment
+Contrast_Delta_-_Dark = .5
+Param[1] = 7
+Alg = Solder_Bump
+Bump_Color_is_White = 1
+Alg = Probe_Mark_Inspection
+PMI_X = 4
+[Zone B]   ; Zone name
+Alg = Surface
+Min_Defect_Area_-_Bright = 99
+[Zone_C]   ; Zone name
+Alg = Uniform_Surface_on_SB
+MaxAreaSum = 12
+CollectForGlobalSum = 1
+[Scan_Area]   ; Zone name
+Alg = Surface
+Min_Defect_Area_-_Bright = 5
+Cluster_Area = 100 \u00b5m
+[Other]
+X = 1
+"""
+
+
+def write_text(root, relative_path, text):
+    path = os.path.join(root, *relative_path.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(text.replace('\n', '\r\n').encode('utf-8'))
+
+
+def make_recipe(root, multi=True, extra_parameters=0, filler_lines=0):
+    """在 root 建立一份機台匯出的 recipe 資料夾。
+
+    extra_parameters 為每個 recipe 額外加入 Scan_Area 的 RTP 參數數量；filler_lines 為 RTP.txt 最後
+    不屬於任何區域、解析時需略過的資料行數（模擬大型 RTP.txt）。
+    """
+    write_text(root, 'Setup1/WaferMapRecipe.ini',
+               '[GENERAL]\nExportInAutoCycle=1\n[Input_Update]\nEnable=0\nFileMask=*.txt\nImportDirectory=C:\\x\nConverterName=conv\n')
+    for folder in (['Default', 'Prod2'] if multi else ['Default']):
+        base = f'Setup1/Recipes/{folder}'
+        write_text(root, base + '/OpticsPreset.ini',
+                   '[RobotSetup]\nName=Robot1\n[General]\nScan2d-Mag=5X\nVerifyColorMag1-Mag=10X\nDiffLight=12.345\n'
+                   'DiffLight-Old=3\nRefLight=7\nVerifyColorMag1-RefLight=3.14159\n')
+        write_text(root, base + '/sub/AlignRtp.ini', '[DIE Alignment]\nDie__MinScore=0.75\n')
+        write_text(root, base + '/ProductInfo.ini',
+                   '[General]\nOCRWaferIDMask=AB##\n[Geometric]\nXDieIndex=1.5\nYDieIndex=2.5\nDiameter=300\n'
+                   '[UpperIdReader]\nEnabled=True\nJobName=Job\u00e9X\n')
+        write_text(root, base + '/AlignmentData.ini', '[General]\nMinScore=.6\n')
+        write_text(root, base + '/Recipe.ini', '[AutoCycle]\nExportPMdata=1\nMaxImagesToGrabDie=20\n')
+        extra = ''.join(f'Extra_Parameter_{index} = {index}\n' for index in range(extra_parameters))
+        filler = ''.join(f'Map_Row_{index} = {index % 97},{index % 89},{index % 83},{index % 79}\n' for index in range(filler_lines))
+        write_text(root, base + '/RTP.txt', RTP_TEXT.replace('[Other]\n', extra + '[Other]\n') + filler)
+        write_text(root, base + '/Zones/Zone A.ini', '[Surface]\nEnable=1\n[Solder Bump]\nEnable=1\n[Probe Mark Inspection]\nEnable=0\n')
+        write_text(root, base + '/Zones/zone b.INI', '[Surface]\nEnable=0\n')
+        write_text(root, base + '/Zones/Zone C.ini', '[Uniform Surface on SB]\nEnable=1\n')
+        write_text(root, base + '/Zones/Scan Area.ini', '[Surface]\nEnable=0\n' if folder == 'Default' else '[Surface]\nEnable=1\n')
+    return root
+
+
+def make_template(path):
+    """建立與正式範本工作表結構相同的 check list 範本"""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for suffix in ['', '_Multi']:
+        ws = wb.create_sheet('Check list' + suffix)
+        for row in range(1, 70):
+            ws.cell(row, 2, f'Item {row}')
+            ws.cell(row, 5, 300 if row == 5 else (10 if row % 2 else 'AB##'))
+            ws.cell(row, 4, f'=IF(C{row}="","",IF(C{row}=E{row},"PASS","FAIL"))')
+        ws['D64'] = '=COUNTIF(D4:D63,"FAIL")'
+        ws.protection.sheet = True
+        ws.protection.password = 'Ardentec'
+        ws = wb.create_sheet('Surface' + suffix)
+        ws['F3'] = 'Setup File Value'
+        for row in range(4, 26):
+            ws.cell(row, 2, f'param {row}')
+            ws.cell(row, 7, f'=IF(F{row}="","",F{row}>=1)')
+        ws.merge_cells('A1:G1')
+        ws['A1'] = 'Surface'
+        ws = wb.create_sheet('Pad device' + suffix)
+        for row in (2, 26, 50, 74, 98, 123, 149, 175, 201, 227, 254, 283, 312, 341, 370):
+            ws.cell(row, 6, 'Setup File Value')
+        ws.merge_cells('E122:F122')
+        ws['E122'] = 'PMI'
+        ws = wb.create_sheet('Bump device' + suffix)
+        for row in (2, 60, 118, 176, 234):
+            ws.cell(row, 6, 'Setup File Value')
+        ws.cell(300, 1, 'end')
+    for name in ['Snapshot', 'Die shift check', 'Trial run']:
+        ws = wb.create_sheet(name)
+        ws['A1'] = name
+    wb.save(path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def avi():
+    return load_module()
+
+
+@pytest.fixture(scope='session')
+def template_bytes(tmp_path_factory):
+    path = make_template(str(tmp_path_factory.mktemp('template') / 'template.xlsx'))
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+@pytest.fixture
+def storage(avi, tmp_path, template_bytes):
+    """以 tmp_path 下的資料夾取代所有存放位置，範本放在 template 位置"""
+    previous = avi.STORAGE
+    config = avi.configure_storage(avi.StorageConfig.from_root(str(tmp_path / 'storage')))
+    config['template'].write_bytes(avi.TEMPLATE_FILENAME, template_bytes)
+    config['apps'].write_bytes('AVI Check list_V4.exe', b'')
+    yield config
+    avi.configure_storage(previous)
+
+
+@pytest.fixture
+def recipe_dir(tmp_path):
+    return make_recipe(str(tmp_path / 'recipes' / 'EQP1-G1-S1-E-V1'))
@@ -0,0 +1,30 @@
+import os
+
+
+def test_launch_permission(avi, storage, monkeypatch):
+    monkeypatch.setattr(avi.socket, 'gethostname', lambda: 'PC1234')
+    assert avi.check_launch_permission() is None
+    monkeypatch.setattr(avi.socket, 'gethostname', lambda: 'A000000')
+    assert avi.check_launch_permission()[0] == avi.LAUNCH_DENIED_TITLE
+    monkeypatch.setattr(avi.socket, 'gethostname', lambda: 'PC1234')
+    storage['apps'].write_bytes('AVI Check list_V9.exe', b'')
+    assert avi.check_launch_permission()[0] == avi.LAUNCH_UPDATE_TITLE
+
+
+def test_command_line_checks_permission_before_any_work(avi, tmp_path, recipe_dir, template_bytes, monkeypatch, capsys):
+    monkeypatch.setattr(avi, 'STORAGE', avi.STORAGE)  # run_command_line 會改變存放位置，測試後還原
+    root = tmp_path / 'root'
+    avi.StorageConfig.from_root(str(root))['template'].write_bytes(avi.TEMPLATE_FILENAME, template_bytes)
+    plan_path = str(tmp_path / 'plan.jsonl')
+    argv = ['--storage-root', str(root), '--plan', plan_path, recipe_dir]
+
+    assert avi.run_command_line(argv) == 1
+    assert avi.LAUNCH_DENIED_TITLE in capsys.readouterr().err
+    assert not os.path.exists(plan_path)
+    assert not os.path.exists(root / 'log' / 'AVI Check list.7z')
+
+    os.makedirs(root / 'apps', exist_ok=True)
+    (root / 'apps' / 'AVI Check list_V4.exe').write_bytes(b'')
+    assert avi.run_command_line(argv) == 0
+    assert os.path.exists(plan_path)
+    assert os.path.exists(root / 'log' / 'AVI Check list.7z')
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import threading
+
+from conftest import RTP_TEXT, make_recipe, write_text
+
+
+def test_warn_from_many_threads(avi, recipe_dir):
+    processor = avi.FileProcessor(recipe_dir)
+    barrier = threading.Barrier(8)
+
+    def worker(index):
+        barrier.wait()
+        for count in range(500):
+            processor.warn(f'warning {index} {count}', log=lambda message: None, reason='missing_ini' if count % 2 else 'other')
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    warnings, reasons = processor.warning_snapshot()
+    assert len(warnings) == 4000 and len(set(warnings)) == 4000
+    assert reasons == {'missing_ini': 2000, 'other': 2000}
+
+
+def test_warning_metrics(avi, recipe_dir):
+    processor = avi.FileProcessor(recipe_dir)
+    processor.warn('Zones folder not found', log=lambda message: None, reason='missing_folder')
+    metrics = avi.CheckListMetrics()
+    metrics.record_recipe(processor)
+    assert 'avi_checklist_warnings_total{reason="missing_folder"} 1' in metrics.render()
+
+
+def test_shared_zone_ini_parsed_once(avi, storage, tmp_path, monkeypatch):
+    # [Zone B] 與 [ZONE_B] 都對應 Zones/zone b.INI
+    root = make_recipe(str(tmp_path / 'recipes' / 'EQP1-G1-S1-E-V1'), multi=False)
+    write_text(root, 'Setup1/Recipes/Default/RTP.txt', RTP_TEXT.replace(
+        '[Zone_C]', '[ZONE_B]   ; Zone name\nAlg = Surface\nMin_Defect_Area_-_Bright = 98\n[Zone_C]'))
+    monkeypatch.setattr(avi, 'PARSE_CACHE', avi.ContentCache())
+    processor = avi.FileProcessor(root, output_dir=str(tmp_path / 'out'), template_bytes=storage.template_bytes(),
+                                  reuse_output=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.generate()
+    assert not processor.excel_error
+    assert processor.ini_memo.duplicates_avoided == 1
+    assert avi.PARSE_CACHE.stats()['zone_status']['misses'] == 3
+    assert processor.ini_memo.parse_count == 4  # 三個 Zones INI 與 Scan Area.ini
@@ -0,0 +1,41 @@
+import io
+
+import openpyxl
+
+
+def evaluate(avi, formulas):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'Check list'
+    for coordinate, formula in formulas.items():
+        ws[coordinate] = formula
+    evaluator = avi.CheckListFormulaEvaluator(wb)
+    evaluator.evaluate_all()
+    return wb, evaluator
+
+
+def test_pass_fail_summary(avi):
+    _, evaluator = evaluate(avi, {'A1': 10, 'A2': '=IF(A1>=5,"PASS","FAIL")', 'A3': '=IF(A1>=50,"PASS","FAIL")'})
+    summary = evaluator.summary()
+    assert (summary['pass'], summary['fail'], summary['unsupported']) == (1, 1, 0)
+    assert summary['failed_cells'] == ['Check list!A3']
+
+
+def test_overflow_is_num_error_and_reopens(avi):
+    wb, evaluator = evaluate(avi, {'A1': '=1E308*10', 'A2': '=A1+1'})
+    assert evaluator.results[('Check list', 'A1')] == '#NUM!'
+    assert isinstance(evaluator.results[('Check list', 'A1')], avi.ExcelErrorValue)
+    assert evaluator.results[('Check list', 'A2')] == '#NUM!'
+    output = io.BytesIO()
+    wb.save(output)
+    stored = avi.store_formula_values(output.getvalue(), evaluator.results)
+    assert b'inf<' not in stored
+    cached = openpyxl.load_workbook(io.BytesIO(stored), data_only=True)
+    assert cached['Check list']['A1'].value == '#NUM!'
+
+
+def test_unexpected_error_only_skips_that_cell(avi):
+    _, evaluator = evaluate(avi, {'A1': '=ROUND(1,400)', 'A2': '=IF(1=1,"PASS","FAIL")'})
+    assert ('Check list', 'A1') in evaluator.unsupported
+    assert evaluator.results[('Check list', 'A2')] == 'PASS'
+    assert evaluator.summary()['unsupported'] == 1
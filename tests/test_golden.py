@@ -0,0 +1,69 @@
+import json
+import os
+
+import openpyxl
+import pytest
+
+from conftest import make_recipe
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / 'corpus'
+    make_recipe(str(root / 'EQP1-G1-S1-E-V1'))
+    make_recipe(str(root / 'EQP2-G1-S1-E-V1'), multi=False)
+    return str(root)
+
+
+@pytest.fixture
+def golden_dir(avi, storage, corpus, tmp_path):
+    golden_dir = str(tmp_path / 'golden')
+    assert avi.run_golden_harness([corpus], golden_dir, record=True) == 0
+    return golden_dir
+
+
+def test_record_and_check(avi, corpus, golden_dir, capsys):
+    assert sorted(os.listdir(golden_dir)) == ['EQP1-G1-S1-E-V1_AVI check list.xlsx', 'EQP2-G1-S1-E-V1_AVI check list.xlsx',
+                                              avi.GOLDEN_BASELINE_FILENAME]
+    with open(os.path.join(golden_dir, avi.GOLDEN_BASELINE_FILENAME), encoding='utf-8') as file:
+        baseline = json.load(file)
+    assert baseline['EQP1-G1-S1-E-V1']['seconds']['total'] > 0 and baseline['EQP1-G1-S1-E-V1']['peak_bytes'] > 0
+    capsys.readouterr()
+    assert avi.run_golden_harness([corpus], golden_dir) == 0
+    assert 'Checked 2 recipes' in capsys.readouterr().out
+
+
+def test_value_and_structure_changes_fail(avi, corpus, golden_dir, capsys):
+    path = os.path.join(golden_dir, 'EQP1-G1-S1-E-V1_AVI check list.xlsx')
+    wb = openpyxl.load_workbook(path)
+    wb['Check list']['C5'] = 'changed'
+    wb['Surface_Multi'].row_dimensions[7].hidden = True
+    wb.save(path)
+    capsys.readouterr()
+    assert avi.run_golden_harness([corpus], golden_dir) == 1
+    output = capsys.readouterr().out
+    assert 'FAIL  EQP1-G1-S1-E-V1' in output
+    assert 'Check list!C5' in output and 'Surface_Multi: hidden rows only in golden [7]' in output
+
+
+def test_performance_regressions_are_advisory(avi, corpus, golden_dir, capsys):
+    baseline_path = os.path.join(golden_dir, avi.GOLDEN_BASELINE_FILENAME)
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    for measurement in baseline.values():
+        measurement['seconds'] = {stage: 0.0 for stage in measurement['seconds']}
+        measurement['peak_bytes'] = 1
+    with open(baseline_path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file)
+    capsys.readouterr()
+    assert avi.run_golden_harness([corpus], golden_dir, max_slowdown=1.0, max_memory_growth=1.0) == 0
+    output = capsys.readouterr().out
+    assert 'warning: peak memory' in output and 'FAIL' not in output
+    assert avi.run_golden_harness([corpus], golden_dir, max_slowdown=1.0, max_memory_growth=1.0, strict_performance=True) == 2
+
+
+def test_performance_regressions_threshold(avi):
+    expected = {'seconds': {'parse': 1.0, 'excel': 2.0}, 'peak_bytes': 100}
+    actual = {'seconds': {'parse': 1.4, 'excel': 3.2}, 'peak_bytes': 160}
+    regressions = avi.performance_regressions(expected, actual, max_slowdown=1.5, max_memory_growth=1.5)
+    assert [regression.split(':')[0] for regression in regressions] == ['excel', 'peak memory']
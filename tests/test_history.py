@@ -0,0 +1,60 @@
+import datetime
+
+import pytest
+
+
+def record(avi, group, values, name='EQP1-G1-S1-E-V1'):
+    return avi.RecipeRecord.from_variables({
+        'Default': values, 'Default1': {},
+        'AVI_recipe_name': name, 'AVI_recipe_EQP_ID': 'EQP1', 'AVI_recipe_group_ID': group,
+    })
+
+
+@pytest.fixture
+def history(avi, tmp_path, monkeypatch):
+    # 小區塊讓少量參數也分成多個欄位區塊
+    monkeypatch.setattr(avi, 'HISTORY_COLUMN_BLOCK', 2)
+    return avi.ParameterHistory(str(tmp_path / 'history'))
+
+
+def append_runs(avi, history):
+    history.append(record(avi, 'G1', {'A_Contrast': '1', 'B': 'x', 'C_Contrast': '3'}), 'f1', datetime.datetime(2024, 1, 5))
+    history.append(record(avi, 'G2', {'A_Contrast': '2', 'C_Contrast': ''}), 'f2', datetime.datetime(2024, 1, 20))
+    history.append(record(avi, 'G1', {'B': 'y', 'D_Contrast': '4', 'A_Contrast': '1'}), 'f3', datetime.datetime(2024, 2, 1))
+
+
+def values(rows):
+    return [(row['parameter'], row['value'], row['AVI_recipe_group_ID']) for row in rows]
+
+
+def test_append_and_query(avi, history):
+    append_runs(avi, history)
+    assert history.partitions() == ['2024-01', '2024-02']
+    assert len(history.segments('2024-01')) == 2
+    rows = history.query('Default.*_Contrast')
+    assert values(rows) == [('Default.A_Contrast', '1', 'G1'), ('Default.C_Contrast', '3', 'G1'),
+                            ('Default.A_Contrast', '2', 'G2'),
+                            ('Default.D_Contrast', '4', 'G1'), ('Default.A_Contrast', '1', 'G1')]
+    assert rows[0]['fingerprint'] == 'f1' and rows[0]['timestamp'] == datetime.datetime(2024, 1, 5).timestamp()
+    assert values(history.query('Default.A_Contrast', group='G1')) == [('Default.A_Contrast', '1', 'G1')] * 2
+    assert values(history.query('Default.B', start=datetime.datetime(2024, 1, 10), end=datetime.datetime(2024, 3, 1))) == [
+        ('Default.B', 'y', 'G1')]
+    assert history.query('Default.Missing') == []
+
+
+def test_compact_keeps_query_results(avi, history):
+    append_runs(avi, history)
+    history.append(record(avi, 'G1', {'A_Contrast': '0'}), 'f0', datetime.datetime(2024, 1, 1))
+    expected = history.query('*')
+    assert history.compact() == 3
+    assert [len(history.segments(month)) for month in history.partitions()] == [1, 1]
+    assert history.query('*') == expected
+    assert history.compact() == 0
+
+
+def test_append_compacts_month_automatically(avi, history, monkeypatch):
+    monkeypatch.setattr(avi, 'HISTORY_MAX_SEGMENTS', 2)
+    for day in range(1, 6):
+        history.append(record(avi, 'G1', {'A_Contrast': str(day)}), f'f{day}', datetime.datetime(2024, 1, day))
+    assert len(history.segments('2024-01')) <= 2
+    assert [row['value'] for row in history.query('Default.A_Contrast')] == ['1', '2', '3', '4', '5']
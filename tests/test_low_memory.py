@@ -0,0 +1,49 @@
+import contextlib
+import io
+import os
+import zipfile
+
+import pytest
+
+from conftest import make_recipe
+
+# 一份約 14 MB 的 RTP.txt：Scan_Area 後接大量不屬於任何區域的資料，外加數千個參數
+LARGE_RECIPE_FILLER_LINES = 500000
+LARGE_RECIPE_PARAMETERS = 5000
+
+
+@pytest.fixture(scope='module')
+def large_recipe(tmp_path_factory):
+    root = tmp_path_factory.mktemp('large')
+    folder = make_recipe(str(root / 'EQP1-G1-S1-E-V1'), multi=False, extra_parameters=LARGE_RECIPE_PARAMETERS,
+                         filler_lines=LARGE_RECIPE_FILLER_LINES)
+    archive_path = str(root / 'EQP1-G1-S1-E-V2.zip')
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                archive.write(path, os.path.relpath(path, folder))
+    return {'folder': folder, 'archive': archive_path}
+
+
+@pytest.mark.parametrize('kind', ['folder', 'archive'])
+def test_low_memory_peak_within_target(avi, storage, large_recipe, tmp_path, kind):
+    rtp_size = os.path.getsize(os.path.join(large_recipe['folder'], 'Setup1', 'Recipes', 'Default', 'RTP.txt'))
+    assert rtp_size > 12 * 1024 * 1024
+    processor = avi.FileProcessor(large_recipe[kind], output_dir=str(tmp_path), template_bytes=storage.template_bytes(),
+                                  reuse_output=False, low_memory=True, trace_memory=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.generate()
+    assert not processor.excel_error
+    assert processor.parameters.value_count() > LARGE_RECIPE_PARAMETERS
+    assert processor.parameters.get('Default', f'RTP_Scan_Area_Surface_Extra_Parameter_{LARGE_RECIPE_PARAMETERS - 1}') is not None
+    assert 0 < processor.peak_memory() <= avi.LOW_MEMORY_PEAK_TARGET, processor.stage_peaks
+
+
+@pytest.mark.parametrize('case', ['unclosed_brackets', 'missing_headers'])
+def test_rtp_parser_peak_flat_across_sizes(avi, case):
+    # 沒有可保留段落的輸入：記憶體峰值只與讀取區塊大小有關，不隨檔案變大
+    zone_status = {f'Bump_Map_{n}': {alg: True for alg in avi.ZONE_ALGORITHMS} for n in range(1, 6)}
+    small, large = (avi.rtp_parser_peak(avi.rtp_benchmark_input(case, size_mb * 1024 * 1024), zone_status)
+                    for size_mb in (2, 8))
+    assert large <= small * 1.1, (small, large)
@@ -0,0 +1,23 @@
+def test_parameter_block_lookup(avi):
+    items = [(f'RTP_Bump_Map_1_Surface_P{index}', str(index)) for index in range(2000)] + [('Flag', 'True'), ('Ratio', '.5')]
+    block = avi.ParameterBlock(items)
+    assert len(block) == 2002
+    assert block.get('RTP_Bump_Map_1_Surface_P1999') == 1999
+    assert block.get('Flag') is True
+    assert block.get('Ratio') == '.5'  # 無法原樣轉回的字串維持原值
+    assert 'Missing' not in block and block.get('Missing', 'x') == 'x'
+    assert block.to_dict() == dict(items)
+
+
+def test_parameter_block_keeps_first_duplicate(avi):
+    block = avi.ParameterBlock([('A', '1'), ('B', '2'), ('A', '3')])
+    assert block.get('A') == 1
+    assert block._index('B') == 1
+
+
+def test_recipe_record_prefers_folder_values(avi):
+    record = avi.RecipeRecord.from_variables({'Default': {'A': '1'}, 'Default1': {}, 'A': '9', 'B': '2'})
+    assert record.get('Default', 'A') == 1
+    assert record.get('Default1', 'A') == 9
+    assert record.get('Default', 'B') == 2
+    assert record.get('Default', 'C') is None
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+
+def section(index):
+    return tuple((f'RTP_Scan_Area_Surface_Parameter_{index}_{n}', str(n)) for n in range(20))
+
+
+def test_cache_is_bounded_by_size(avi):
+    entry_size = avi._cached_size(section(0))
+    cache = avi.ContentCache(max_bytes=entry_size * 10)
+    for index in range(50):
+        assert cache.get_or_compute('rtp_section', b'section %d' % index, lambda: section(index)) == section(index)
+    assert 0 < cache.size_bytes <= cache.max_bytes
+    assert 5 <= len(cache._entries) <= 10
+    calls = []
+    cache.get_or_compute('rtp_section', b'section 49', lambda: calls.append(1))
+    cache.get_or_compute('rtp_section', b'section 0', lambda: calls.append(1) or section(0))
+    assert calls == [1]  # 最新的項目仍在快取中，最早的已被移除
+    assert (cache.stats()['rtp_section']['hits'], cache.stats()['rtp_section']['misses']) == (1, 51)
+
+
+def test_save_and_load(avi, tmp_path):
+    cache = avi.ContentCache()
+    cache.get_or_compute('zone_status', b'[Surface]\nEnable=1\n', lambda: {'Surface': True})
+    cache.get_or_compute('rtp_section', b'section', lambda: section(1))
+    path = str(tmp_path / 'cache.json')
+    cache.save(path)
+    loaded = avi.ContentCache()
+    assert loaded.load(path) == 2
+    assert loaded.get_or_compute('rtp_section', b'section', lambda: None) == section(1)
+    assert loaded.size_bytes == cache.size_bytes
+
+
+@pytest.mark.parametrize('content', [
+    [1, 2],
+    'text',
+    {'version': 'other', 'entries': {}},
+    {'entries': {'rtp_section': {}}},
+    {'entries': ['rtp_section']},
+    {'entries': {'rtp_section': ['digest']}},
+    {'entries': {'rtp_section': {'digest': 'value'}}},
+])
+def test_load_ignores_invalid_files(avi, tmp_path, content):
+    if isinstance(content, dict) and 'version' not in content:
+        content = dict(content, version=avi.CHECK_LIST_ENGINE_VERSION)
+    path = tmp_path / 'cache.json'
+    path.write_text(json.dumps(content), encoding='utf-8')
+    cache = avi.ContentCache()
+    assert cache.load(str(path)) == 0
+    assert cache._entries == {}
@@ -0,0 +1,37 @@
+import contextlib
+import io
+import os
+import zipfile
+
+from conftest import make_recipe
+
+
+def zip_recipe(folder, archive_path, date_time=None):
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                info = zipfile.ZipInfo(os.path.relpath(path, folder).replace(os.sep, '/'), date_time=date_time or (2024, 5, 1, 8, 0, 0))
+                with open(path, 'rb') as file:
+                    archive.writestr(info, file.read())
+    return archive_path
+
+
+def test_zip_with_zero_dos_date(avi, storage, tmp_path):
+    folder = make_recipe(str(tmp_path / 'EQP1-G1-S1-E-V1'), multi=False)
+    archive_path = zip_recipe(folder, str(tmp_path / 'EQP1-G1-S1-E-V1.zip'), date_time=(1980, 0, 0, 0, 0, 0))
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.infolist()[0].date_time == (1980, 0, 0, 0, 0, 0)
+    tree = avi.ArchiveRecipeTree(archive_path)
+    assert {mtime for _, _, _, mtime in tree._list_members()} == {avi.ZIP_DOS_EPOCH.timestamp()}
+
+    processor = avi.FileProcessor(archive_path, output_dir=str(tmp_path / 'output'), reuse_output=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.generate()
+    assert not processor.excel_error
+    assert os.path.exists(processor.output_path)
+
+
+def test_zip_member_mtime(avi):
+    info = zipfile.ZipInfo('a.txt', date_time=(2024, 5, 1, 8, 30, 0))
+    assert avi.zip_member_mtime(info) == avi.datetime.datetime(2024, 5, 1, 8, 30).timestamp()
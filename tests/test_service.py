@@ -0,0 +1,64 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import openpyxl
+import pytest
+
+
+@pytest.fixture
+def service(avi, storage, tmp_path):
+    server = avi.create_check_list_server('127.0.0.1', 0, output_dir=str(tmp_path / 'output'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    server.engine.close()
+    thread.join()
+
+
+def call(url, body=None):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read().decode('utf-8'))
+
+
+def test_health(service, storage):
+    status, payload = call(service + '/health')
+    assert status == 200
+    assert payload['status'] == 'ok'
+    assert payload['template_path'] == storage.template_path()
+
+
+def test_generate(service, recipe_dir, tmp_path):
+    status, payload = call(service + '/generate', json.dumps({'recipe_path': recipe_dir}).encode('utf-8'))
+    assert status == 200, payload
+    assert payload['output_path'] == str(tmp_path / 'output' / 'EQP1-G1-S1-E-V1_AVI check list.xlsx')
+    assert not payload['reused']
+    wb = openpyxl.load_workbook(payload['output_path'])
+    assert 'Check list_Multi' in wb.sheetnames
+
+    status, payload = call(service + '/generate', json.dumps({'recipe_path': recipe_dir}).encode('utf-8'))
+    assert status == 200 and payload['reused']
+
+
+@pytest.mark.parametrize('body', [b'not json', b'{}', b'["recipe"]', b'{"recipe_path": 1}'])
+def test_malformed_request(service, body):
+    status, payload = call(service + '/generate', body)
+    assert status == 400
+    assert payload['error'].startswith('Invalid request')
+
+
+def test_unknown_recipe(service, tmp_path):
+    status, payload = call(service + '/generate', json.dumps({'recipe_path': str(tmp_path / 'missing')}).encode('utf-8'))
+    assert status == 404
+    assert 'missing' in payload['error']
+
+
+def test_unknown_path(service):
+    assert call(service + '/status')[0] == 404
@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+
+def test_storage_is_abstract(avi):
+    with pytest.raises(TypeError):
+        avi.Storage()
+
+
+def test_local_storage(avi, tmp_path):
+    storage = avi.LocalStorage(str(tmp_path / 'local'))
+    storage.write_bytes('a/b.txt', b'data')
+    assert storage.read_bytes('a/b.txt') == b'data'
+    assert storage.stat('a/b.txt')[0] == 4
+    assert storage.exists('a/b.txt') and not storage.exists('missing.txt')
+    assert storage.listdir() == ['a']
+    assert os.listdir(tmp_path / 'local' / 'a') == ['b.txt']  # 沒有留下暫存檔
+
+
+def test_memory_storage_seeded_from_directory(avi, tmp_path):
+    (tmp_path / 'seed' / 'sub').mkdir(parents=True)
+    (tmp_path / 'seed' / 'sub' / 'x.bin').write_bytes(b'xyz')
+    storage = avi.create_storage({'type': 'memory', 'path': str(tmp_path / 'seed'), 'name': 'seed'})
+    assert isinstance(storage, avi.MemoryStorage)
+    assert storage.read_bytes('sub/x.bin') == b'xyz'
+    storage.write_bytes('sub/x.bin', b'new')
+    assert storage.stat('sub/x.bin') == (3, 1)
+    assert (tmp_path / 'seed' / 'sub' / 'x.bin').read_bytes() == b'xyz'
+    assert avi.create_storage({'type': 'memory'}).listdir() == []
+
+
+def test_create_storage_types(avi, tmp_path):
+    assert type(avi.create_storage(str(tmp_path))) is avi.LocalStorage
+    assert type(avi.create_storage({'path': str(tmp_path)})) is avi.LocalStorage
+    assert avi.create_storage({'type': 'share', 'path': str(tmp_path)}).remote
+    with pytest.raises(ValueError):
+        avi.create_storage({'type': 'ftp', 'path': str(tmp_path)})
+
+
+def test_from_root_keeps_share_locations(avi, tmp_path):
+    config = avi.StorageConfig.from_root(str(tmp_path))
+    for name, location in avi.DEFAULT_STORAGE_LOCATIONS.items():
+        assert config[name].remote == (location['type'] == 'share')
+        assert config[name].path() == str(tmp_path / name)
+
+
+def test_from_file(avi, tmp_path):
+    config_path = tmp_path / 'storage.json'
+    config_path.write_text(json.dumps({'locations': {'template': {'type': 'share', 'path': str(tmp_path / 'share')}},
+                                       'template_cache': str(tmp_path / 'cache')}), encoding='utf-8')
+    config = avi.StorageConfig.from_file(str(config_path))
+    assert config['template'].remote
+    assert config.template_cache.cache_dir == str(tmp_path / 'cache')
+    assert config.template_path() == str(tmp_path / 'share' / avi.TEMPLATE_FILENAME)
+
+
+@pytest.fixture
+def share(avi, tmp_path):
+    share = avi.ShareStorage(str(tmp_path / 'share'))
+    share.write_bytes(avi.TEMPLATE_FILENAME, b'template v1')
+    return share
+
+
+def new_cache(avi, share, tmp_path):
+    return avi.TemplateCache(share, cache_dir=str(tmp_path / 'cache'))
+
+
+def test_template_cache_uses_verified_local_copy(avi, share, tmp_path):
+    cache = new_cache(avi, share, tmp_path)
+    assert cache.read() == b'template v1'
+    assert cache.counts == {'miss': 1, 'bytes_read': 11}
+    assert cache.read() == b'template v1'  # 來源未變動，沿用記憶體中的內容
+    assert cache.counts == {'miss': 1, 'bytes_read': 11}
+
+    cache = new_cache(avi, share, tmp_path)
+    assert cache.read() == b'template v1'
+    assert cache.counts == {'hit': 1}
+
+
+def test_template_cache_refreshes_when_source_changes(avi, share, tmp_path):
+    new_cache(avi, share, tmp_path).read()
+    share.write_bytes(avi.TEMPLATE_FILENAME, b'template v2 (updated)')
+    cache = new_cache(avi, share, tmp_path)
+    assert cache.read() == b'template v2 (updated)'
+    assert cache.counts['miss'] == 1
+    assert new_cache(avi, share, tmp_path).read() == b'template v2 (updated)'
+
+
+def test_template_cache_rejects_corrupted_copy(avi, share, tmp_path):
+    new_cache(avi, share, tmp_path).read()
+    (tmp_path / 'cache' / avi.TEMPLATE_FILENAME).write_bytes(b'template XX')
+    cache = new_cache(avi, share, tmp_path)
+    assert cache.read() == b'template v1'
+    assert cache.counts['miss'] == 1
+    assert (tmp_path / 'cache' / avi.TEMPLATE_FILENAME).read_bytes() == b'template v1'
+
+
+def test_template_cache_offline_fallback(avi, share, tmp_path):
+    new_cache(avi, share, tmp_path).read()
+    os.remove(share.path(avi.TEMPLATE_FILENAME))
+    cache = new_cache(avi, share, tmp_path)
+    assert cache.read() == b'template v1'
+    assert cache.counts == {'offline': 1}
+
+    (tmp_path / 'cache' / avi.TEMPLATE_FILENAME).write_bytes(b'template XX')
+    with pytest.raises(FileNotFoundError):
+        new_cache(avi, share, tmp_path).read()
+
+
+def test_local_template_is_not_cached(avi, tmp_path):
+    local = avi.LocalStorage(str(tmp_path / 'local'))
+    local.write_bytes(avi.TEMPLATE_FILENAME, b'template')
+    cache = avi.TemplateCache(local, cache_dir=str(tmp_path / 'cache'))
+    assert cache.read() == b'template'
+    assert cache.counts == {}
+    assert not os.path.exists(tmp_path / 'cache')